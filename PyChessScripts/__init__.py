@@ -7,8 +7,23 @@ incluindo controle de movimentos, controle do tabuleiro, controle da IA e valida
 Módulos principais:
     - treinar_ia.py: Define o script, responsável por realizar as partidas IA contra IA.
     - ia.py: Define a classe IA, reponsável por representar a IA, através de Q-Learning, aprender e realizar jogadas.
+    - estado_qlearning.py: Define a codificação do estado do tabuleiro usado pelo Q-Learning, e a conversão dos formatos antigos.
+    - diario_q_table.py: Define a classe DiarioQTable, responsável por guardar as alterações da Q-table sem reescrevê-la inteira.
+    - q_table_disco.py: Define a classe QTableDisco, responsável por guardar a Q-table em um arquivo consultado direto do disco.
+    - registro_partidas.py: Define a classe ArquivoPartidas, responsável por guardar muitas partidas em um arquivo binário compacto.
     - game.py: Define a classe Game, responsável por controlar os estados do jogo, verificar jogadas válidas e se comunicar com a interface.
     - board.py: Define a classe Board, responsável por representar o tabuleiro.
+    - bitboard.py: Define as constantes e tabelas de bitboards, usadas no cálculo de movimentos, ataques e xeques.
+    - zobrist.py: Define as chaves Zobrist, usadas para identificar cada posição do tabuleiro por um único inteiro.
+    - tabela_transposicao.py: Define a classe TabelaTransposicao, responsável por guardar as posições analisadas pela IA.
+    - avaliacao.py: Define a avaliação estática das posições, usada nas folhas da busca.
+    - avaliacao_vetorizada.py: Define a avaliação de posições em arrays do NumPy, inclusive de várias posições de uma vez.
+    - ordenacao.py: Define a classe OrdenacaoMovimentos, responsável pela ordem de análise dos movimentos na busca.
+    - busca.py: Define a classe Busca, responsável pela busca negamax com poda alfa-beta da IA.
+    - busca_paralela.py: Define a classe BuscaParalela, responsável por dividir a busca da IA entre vários processos.
+    - perfil.py: Define a classe Perfil, responsável por medir o tempo de cada fase das jogadas da IA.
+    - perft.py: Define o script de perft, que mede a velocidade e verifica a correção da geração de movimentos.
+    - benchmark.py: Define o script de benchmark da IA, que mede as jogadas em posições fixas e compara execuções.
     - jogador_vs_ia.py: Define o script padrão do jogo, onde ele será inicializado.
     - ia_vs_ia.py: Define o script onde a IA irá se enfrentar contra ela mesma.
 
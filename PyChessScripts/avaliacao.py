@@ -0,0 +1,71 @@
+"""
+Módulo de Avaliação.
+
+Contém a avaliação estática de uma posição, usada nas folhas da busca da IA.
+
+A avaliação segue a mesma heurística de "QLearning.avaliar_tabuleiro" (material, avanço dos peões
+e ocupação do centro), mas é calculada diretamente pelos bitboards do tabuleiro, sem montar a lista
+de dicionários das peças. A mobilidade não é considerada, pois exigiria gerar os movimentos em cada folha.
+"""
+
+# Imports necessários
+from bitboard import *
+
+# Valor de cada tipo de peça, indexado pelo tipo (PEAO, CAVALO, BISPO, TORRE, RAINHA, REI)
+VALOR_PECAS = (100, 320, 330, 500, 900, 10000)
+
+# Peso da captura de cada tipo de peça, usado para ordenar os movimentos (valor da peça em peões, vezes 10)
+PESO_CAPTURA = (10, 30, 30, 50, 90, 600)
+
+# Bônus de cada peão por linha avançada, indexado por [cor][casa]. O branco sobe (linha diminui) e o preto desce
+BONUS_AVANCO_PEAO = 20
+AVANCO_PEAO = [[(7 - (casa >> 3)) * BONUS_AVANCO_PEAO for casa in range(64)],
+               [(casa >> 3) * BONUS_AVANCO_PEAO for casa in range(64)]]
+
+# Casas centrais ("33", "34", "43" e "44") e o bônus de cada peça que as ocupa
+CENTRO = BIT[27] | BIT[28] | BIT[35] | BIT[36]
+BONUS_CENTRO = 200
+
+def avaliar_lado(tabuleiro, cor):
+    """
+    Soma os pontos das peças de uma única cor.
+
+    Args:
+        tabuleiro (Board): Tabuleiro analisado.
+        cor (int): Cor das peças (0 para branco, 1 para preto).
+
+    Returns:
+        int: Pontos da cor (material, avanço dos peões e centro).
+    """
+
+    pecas = tabuleiro.bitboards[cor]
+    pontos = 0
+
+    # Material
+    for tipo in range(6):
+        if pecas[tipo]:
+            pontos += contar_bits(pecas[tipo]) * VALOR_PECAS[tipo]
+
+    # Avanço dos peões
+    avanco = AVANCO_PEAO[cor]
+    for casa in iterar_bits(pecas[PEAO]):
+        pontos += avanco[casa]
+
+    # Controle do centro
+    pontos += contar_bits(tabuleiro.ocupacao[cor] & CENTRO) * BONUS_CENTRO
+
+    return pontos
+
+def avaliar_posicao(tabuleiro, cor):
+    """
+    Avalia a posição do ponto de vista de uma cor.
+
+    Args:
+        tabuleiro (Board): Tabuleiro analisado.
+        cor (int): Cor de quem a avaliação favorece (0 para branco, 1 para preto).
+
+    Returns:
+        int: Valor da posição. Positivo indica vantagem para "cor", negativo desvantagem.
+    """
+
+    return avaliar_lado(tabuleiro, cor) - avaliar_lado(tabuleiro, 1 - cor)
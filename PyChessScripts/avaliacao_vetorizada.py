@@ -0,0 +1,202 @@
+"""
+Módulo de Avaliação Vetorizada.
+
+Avalia posições representadas como arrays do NumPy, com operações sobre o array inteiro ao invés de
+percorrer as peças uma a uma. Assim, muitas posições (por exemplo, todas as posições de uma partida do
+treinamento) podem ser avaliadas em uma única chamada.
+
+A avaliação é a mesma de "avaliacao.py" (material, avanço dos peões e ocupação do centro). Todos esses
+termos dependem apenas da peça e da casa que ela ocupa, então são reunidos em uma tabela de pontos por
+peça e casa ("piece-square"), e a avaliação é a soma dos pontos das peças do tabuleiro.
+
+Formatos aceitos:
+    - Planos (12, 8, 8): um plano por peça, no índice "cor * 6 + tipo", com 1 nas casas ocupadas por ela.
+    - Códigos (64,): o código da peça de cada casa, 0 para vazia ou "1 + cor * 6 + tipo".
+    - Lotes: os mesmos formatos com uma dimensão a mais no início, (N, 12, 8, 8) ou (N, 64).
+
+O NumPy é opcional: sem ele, apenas este módulo fica indisponível (ver "NUMPY_DISPONIVEL").
+"""
+
+# Imports necessários
+from bitboard import *
+from avaliacao import VALOR_PECAS, AVANCO_PEAO, CENTRO, BONUS_CENTRO
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NUMPY_DISPONIVEL = np != None
+
+# Quantidade de planos (6 tipos de peça para cada cor)
+QUANTIDADE_PLANOS = 12
+
+def _criar_tabelas():
+    """
+    Cria as tabelas de pontos de cada material, avanço e centro, indexadas por [plano][casa].
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: (material, avanco, centro), cada uma com formato (12, 64),
+            com os pontos do ponto de vista das brancas (as peças pretas são negativas).
+    """
+
+    material = np.zeros((QUANTIDADE_PLANOS, 64), dtype = np.int32)
+    avanco = np.zeros((QUANTIDADE_PLANOS, 64), dtype = np.int32)
+    centro = np.zeros((QUANTIDADE_PLANOS, 64), dtype = np.int32)
+    casas_centro = [casa for casa in range(64) if CENTRO & BIT[casa]]
+
+    for cor in (BRANCO, PRETO):
+        sinal = 1 if cor == BRANCO else -1
+        for tipo in range(6):
+            plano = cor * 6 + tipo
+            material[plano] = sinal * VALOR_PECAS[tipo]
+            centro[plano, casas_centro] = sinal * BONUS_CENTRO
+        avanco[cor * 6 + PEAO] = sinal * np.array(AVANCO_PEAO[cor])
+
+    return material, avanco, centro
+
+if NUMPY_DISPONIVEL:
+    TABELA_MATERIAL, TABELA_AVANCO, TABELA_CENTRO = _criar_tabelas()
+
+    # Tabela de pontos por peça e casa com todos os termos, e a mesma tabela indexada pelo código
+    # (com a linha do código 0, casa vazia, zerada)
+    TABELA_PONTOS = TABELA_MATERIAL + TABELA_AVANCO + TABELA_CENTRO
+    TABELA_CODIGOS = np.vstack([np.zeros((1, 64), dtype = np.int32), TABELA_PONTOS])
+    CASAS_ARRAY = np.arange(64)
+
+def _verificar_numpy():
+    """
+    Raises:
+        ImportError: Se o NumPy não estiver instalado.
+    """
+
+    if not NUMPY_DISPONIVEL:
+        raise ImportError("A avaliação vetorizada precisa do NumPy (pip install numpy).")
+
+def codigos_tabuleiro(tabuleiro):
+    """
+    Converte um tabuleiro no array de códigos das peças.
+
+    Args:
+        tabuleiro (Board): Tabuleiro analisado.
+
+    Returns:
+        np.ndarray: Array (64,) com o código da peça de cada casa.
+    """
+
+    _verificar_numpy()
+    codigos = np.zeros(64, dtype = np.int8)
+    for cor in (BRANCO, PRETO):
+        for tipo in range(6):
+            for casa in iterar_bits(tabuleiro.bitboards[cor][tipo]):
+                codigos[casa] = 1 + cor * 6 + tipo
+    return codigos
+
+def codigos_lista(lista):
+    """
+    Converte a lista de dicionários das peças (ver "IA.salvar_tabuleiro") no array de códigos das peças.
+
+    Args:
+        lista (list[dict]): Peças, com as chaves "letra", "cor", "x" e "y".
+
+    Returns:
+        np.ndarray: Array (64,) com o código da peça de cada casa.
+    """
+
+    _verificar_numpy()
+    codigos = np.zeros(64, dtype = np.int8)
+    for peca in lista:
+        codigos[indice_casa(peca["x"], peca["y"])] = 1 + peca["cor"] * 6 + LETRAS_PECAS.index(peca["letra"])
+    return codigos
+
+def planos_de_codigos(codigos):
+    """
+    Converte códigos das peças em planos.
+
+    Args:
+        codigos (np.ndarray): Array (64,) ou lote (N, 64) de códigos.
+
+    Returns:
+        np.ndarray: Array (12, 8, 8) ou lote (N, 12, 8, 8) de planos.
+    """
+
+    _verificar_numpy()
+    codigos = np.asarray(codigos)
+    planos = codigos[..., np.newaxis, :] == np.arange(1, QUANTIDADE_PLANOS + 1)[:, np.newaxis]
+    return planos.astype(np.int8).reshape(codigos.shape[:-1] + (QUANTIDADE_PLANOS, 8, 8))
+
+def _como_planos(posicoes):
+    """
+    Converte posições em qualquer um dos formatos aceitos para um lote de planos achatados.
+
+    Args:
+        posicoes (np.ndarray): Planos ou códigos, de uma posição ou de um lote.
+
+    Returns:
+        tuple[np.ndarray, bool]: (planos, lote), com os planos no formato (N, 12, 64) e se a entrada era um lote.
+
+    Raises:
+        ValueError: Se o formato do array não for um dos aceitos.
+    """
+
+    posicoes = np.asarray(posicoes)
+    if posicoes.shape[-3:] == (QUANTIDADE_PLANOS, 8, 8) and posicoes.ndim in (3, 4):
+        lote = posicoes.ndim == 4
+        planos = posicoes.reshape((-1, QUANTIDADE_PLANOS, 64))
+    elif posicoes.shape[-1:] == (64,) and posicoes.ndim in (1, 2):
+        lote = posicoes.ndim == 2
+        planos = planos_de_codigos(posicoes.reshape((-1, 64))).reshape((-1, QUANTIDADE_PLANOS, 64))
+    else:
+        raise ValueError(f"Formato de posições inválido: {posicoes.shape}")
+    return planos, lote
+
+def termos_avaliacao(posicoes, cor):
+    """
+    Calcula separadamente cada termo da avaliação.
+
+    Args:
+        posicoes (np.ndarray): Planos ou códigos, de uma posição ou de um lote.
+        cor (int): Cor de quem a avaliação favorece (0 para branco, 1 para preto).
+
+    Returns:
+        dict[str, int | np.ndarray]: Pontos de "material", "avanco" e "centro", um valor por posição em um lote.
+    """
+
+    _verificar_numpy()
+    planos, lote = _como_planos(posicoes)
+    sinal = 1 if cor == BRANCO else -1
+    termos = {}
+    for nome, tabela in (("material", TABELA_MATERIAL), ("avanco", TABELA_AVANCO), ("centro", TABELA_CENTRO)):
+        valores = sinal * np.einsum("npc,pc->n", planos, tabela)
+        termos[nome] = valores if lote else int(valores[0])
+    return termos
+
+def avaliar(posicoes, cor):
+    """
+    Avalia uma posição ou um lote de posições, do ponto de vista de uma cor.
+
+    Os códigos são avaliados direto pela tabela indexada por código, sem criar os planos.
+
+    Args:
+        posicoes (np.ndarray): Planos ou códigos, de uma posição ou de um lote.
+        cor (int): Cor de quem a avaliação favorece (0 para branco, 1 para preto).
+
+    Returns:
+        int | np.ndarray: Valor da posição, ou um array (N,) com o valor de cada posição do lote.
+            Igual a "avaliar_posicao" do módulo "avaliacao.py".
+
+    Raises:
+        ValueError: Se o formato do array não for um dos aceitos.
+    """
+
+    _verificar_numpy()
+    posicoes = np.asarray(posicoes)
+    sinal = 1 if cor == BRANCO else -1
+
+    if posicoes.shape[-1:] == (64,) and posicoes.ndim in (1, 2):
+        valores = sinal * TABELA_CODIGOS[posicoes.astype(np.intp), CASAS_ARRAY].sum(axis = -1)
+        return valores if posicoes.ndim == 2 else int(valores)
+
+    planos, lote = _como_planos(posicoes)
+    valores = sinal * np.einsum("npc,pc->n", planos, TABELA_PONTOS)
+    return valores if lote else int(valores[0])
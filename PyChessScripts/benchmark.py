@@ -0,0 +1,288 @@
+"""
+Script de Benchmark da IA.
+
+Mede o desempenho da jogada da IA ("IA.simular_jogada") em um conjunto fixo de posições (abertura,
+meio-jogo, final e táticas), registrando para cada uma o tempo, as posições analisadas, o pico de memória
+e a jogada escolhida. O resultado é salvo em JSON, e duas execuções podem ser comparadas para encontrar
+regressões.
+
+Por padrão, a comparação só bloqueia pelas métricas determinísticas (posições analisadas, profundidade
+concluída e jogada escolhida), que não mudam entre execuções do mesmo código. O tempo e a memória variam
+de uma execução para outra, e por isso só bloqueiam com "--medidas". Mesmo assim, o tempo só é apontado
+como regressão quando a diferença passa do ruído medido nas repetições das duas execuções.
+
+Uso:
+    - python benchmark.py: Executa o benchmark e mostra o JSON.
+    - python benchmark.py --saida base.json: Executa o benchmark e salva o JSON no arquivo.
+    - python benchmark.py --comparar base.json novo.json: Compara duas execuções (limite padrão de 10%).
+    - python benchmark.py --comparar base.json novo.json --medidas: Também bloqueia por tempo e memória.
+    - python benchmark.py --perfil --cprofile perfil/jogada: Mostra o tempo de cada fase, e salva o cProfile de cada posição.
+
+Na comparação, encerra com o código 1 caso exista alguma regressão.
+"""
+
+# Imports necessários
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from game import Game
+from perfil import Perfil, formatar_relatorio
+
+# Posições do benchmark: nome, categoria e FEN
+POSICOES_BENCHMARK = [
+    ("Inicial", "abertura", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"),
+    ("Italiana", "abertura", "r1bqk1nr/pppp1ppp/2n5/2b1p3/2B1P3/5N2/PPPP1PPP/RNBQK2R w KQkq - 4 4"),
+    ("Kiwipete", "meio-jogo", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"),
+    ("Posição 6", "meio-jogo", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10"),
+    ("Lucena", "final", "1K1k4/1P6/8/8/8/8/r7/2R5 w - - 0 1"),
+    ("Posição 3", "final", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"),
+    ("Mate do pastor", "tático", "r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w KQkq - 4 4"),
+    ("Garfo de cavalo", "tático", "r3k3/ppp2ppp/8/3N4/8/8/PPP2PPP/4K3 w q - 0 1"),
+]
+
+PROFUNDIDADE_BENCHMARK = 4
+REPETICOES = 5
+LIMITE_REGRESSAO = 0.10
+
+# As posições rápidas são repetidas até somar pelo menos esse tempo medido (em segundos), até o máximo
+# de repetições, para que o menor tempo seja estável
+TEMPO_MINIMO_MEDICAO = 1.0
+REPETICOES_MAXIMAS = 50
+
+# Métricas determinísticas, com o sentido em que são piores: 1 quando um valor maior é pior (mais posições
+# analisadas), -1 quando um valor menor é pior (profundidade concluída)
+METRICAS_EXATAS = {"nos": 1, "profundidade_concluida": -1}
+
+# Métricas medidas, em que um valor maior é pior, e a diferença mínima para ser considerada regressão
+# (evita apontar variações de medida nas posições muito rápidas)
+METRICAS_MEDIDAS = {"tempo": 0.005, "memoria_pico_kb": 4.0}
+
+def preparar_posicao(jogo, fen):
+    """
+    Coloca o jogo em uma posição, como se a partida estivesse nela, com a IA jogando pela cor da vez.
+
+    A tabela de transposição e a ordenação da IA são esvaziadas, para que todas as medições partam do mesmo estado.
+
+    Args:
+        jogo (Game): Jogo usado no benchmark.
+        fen (str): Posição na notação FEN.
+    """
+
+    jogo.from_fen(fen)
+    jogo.ia.cor = jogo.turno % 2
+
+def medir_posicao(jogo, fen, profundidade, limite_nos, repeticoes, medir_memoria = True, perfil = None):
+    """
+    Mede a jogada da IA em uma posição.
+
+    O tempo é o menor das repetições, que é o menos afetado por interferências do sistema. A posição é
+    repetida pelo menos "repeticoes" vezes, e continua sendo repetida até somar TEMPO_MINIMO_MEDICAO
+    (no máximo REPETICOES_MAXIMAS vezes). Todos os tempos são salvos, para que a comparação conheça
+    o ruído da medição. O pico de memória é medido em uma execução a mais, separada,
+    pois o "tracemalloc" deixa a execução bem mais lenta (cerca de 10 vezes). O perfil das fases também
+    é medido em uma execução separada.
+
+    Args:
+        jogo (Game): Jogo usado no benchmark.
+        fen (str): Posição na notação FEN.
+        profundidade (int): Profundidade da busca.
+        limite_nos (int | None): Quantidade máxima de posições analisadas, ou None.
+        repeticoes (int): Quantidade mínima de execuções medidas.
+        medir_memoria (bool, optional): Se o pico de memória é medido (None caso contrário). Default é True.
+        perfil (Perfil, optional): Se informado, mede as fases da jogada (ver "perfil.py"). Default é None.
+
+    Returns:
+        dict: Resultado da posição (tempo, nós, memória, jogada, ...).
+    """
+
+    tempos = []
+    while len(tempos) < repeticoes or (sum(tempos) < TEMPO_MINIMO_MEDICAO and len(tempos) < REPETICOES_MAXIMAS):
+        preparar_posicao(jogo, fen)
+        inicio = time.perf_counter()
+        jogo.ia.simular_jogada(profundidade = profundidade, limite_nos = limite_nos, processos = 1)
+        tempos.append(time.perf_counter() - inicio)
+
+    pico = None
+    if medir_memoria:
+        preparar_posicao(jogo, fen)
+        tracemalloc.start()
+        jogo.ia.simular_jogada(profundidade = profundidade, limite_nos = limite_nos, processos = 1)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    fases = None
+    if perfil != None:
+        preparar_posicao(jogo, fen)
+        with perfil:
+            jogo.ia.simular_jogada(profundidade = profundidade, limite_nos = limite_nos, processos = 1)
+        fases = perfil.relatorios[-1]["fases"]
+        print(formatar_relatorio(perfil.relatorios[-1]), file = sys.stderr)
+
+    ia = jogo.ia
+    melhor = ia.lista_jogadas_possiveis[0] if ia.lista_jogadas_possiveis else None
+    tempo = min(tempos)
+    return {
+        "fen": fen,
+        "tempo": round(tempo, 4),
+        "tempo_mediana": round(statistics.median(tempos), 4),
+        "tempos": [round(t, 4) for t in tempos],
+        "nos": ia.nos,
+        "nos_por_segundo": round(ia.nos / tempo) if tempo > 0 else 0,
+        "profundidade_concluida": ia.profundidade_concluida,
+        "memoria_pico_kb": round(pico / 1024, 1) if pico != None else None,
+        "jogada": melhor["movimento"] if melhor else None,
+        "valor": melhor["valor"] if melhor else None,
+        "fases": fases,
+    }
+
+def executar_benchmark(profundidade = PROFUNDIDADE_BENCHMARK, limite_nos = None, repeticoes = REPETICOES, medir_memoria = True, perfil = None):
+    """
+    Executa o benchmark em todas as posições.
+
+    Args:
+        profundidade (int, optional): Profundidade da busca. Default é PROFUNDIDADE_BENCHMARK.
+        limite_nos (int, optional): Quantidade máxima de posições analisadas por jogada. Default é None (sem limite).
+        repeticoes (int, optional): Quantidade mínima de execuções medidas por posição. Default é REPETICOES.
+        medir_memoria (bool, optional): Se o pico de memória é medido. Default é True.
+        perfil (Perfil, optional): Se informado, mede as fases de cada jogada. Default é None.
+
+    Returns:
+        dict: Resultado completo, com a configuração e o resultado de cada posição.
+    """
+
+    jogo = Game()
+    resultado = {
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "profundidade": profundidade,
+        "limite_nos": limite_nos,
+        "repeticoes": repeticoes,
+        "posicoes": {},
+    }
+
+    for nome, categoria, fen in POSICOES_BENCHMARK:
+        medicao = medir_posicao(jogo, fen, profundidade, limite_nos, repeticoes, medir_memoria, perfil)
+        resultado["posicoes"][nome] = {"categoria": categoria, **medicao}
+        print(f"[{nome}] {medicao['tempo']:.3f}s, {medicao['nos']} nós, jogada {medicao['jogada']}", file = sys.stderr)
+
+    return resultado
+
+def ruido_tempo(medicao):
+    """
+    Calcula o ruído da medição de tempo de uma posição, que é a diferença entre o maior e o menor tempo das repetições.
+
+    Args:
+        medicao (dict): Resultado da posição.
+
+    Returns:
+        float: Ruído, em segundos (0 se houver apenas um tempo salvo).
+    """
+
+    tempos = medicao.get("tempos") or [medicao["tempo"]]
+    return max(tempos) - min(tempos)
+
+def comparar(base, novo, limite = LIMITE_REGRESSAO, medidas = False):
+    """
+    Compara duas execuções do benchmark, posição a posição.
+
+    As métricas determinísticas (posições analisadas e profundidade concluída) são uma regressão quando
+    pioram mais do que o limite (Ex: com limite 0.10, analisar mais de 10% de posições), e uma jogada
+    diferente também é uma regressão.
+
+    As métricas medidas são uma regressão quando o valor novo passa do valor base em mais do que o limite
+    e em mais do que a diferença mínima da métrica. No tempo, a diferença também precisa passar do ruído
+    das repetições (o maior entre as duas execuções). Elas só entram nas regressões se "medidas" for True,
+    e caso contrário são apenas avisadas. As métricas não medidas (None) são ignoradas.
+
+    Args:
+        base (dict): Resultado de referência.
+        novo (dict): Resultado comparado.
+        limite (float, optional): Variação máxima aceita, em fração do valor base. Default é LIMITE_REGRESSAO.
+        medidas (bool, optional): Se o tempo e a memória também contam como regressão. Default é False.
+
+    Returns:
+        list[str]: Regressões encontradas (vazia se não houver).
+    """
+
+    regressoes = []
+    if base.get("profundidade") != novo.get("profundidade") or base.get("limite_nos") != novo.get("limite_nos"):
+        print("[AVISO] As execuções usaram configurações diferentes (profundidade ou limite de nós).")
+
+    for nome, medicao_base in base["posicoes"].items():
+        medicao_nova = novo["posicoes"].get(nome)
+        if medicao_nova == None:
+            print(f"[{nome}] ausente na execução nova")
+            continue
+
+        for metrica, sentido in METRICAS_EXATAS.items():
+            valor_base = medicao_base.get(metrica)
+            valor_novo = medicao_nova.get(metrica)
+            if valor_base == None or valor_novo == None:
+                continue
+
+            variacao = (valor_novo - valor_base) / valor_base if valor_base else 0
+            regressao = variacao * sentido > limite
+            situacao = "REGRESSÃO" if regressao else ("melhora" if variacao * sentido < -limite else "")
+            print(f"[{nome}] {metrica}: {valor_base} -> {valor_novo} ({variacao:+.1%}) {situacao}".rstrip())
+            if regressao:
+                regressoes.append(f"{nome}: {metrica} {variacao:+.1%}")
+
+        for metrica, diferenca_minima in METRICAS_MEDIDAS.items():
+            valor_base = medicao_base.get(metrica)
+            valor_novo = medicao_nova.get(metrica)
+            if valor_base == None or valor_novo == None:
+                continue
+
+            # No tempo, a variação entre as repetições também é considerada ruído
+            if metrica == "tempo":
+                diferenca_minima = max(diferenca_minima, ruido_tempo(medicao_base), ruido_tempo(medicao_nova))
+
+            variacao = (valor_novo - valor_base) / valor_base if valor_base else 0
+            relevante = abs(valor_novo - valor_base) > diferenca_minima
+            regressao = relevante and variacao > limite
+            situacao = ("REGRESSÃO" if medidas else "acima do limite") if regressao else ("melhora" if relevante and variacao < -limite else "")
+            print(f"[{nome}] {metrica}: {valor_base} -> {valor_novo} ({variacao:+.1%}) {situacao}".rstrip())
+            if regressao and medidas:
+                regressoes.append(f"{nome}: {metrica} {variacao:+.1%}")
+
+        if medicao_base["jogada"] != medicao_nova["jogada"]:
+            print(f"[{nome}] jogada diferente: {medicao_base['jogada']} -> {medicao_nova['jogada']} REGRESSÃO")
+            regressoes.append(f"{nome}: jogada {medicao_base['jogada']} -> {medicao_nova['jogada']}")
+
+    return regressoes
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description = "Benchmark da jogada da IA em posições fixas.")
+    argumentos.add_argument("--profundidade", type = int, default = PROFUNDIDADE_BENCHMARK)
+    argumentos.add_argument("--limite-nos", type = int, default = None)
+    argumentos.add_argument("--repeticoes", type = int, default = REPETICOES, help = "Quantidade mínima de execuções medidas por posição.")
+    argumentos.add_argument("--sem-memoria", action = "store_true", help = "Não mede o pico de memória (bem mais rápido).")
+    argumentos.add_argument("--perfil", action = "store_true", help = "Mede o tempo de cada fase da jogada.")
+    argumentos.add_argument("--cprofile", metavar = "PREFIXO", help = "Salva o cProfile de cada jogada medida pelo perfil.")
+    argumentos.add_argument("--saida", help = "Arquivo onde o JSON é salvo. Sem ele, o JSON é mostrado.")
+    argumentos.add_argument("--comparar", nargs = 2, metavar = ("BASE", "NOVO"), help = "Compara dois resultados salvos.")
+    argumentos.add_argument("--limite", type = float, default = LIMITE_REGRESSAO, help = "Variação máxima aceita na comparação (0.10 = 10%%).")
+    argumentos.add_argument("--medidas", action = "store_true", help = "Na comparação, também bloqueia por tempo e memória (fora do ruído).")
+    parametros = argumentos.parse_args()
+
+    if parametros.comparar:
+        with open(parametros.comparar[0], encoding = "utf-8") as f:
+            base = json.load(f)
+        with open(parametros.comparar[1], encoding = "utf-8") as f:
+            novo = json.load(f)
+        regressoes = comparar(base, novo, parametros.limite, parametros.medidas)
+        print(f"{len(regressoes)} regressão(ões) (limite de {parametros.limite:.0%})")
+        sys.exit(1 if regressoes else 0)
+
+    perfil = Perfil(parametros.cprofile) if parametros.perfil or parametros.cprofile else None
+    resultado = executar_benchmark(parametros.profundidade, parametros.limite_nos, parametros.repeticoes, not parametros.sem_memoria, perfil)
+    if parametros.saida:
+        with open(parametros.saida, "w", encoding = "utf-8") as f:
+            json.dump(resultado, f, indent = 4, ensure_ascii = False)
+    else:
+        print(json.dumps(resultado, indent = 4, ensure_ascii = False))
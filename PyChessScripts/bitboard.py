@@ -0,0 +1,374 @@
+"""
+Módulo de Bitboards.
+
+Contém as constantes, tabelas e funções responsáveis por representar o tabuleiro através de
+bitboards: inteiros de 64 bits, onde cada bit representa uma casa do tabuleiro.
+
+Cada casa é indexada por um inteiro de 0 a 63, calculado como "x * 8 + y", onde "x" é a linha
+e "y" a coluna (a mesma convenção das posições "xy"). Ou seja, a casa "00" é o bit 0 e a casa "77" o bit 63.
+
+Para cada cor e para cada tipo de peça é mantido um bitboard, o que permite calcular movimentos,
+mapas de ataque e xeques com operações de bits, ao invés de percorrer o tabuleiro casa por casa.
+"""
+
+# Imports necessários
+from pieces import *
+from pieces.tabelas import (DIRECOES, DIRECOES_TORRE, DIRECOES_BISPO, DIRECOES_RAINHA,
+                            CASAS_CAVALO, CASAS_REI, CASAS_CAPTURA_PEAO, CASAS_RAIOS)
+
+# Cores
+BRANCO = 0
+PRETO = 1
+
+# Tipos de peças, usados como índice dos bitboards
+PEAO = 0
+CAVALO = 1
+BISPO = 2
+TORRE = 3
+RAINHA = 4
+REI = 5
+
+# Relação entre as classes das peças e os seus índices
+CLASSES_PECAS = (Pawn, Horse, Bishop, Rook, Queen, King)
+TIPO_PECA = {classe: indice for indice, classe in enumerate(CLASSES_PECAS)}
+
+# Primeira letra de cada peça, a mesma utilizada no histórico
+LETRAS_PECAS = "PHBRQK"
+
+# Letra de cada peça na notação FEN (maiúscula para as brancas e minúscula para as pretas)
+LETRAS_FEN = "PNBRQK"
+
+# Flags dos movimentos codificados, guardadas nos 4 bits mais altos do movimento
+QUIETO = 0
+AVANCO_DUPLO = 1
+ROQUE_CURTO = 2
+ROQUE_LONGO = 3
+CAPTURA = 4
+EN_PASSANT = 5
+PROMOCAO = 8
+
+# Casas de origem e destino da torre em cada roque, indexadas pela casa de destino do rei
+ROQUES_TORRE = {62: (63, 61), 58: (56, 59), 6: (7, 5), 2: (0, 3)}
+
+# Bit correspondente a cada casa
+BIT = [1 << casa for casa in range(64)]
+
+# Conversão entre o índice da casa e a posição no formato "xy"
+NOMES_CASAS = [f"{casa >> 3}{casa & 7}" for casa in range(64)]
+CASAS = {nome: casa for casa, nome in enumerate(NOMES_CASAS)}
+
+# Indica se a direção avança para casas de índice maior (o primeiro bloqueio é o bit menos significativo)
+DIRECAO_POSITIVA = [dx * 8 + dy > 0 for dx, dy in DIRECOES]
+
+def indice_casa(x, y):
+    """
+    Converte uma linha e uma coluna no índice da casa.
+
+    Args:
+        x (int): Linha da casa (0 a 7).
+        y (int): Coluna da casa (0 a 7).
+
+    Returns:
+        int: Índice da casa (0 a 63).
+    """
+
+    return x * 8 + y
+
+def _para_bitboard(casas):
+    """
+    Converte uma lista de casas em um bitboard.
+
+    Args:
+        casas (tuple[int]): Índices das casas.
+
+    Returns:
+        int: Bitboard com os bits das casas ativos.
+    """
+
+    bitboard = 0
+    for casa in casas:
+        bitboard |= BIT[casa]
+    return bitboard
+
+# Tabelas de ataques, derivadas das tabelas pré-calculadas das peças ("pieces/tabelas.py")
+ATAQUES_CAVALO = [_para_bitboard(casas) for casas in CASAS_CAVALO]
+ATAQUES_REI = [_para_bitboard(casas) for casas in CASAS_REI]
+
+# Ataques do peão, indexados por [cor][casa]. O branco sobe (linha diminui) e o preto desce
+ATAQUES_PEAO = [[_para_bitboard(casas) for casas in CASAS_CAPTURA_PEAO[cor]] for cor in (BRANCO, PRETO)]
+
+# Raios das peças deslizantes, indexados por [direcao][casa]
+RAIOS = [[_para_bitboard(raio) for raio in tabela] for tabela in CASAS_RAIOS]
+
+def _gerar_entre():
+    """
+    Gera, para cada par de casas alinhadas (na mesma reta ou diagonal), o bitboard das casas entre elas.
+
+    Returns:
+        list[list[int]]: Tabela indexada por [casa][casa], com 0 para casas não alinhadas ou vizinhas.
+    """
+
+    entre = [[0] * 64 for _ in range(64)]
+    for tabela in CASAS_RAIOS:
+        for casa in range(64):
+            caminho = 0
+            for destino in tabela[casa]:
+                entre[casa][destino] = caminho
+                caminho |= BIT[destino]
+    return entre
+
+# Casas entre duas casas alinhadas, usadas para bloquear xeques e limitar peças cravadas
+ENTRE = _gerar_entre()
+
+def iterar_bits(bitboard):
+    """
+    Percorre os bits ativos de um bitboard.
+
+    Args:
+        bitboard (int): Bitboard a ser percorrido.
+
+    Yields:
+        int: Índice de cada casa ocupada no bitboard, em ordem crescente.
+    """
+
+    while bitboard:
+        menor_bit = bitboard & -bitboard
+        yield menor_bit.bit_length() - 1
+        bitboard ^= menor_bit
+
+def contar_bits(bitboard):
+    """
+    Conta quantos bits estão ativos no bitboard.
+
+    Args:
+        bitboard (int): Bitboard a ser contado.
+
+    Returns:
+        int: Quantidade de casas ocupadas.
+    """
+
+    return bitboard.bit_count()
+
+def ataques_deslizantes(casa, ocupacao, direcoes):
+    """
+    Calcula os ataques de uma peça deslizante (torre, bispo ou rainha).
+
+    Para cada direção, o raio é cortado logo após a primeira peça encontrada,
+    que continua fazendo parte dos ataques (pode ser uma captura).
+
+    Args:
+        casa (int): Casa onde a peça está.
+        ocupacao (int): Bitboard com todas as peças do tabuleiro.
+        direcoes (tuple[int]): Índices das direções em "DIRECOES".
+
+    Returns:
+        int: Bitboard das casas atacadas.
+    """
+
+    ataques = 0
+    for direcao in direcoes:
+        raio = RAIOS[direcao][casa]
+        bloqueio = raio & ocupacao
+        if bloqueio:
+
+            # Pega-se a primeira peça no caminho, conforme o sentido da direção
+            if DIRECAO_POSITIVA[direcao]:
+                primeira = (bloqueio & -bloqueio).bit_length() - 1
+            else:
+                primeira = bloqueio.bit_length() - 1
+
+            # Remove-se do raio as casas que estão depois dela
+            raio ^= RAIOS[direcao][primeira]
+        ataques |= raio
+    return ataques
+
+def ataques_da_peca(tipo, cor, casa, ocupacao):
+    """
+    Calcula as casas atacadas por uma peça, sem considerar se estão ocupadas por peças aliadas.
+
+    Args:
+        tipo (int): Tipo da peça (PEAO, CAVALO, BISPO, TORRE, RAINHA ou REI).
+        cor (int): Cor da peça (0 para branco, 1 para preto).
+        casa (int): Casa onde a peça está.
+        ocupacao (int): Bitboard com todas as peças do tabuleiro.
+
+    Returns:
+        int: Bitboard das casas atacadas.
+    """
+
+    if tipo == PEAO:
+        return ATAQUES_PEAO[cor][casa]
+    if tipo == CAVALO:
+        return ATAQUES_CAVALO[casa]
+    if tipo == BISPO:
+        return ataques_deslizantes(casa, ocupacao, DIRECOES_BISPO)
+    if tipo == TORRE:
+        return ataques_deslizantes(casa, ocupacao, DIRECOES_TORRE)
+    if tipo == RAINHA:
+        return ataques_deslizantes(casa, ocupacao, DIRECOES_RAINHA)
+    return ATAQUES_REI[casa]
+
+def mapa_ataques(bitboards, ocupacao, cor):
+    """
+    Calcula todas as casas atacadas por uma cor.
+
+    Args:
+        bitboards (list[list[int]]): Bitboards das peças, indexados por [cor][tipo].
+        ocupacao (int): Bitboard com todas as peças do tabuleiro.
+        cor (int): Cor das peças atacantes (0 para branco, 1 para preto).
+
+    Returns:
+        int: Bitboard com a união dos ataques de todas as peças da cor.
+    """
+
+    ataques = 0
+    for tipo in range(6):
+        for casa in iterar_bits(bitboards[cor][tipo]):
+            ataques |= ataques_da_peca(tipo, cor, casa, ocupacao)
+    return ataques
+
+def casa_atacada(bitboards, ocupacao, casa, cor):
+    """
+    Verifica se uma casa é atacada por alguma peça de uma cor.
+
+    Ao invés de calcular os ataques de todas as peças, os padrões de ataque são lançados a partir
+    da própria casa: se um cavalo posicionado nela alcançaria um cavalo adversário, esse cavalo
+    também a ataca. O mesmo vale para o peão, o rei e os raios das peças deslizantes.
+
+    Args:
+        bitboards (list[list[int]]): Bitboards das peças, indexados por [cor][tipo].
+        ocupacao (int): Bitboard com todas as peças do tabuleiro.
+        casa (int): Casa analisada (0 a 63).
+        cor (int): Cor das peças atacantes (0 para branco, 1 para preto).
+
+    Returns:
+        bool: True se a casa é atacada, False caso contrário.
+    """
+
+    pecas = bitboards[cor]
+
+    # Peças que saltam: o peão usa a tabela da cor contrária, pois ataca "para trás" a partir da casa
+    if ATAQUES_PEAO[1 - cor][casa] & pecas[PEAO]:
+        return True
+    if ATAQUES_CAVALO[casa] & pecas[CAVALO]:
+        return True
+    if ATAQUES_REI[casa] & pecas[REI]:
+        return True
+
+    # Peças deslizantes: retas para torre e rainha, diagonais para bispo e rainha
+    retas = pecas[TORRE] | pecas[RAINHA]
+    if retas and ataques_deslizantes(casa, ocupacao, DIRECOES_TORRE) & retas:
+        return True
+    diagonais = pecas[BISPO] | pecas[RAINHA]
+    if diagonais and ataques_deslizantes(casa, ocupacao, DIRECOES_BISPO) & diagonais:
+        return True
+
+    return False
+
+def atacantes_da_casa(bitboards, ocupacao, casa, cor):
+    """
+    Calcula quais peças de uma cor atacam uma casa, da mesma forma que "casa_atacada".
+
+    Args:
+        bitboards (list[list[int]]): Bitboards das peças, indexados por [cor][tipo].
+        ocupacao (int): Bitboard com todas as peças do tabuleiro.
+        casa (int): Casa analisada (0 a 63).
+        cor (int): Cor das peças atacantes (0 para branco, 1 para preto).
+
+    Returns:
+        int: Bitboard com as casas das peças atacantes.
+    """
+
+    pecas = bitboards[cor]
+    atacantes = ATAQUES_PEAO[1 - cor][casa] & pecas[PEAO]
+    atacantes |= ATAQUES_CAVALO[casa] & pecas[CAVALO]
+    atacantes |= ATAQUES_REI[casa] & pecas[REI]
+    atacantes |= ataques_deslizantes(casa, ocupacao, DIRECOES_TORRE) & (pecas[TORRE] | pecas[RAINHA])
+    atacantes |= ataques_deslizantes(casa, ocupacao, DIRECOES_BISPO) & (pecas[BISPO] | pecas[RAINHA])
+    return atacantes
+
+def movimentos_peao(cor, casa, ocupacao, inimigas):
+    """
+    Calcula os movimentos básicos de um peão (avanço simples, avanço duplo e capturas diagonais).
+
+    Args:
+        cor (int): Cor do peão (0 para branco, 1 para preto).
+        casa (int): Casa onde o peão está.
+        ocupacao (int): Bitboard com todas as peças do tabuleiro.
+        inimigas (int): Bitboard com as peças adversárias.
+
+    Returns:
+        int: Bitboard dos destinos possíveis.
+    """
+
+    destinos = ATAQUES_PEAO[cor][casa] & inimigas
+    direcao = -8 if cor == BRANCO else 8
+    frente = casa + direcao
+
+    # Movimento normal de uma casa para frente
+    if 0 <= frente <= 63 and not ocupacao & BIT[frente]:
+        destinos |= BIT[frente]
+
+        # Movimento inicial de duas casas
+        linha = casa >> 3
+        if (linha == 6 and cor == BRANCO) or (linha == 1 and cor == PRETO):
+            duas_casas = frente + direcao
+            if not ocupacao & BIT[duas_casas]:
+                destinos |= BIT[duas_casas]
+
+    return destinos
+
+def criar_movimento(origem, destino, flag = QUIETO):
+    """
+    Codifica um movimento em um único inteiro de 16 bits.
+
+    Os 6 primeiros bits guardam a origem, os 6 seguintes o destino e os 4 últimos as flags:
+        - 0 -> movimento comum, 1 -> avanço duplo do peão.
+        - 2 -> roque curto, 3 -> roque longo.
+        - 4 -> captura, 5 -> en passant.
+        - 8 a 11 -> promoção para cavalo, bispo, torre e rainha (somando 4 se for com captura).
+
+    Args:
+        origem (int): Casa de origem (0 a 63).
+        destino (int): Casa de destino (0 a 63).
+        flag (int, optional): Flags do movimento. Default é QUIETO.
+
+    Returns:
+        int: Movimento codificado.
+    """
+
+    return origem | (destino << 6) | (flag << 12)
+
+def origem_movimento(movimento):
+    """
+    Retorna a casa de origem de um movimento codificado.
+    """
+
+    return movimento & 63
+
+def destino_movimento(movimento):
+    """
+    Retorna a casa de destino de um movimento codificado.
+    """
+
+    return (movimento >> 6) & 63
+
+def flag_movimento(movimento):
+    """
+    Retorna as flags de um movimento codificado.
+    """
+
+    return movimento >> 12
+
+def peca_promovida(flag):
+    """
+    Retorna o tipo da peça escolhida em uma promoção, a partir das flags do movimento.
+
+    Args:
+        flag (int): Flags do movimento (deve conter PROMOCAO).
+
+    Returns:
+        int: Tipo da peça (CAVALO, BISPO, TORRE ou RAINHA).
+    """
+
+    return (flag & 3) + CAVALO
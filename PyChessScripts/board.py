@@ -1,3 +1,8 @@
+# Imports necessários
+from bitboard import *
+from zobrist import *
+from avaliacao import VALOR_PECAS
+
 class Board:
     """
     Classe Board.
@@ -6,49 +11,78 @@ class Board:
 
     Responsável por gerenciar o estado do jogo, atualizar as posições
     das peças e controlar movimentos válidos no tabuleiro.
+
+    Além da matriz "grid" (usada pela interface), o tabuleiro mantém bitboards
+    sincronizados, usados no cálculo de movimentos, ataques e xeques.
+
+    Attributes:
+        grid (list[list]): Matriz 8x8 com as instâncias das peças, ou None.
+        bitboards (list[list[int]]): Bitboards das peças, indexados por [cor][tipo].
+        ocupacao (list[int]): Bitboard com todas as peças de cada cor.
+        en_passant (int | None): Casa alvo de um possível en passant, ou None se não houver.
+        chave (int): Chave Zobrist das peças, atualizada a cada peça posicionada ou removida.
     """
 
     def __init__(self):
         """
-        Inicializa o tabuleiro como uma matriz 8x8 preenchida com "None".
+        Inicializa o tabuleiro como uma matriz 8x8 preenchida com "None", e os bitboards vazios.
         """
 
         self.grid = [[None for _ in range (8)] for _ in range(8)]
+        self.bitboards = [[0] * 6, [0] * 6]
+        self.ocupacao = [0, 0]
+        self.en_passant = None
+        self.chave = 0
 
-    def posiciona_peca(self, peca, posicao):
+    def posiciona_peca(self, peca, casa):
         """
-        Posiciona uma determinada peça em uma posição específica (Ex: "04").
+        Posiciona uma determinada peça em uma casa específica (Ex: 4, a casa "04").
 
         Args:
             peca (object | None): Instância da peça a ser posicionada, ou None se for remover.
-            posicao (str): Posição concatenada de dois números, onde o primeiro representa o x e o segundo o y.
+            casa (int): Índice da casa (0 a 63), calculado como "x * 8 + y".
         """
 
-        # Pegando as posições de x e y
-        x, y = int(posicao[0]), int(posicao[1])
+        x, y = casa >> 3, casa & 7
+        bit = BIT[casa]
+
+        # Remove dos bitboards (e da chave) a peça que ocupava a casa
+        antiga = self.grid[x][y]
+        if antiga != None:
+            tipo = TIPO_PECA[type(antiga)]
+            self.bitboards[antiga.cor][tipo] ^= bit
+            self.ocupacao[antiga.cor] ^= bit
+            self.chave ^= ZOBRIST_PECAS[antiga.cor][tipo][casa]
+
+        # Adiciona a nova peça nos bitboards (e na chave)
+        if peca != None:
+            tipo = TIPO_PECA[type(peca)]
+            self.bitboards[peca.cor][tipo] |= bit
+            self.ocupacao[peca.cor] |= bit
+            self.chave ^= ZOBRIST_PECAS[peca.cor][tipo][casa]
+
         self.grid[x][y] = peca
 
-    def get_peca(self, posicao):
+    def get_peca(self, casa):
         """
-        Retorna a peça que está armazenada em uma determinada posição.
+        Retorna a peça que está armazenada em uma determinada casa.
 
         Args:
-            posicao (str): Posição no formato "xy".
+            casa (int): Índice da casa (0 a 63).
 
         Returns:
             Object | None: Instância da peça, ou None se a casa estiver vazia.
         """
 
-        x, y = int(posicao[0]), int(posicao[1])
-        return self.grid[x][y]
+        return self.grid[casa >> 3][casa & 7]
     
     def mover_peca(self, origem, destino, roque_preto = False, roque_branco = False, en_passant = False):
         """
         Move uma peça de "origem" até "destino", aplicando regras especiais (roque, en passant).
 
         Args:
-            origem (str): posição de origem dessa peça. (Ex: "04").
-            destino (str): posição final dessa peça. (Ex: "05").
+            origem (int): casa de origem dessa peça. (Ex: 60, a casa "74").
+            destino (int): casa final dessa peça. (Ex: 62, a casa "76").
             roque_preto (bool): Se True, indica roque das pretas.
             roque_branco (bool): Se True, indica roque das brancas.
             en_passant (bool): Se True, indica movimento en passant.
@@ -57,77 +91,40 @@ class Board:
             bool: True se a jogada foi executada com sucesso, False caso contrário.
         """
 
-        # Pega a posição, e a sua determinada peça
-        x, y = int(destino[0]), int(destino[1])
+        # Pega a sua determinada peça
         peca = self.get_peca(origem)
 
-        # Se for roque branco, verifica a posição de destino
-        if roque_branco == True:
+        # Se for um roque, a torre também é movida, conforme a casa de destino do rei
+        if roque_branco == True or roque_preto == True:
             self.posiciona_peca(peca, destino)
             self.posiciona_peca(None, origem)
-            peca.posicao = destino
-
-            # Será um roque curto
-            if destino == "76":
-                torre = self.get_peca("77")
-                self.posiciona_peca(torre, "75")
-                self.posiciona_peca(None, "77")
-                torre.posicao = "75"
-                torre.mexeu += 1
-                return True
-            
-            # Será um roque longo
-            if destino == "72":
-                torre = self.get_peca("70")
-                self.posiciona_peca(torre, "73")
-                self.posiciona_peca(None, "70")
-                torre.posicao = "73"
-                torre.mexeu += 1
-                return True
-            
-        # Se for roque preto, verifica a posição de destino
-        if roque_preto == True:
-            self.posiciona_peca(peca, destino)
-            self.posiciona_peca(None, origem)
-            peca.posicao = destino
-
-            # Será um roque curto
-            if destino == "06":
-                torre = self.get_peca("07")
-                self.posiciona_peca(torre, "05")
-                self.posiciona_peca(None, "07")
-                torre.posicao = "05"
-                torre.mexeu += 1
-                return True
-            
-            # Será um roque longo
-            if destino == "02":
-                torre = self.get_peca("00")
-                self.posiciona_peca(torre, "03")
-                self.posiciona_peca(None, "00")
-                torre.posicao = "03"
+            peca.casa = destino
+
+            if destino in ROQUES_TORRE:
+                origem_torre, destino_torre = ROQUES_TORRE[destino]
+                torre = self.get_peca(origem_torre)
+                self.posiciona_peca(torre, destino_torre)
+                self.posiciona_peca(None, origem_torre)
+                torre.casa = destino_torre
                 torre.mexeu += 1
                 return True
             
-        # Se for um en passant, calcula a posição do peão comido, e subtitui por None
+        # Se for um en passant, calcula a casa do peão comido, e subtitui por None
         if en_passant == True:
-            direcao = 1 if peca.cor == 0 else -1
-            linha = int(destino[0])
-            coluna = int(destino[1])
-            posicao_antigo_peao = str(linha + direcao) + str(coluna)
-            self.posiciona_peca(None, posicao_antigo_peao)
+            casa_antigo_peao = destino + 8 if peca.cor == 0 else destino - 8
+            self.posiciona_peca(None, casa_antigo_peao)
             self.posiciona_peca(peca, destino)
             self.posiciona_peca(None, origem)
-            peca.posicao = destino
+            peca.casa = destino
             return True
             
-        # Coloca a peça na posição de destino, e o none na posição antiga da peça
+        # Coloca a peça na casa de destino, e o none na casa antiga da peça
         self.posiciona_peca(peca, destino)
         self.posiciona_peca(None, origem)
-        peca.posicao = destino
+        peca.casa = destino
 
         # Caso tenha ocorrido como esperado, retorna True
-        if self.grid[x][y] != None:
+        if self.get_peca(destino) != None:
             return True
         else:
             return False
@@ -157,32 +154,794 @@ class Board:
             print(linha)
             cont += 1
 
-    def calcular_movimento(self, posicao):
+    def calcular_movimento(self, casa):
         """
-        Calcula os movimentos válidos para a peça em determinada posição.
+        Calcula os movimentos válidos para a peça em determinada casa, através dos bitboards.
+
+        Os movimentos calculados também são armazenados em "lista_casas_validas" da peça,
+        para que as jogadas especiais (roque e en passant) possam ser adicionadas depois.
 
         Args:
-            posicao (str): Posição da peça a ter seus movimentos calculados. No formato "xy".
+            casa (int): Índice da casa da peça a ter seus movimentos calculados (0 a 63).
 
         Returns:
-            list[str] | str: Lista de movimentos válidos. Retorna "99" se não houver peça.
+            list[int]: Lista de casas de destino válidas. Retorna uma lista vazia se não houver peça.
         """
 
         # Pega a peça
-        peca = self.get_peca(posicao)
+        peca = self.get_peca(casa)
         if peca == None:
-            return "99"
+            return []
         
         # Calcula os seus movimentos
-        peca.movimento(self.grid)
+        destinos = self.destinos_pseudo_legais(casa)
 
         # Armazena no moveset
-        moveset = peca.lista_posicoes_validas
+        peca.lista_casas_validas.clear()
+        peca.lista_casas_validas.extend(iterar_bits(destinos))
+        moveset = peca.lista_casas_validas
         return moveset
+
+    def destinos_pseudo_legais(self, casa):
+        """
+        Calcula o bitboard de destinos da peça em uma casa, sem verificar se o rei fica em xeque.
+
+        Não inclui jogadas especiais (roque e en passant).
+
+        Args:
+            casa (int): Índice da casa da peça (0 a 63).
+
+        Returns:
+            int: Bitboard com as casas de destino, ou 0 se a casa estiver vazia.
+        """
+
+        peca = self.grid[casa >> 3][casa & 7]
+        if peca == None:
+            return 0
+
+        cor = peca.cor
+        tipo = TIPO_PECA[type(peca)]
+        ocupacao = self.ocupacao[0] | self.ocupacao[1]
+
+        # O peão avança e captura de formas diferentes, por isso tem o seu próprio cálculo
+        if tipo == PEAO:
+            return movimentos_peao(cor, casa, ocupacao, self.ocupacao[1 - cor])
+
+        # As demais peças podem ir para qualquer casa atacada que não tenha uma peça aliada
+        return ataques_da_peca(tipo, cor, casa, ocupacao) & ~self.ocupacao[cor]
+
+    def pecas_cravadas(self, cor):
+        """
+        Calcula as peças de uma cor que estão cravadas contra o próprio rei.
+
+        A partir do rei, cada raio é percorrido até a primeira peça. Se ela for aliada e, logo atrás,
+        houver uma torre/rainha (retas) ou um bispo/rainha (diagonais) adversária, a peça está cravada
+        e só pode se mover na linha entre o rei e a peça que a crava (podendo capturá-la).
+
+        Args:
+            cor (int): Cor do rei e das peças analisadas (0 para branco, 1 para preto).
+
+        Returns:
+            dict[int, int]: Casa de cada peça cravada e o bitboard das casas para onde ela ainda pode ir.
+        """
+
+        cravadas = {}
+        rei = self.casa_rei(cor)
+        if rei == None:
+            return cravadas
+
+        aliadas = self.ocupacao[cor]
+        ocupacao = aliadas | self.ocupacao[1 - cor]
+        inimigas = self.bitboards[1 - cor]
+        retas = inimigas[TORRE] | inimigas[RAINHA]
+        diagonais = inimigas[BISPO] | inimigas[RAINHA]
+
+        for direcao in DIRECOES_RAINHA:
+            deslizantes = retas if direcao in DIRECOES_TORRE else diagonais
+            if not deslizantes:
+                continue
+
+            # Primeira peça no raio, que precisa ser aliada
+            bloqueio = RAIOS[direcao][rei] & ocupacao
+            if not bloqueio:
+                continue
+            primeira = (bloqueio & -bloqueio).bit_length() - 1 if DIRECAO_POSITIVA[direcao] else bloqueio.bit_length() - 1
+            if not aliadas & BIT[primeira]:
+                continue
+
+            # Segunda peça no raio, que precisa ser uma peça deslizante adversária
+            bloqueio = RAIOS[direcao][primeira] & ocupacao
+            if not bloqueio:
+                continue
+            segunda = (bloqueio & -bloqueio).bit_length() - 1 if DIRECAO_POSITIVA[direcao] else bloqueio.bit_length() - 1
+            if deslizantes & BIT[segunda]:
+                cravadas[primeira] = ENTRE[rei][segunda] | BIT[segunda]
+
+        return cravadas
+
+    def gerar_movimentos_legais(self, cor, origem = None):
+        """
+        Gera apenas os movimentos legais de uma cor, já codificados (ver "criar_movimento").
+
+        Os atacantes do rei e as peças cravadas são calculados uma única vez para a posição:
+            - Em xeque duplo, apenas o rei pode se mover.
+            - Em xeque simples, as demais peças só podem capturar o atacante ou se colocar entre ele e o rei.
+            - Peças cravadas só andam na linha entre o rei e a peça que as crava.
+            - O rei não pode ir para uma casa atacada, nem rocar em xeque ou passando por casa atacada.
+            - O en passant, que remove duas peças da mesma linha, é confirmado executando a jogada.
+
+        As promoções são geradas para as quatro peças possíveis, começando pela rainha.
+
+        Args:
+            cor (int): Cor das peças que irão se mover (0 para branco, 1 para preto).
+            origem (int, optional): Se informada, gera apenas os movimentos da peça nessa casa.
+
+        Returns:
+            list[int]: Lista dos movimentos legais codificados.
+        """
+
+        movimentos = []
+        aliadas = self.ocupacao[cor]
+        inimigas = self.ocupacao[1 - cor]
+        ocupacao = aliadas | inimigas
+        rei = self.casa_rei(cor)
+        pecas = aliadas if origem == None else aliadas & BIT[origem]
+
+        # Sem o rei no tabuleiro, não há xeques nem peças cravadas
+        atacantes = 0
+        cravadas = {}
+        if rei != None:
+            atacantes = atacantes_da_casa(self.bitboards, ocupacao, rei, 1 - cor)
+            cravadas = self.pecas_cravadas(cor)
+
+            # O rei é retirado da ocupação, para que não se esconda da peça que o ataca na mesma linha
+            if pecas & BIT[rei]:
+                sem_rei = ocupacao ^ BIT[rei]
+                for destino in iterar_bits(ATAQUES_REI[rei] & ~aliadas):
+                    if not casa_atacada(self.bitboards, sem_rei, destino, 1 - cor):
+                        movimentos.append(criar_movimento(rei, destino, CAPTURA if inimigas & BIT[destino] else QUIETO))
+                if not atacantes:
+                    self._adicionar_roques(cor, rei, ocupacao, movimentos)
+                pecas ^= BIT[rei]
+
+        # Em xeque duplo, apenas o rei pode se mover
+        if contar_bits(atacantes) > 1:
+            return movimentos
+
+        # Em xeque simples, as casas permitidas são a do atacante e as que estão entre ele e o rei
+        permitidas = ~aliadas
+        if atacantes:
+            permitidas = atacantes | ENTRE[rei][atacantes.bit_length() - 1]
+
+        for casa in iterar_bits(pecas):
+            tipo = TIPO_PECA[type(self.grid[casa >> 3][casa & 7])]
+            restricao = permitidas & cravadas.get(casa, -1)
+
+            if tipo != PEAO:
+                for destino in iterar_bits(ataques_da_peca(tipo, cor, casa, ocupacao) & ~aliadas & restricao):
+                    movimentos.append(criar_movimento(casa, destino, CAPTURA if inimigas & BIT[destino] else QUIETO))
+                continue
+
+            for destino in iterar_bits(movimentos_peao(cor, casa, ocupacao, inimigas) & restricao):
+                flag = CAPTURA if inimigas & BIT[destino] else QUIETO
+
+                # Chegou na última linha, é gerada uma promoção para cada peça
+                if destino >> 3 in (0, 7):
+                    for promocao in (RAINHA, CAVALO, TORRE, BISPO):
+                        movimentos.append(criar_movimento(casa, destino, flag | PROMOCAO | (promocao - CAVALO)))
+                elif abs(destino - casa) == 16:
+                    movimentos.append(criar_movimento(casa, destino, AVANCO_DUPLO))
+                else:
+                    movimentos.append(criar_movimento(casa, destino, flag))
+
+            # En passant, apenas para o lado que está sendo atacado pelo avanço duplo
+            alvo = self.en_passant
+            if alvo != None and alvo >> 3 == (2 if cor == BRANCO else 5) and ATAQUES_PEAO[cor][casa] & BIT[alvo]:
+                movimento = criar_movimento(casa, alvo, EN_PASSANT)
+                registro = self.make_move(movimento)
+                if not self.rei_em_xeque(cor):
+                    movimentos.append(movimento)
+                self.unmake_move(registro)
+
+        return movimentos
+
+    def _adicionar_roques(self, cor, rei, ocupacao, movimentos):
+        """
+        Adiciona os roques legais de uma cor à lista de movimentos. Deve ser chamado apenas fora do xeque.
+
+        O roque exige que o rei e a torre nunca tenham se movido, que as casas entre eles estejam
+        livres, e que o rei não passe nem termine em uma casa atacada.
+
+        Args:
+            cor (int): Cor do jogador (0 para branco, 1 para preto).
+            rei (int): Casa do rei.
+            ocupacao (int): Bitboard com todas as peças do tabuleiro.
+            movimentos (list[int]): Lista onde os roques são adicionados.
+        """
+
+        peca_rei = self.grid[rei >> 3][rei & 7]
+        if rei != (60 if cor == BRANCO else 4) or peca_rei.mexeu != 0:
+            return
+
+        for destino, flag in ((rei + 2, ROQUE_CURTO), (rei - 2, ROQUE_LONGO)):
+            origem_torre, destino_torre = ROQUES_TORRE[destino]
+            torre = self.grid[origem_torre >> 3][origem_torre & 7]
+            if not isinstance(torre, Rook) or torre.cor != cor or torre.mexeu != 0:
+                continue
+            if ocupacao & ENTRE[rei][origem_torre]:
+                continue
+            if self.is_square_attacked(destino_torre, 1 - cor) or self.is_square_attacked(destino, 1 - cor):
+                continue
+            movimentos.append(criar_movimento(rei, destino, flag))
+
+    def destinos_legais(self, casa, cor):
+        """
+        Retorna as casas de destino legais da peça em uma casa, no formato usado pelo jogo e pela IA.
+
+        As promoções aparecem uma única vez, pois a peça escolhida é definida depois do movimento.
+
+        Args:
+            casa (int): Índice da casa da peça (0 a 63).
+            cor (int): Cor do jogador (0 para branco, 1 para preto).
+
+        Returns:
+            list[int]: Lista de casas de destino legais, vazia se não houver movimentos.
+        """
+
+        destinos = []
+        for movimento in self.gerar_movimentos_legais(cor, casa):
+            flag = movimento >> 12
+            if not flag & PROMOCAO or peca_promovida(flag) == RAINHA:
+                destinos.append((movimento >> 6) & 63)
+        return destinos
+
+    def mapa_ataques(self, cor):
+        """
+        Calcula todas as casas atacadas pelas peças de uma cor.
+
+        Args:
+            cor (int): Cor das peças atacantes (0 para branco, 1 para preto).
+
+        Returns:
+            int: Bitboard com as casas atacadas.
+        """
+
+        return mapa_ataques(self.bitboards, self.ocupacao[0] | self.ocupacao[1], cor)
+
+    def is_square_attacked(self, casa, cor):
+        """
+        Verifica se uma casa é atacada pelas peças de uma cor.
+
+        Os padrões de ataque (raios, cavalo, peão e rei) são lançados a partir da própria casa,
+        sem calcular os movimentos das demais peças do tabuleiro.
+
+        Args:
+            casa (int): Casa analisada (0 a 63).
+            cor (int): Cor das peças atacantes (0 para branco, 1 para preto).
+
+        Returns:
+            bool: True se a casa é atacada, False caso contrário.
+        """
+
+        return casa_atacada(self.bitboards, self.ocupacao[0] | self.ocupacao[1], casa, cor)
+
+    def rei_em_xeque(self, cor):
+        """
+        Verifica se o rei de uma cor está sendo atacado.
+
+        Args:
+            cor (int): Cor do rei analisado (0 para branco, 1 para preto).
+
+        Returns:
+            bool: True se o rei está em xeque, False caso contrário (ou se o rei não estiver no tabuleiro).
+        """
+
+        rei = self.bitboards[cor][REI]
+        if not rei:
+            return False
+        return self.is_square_attacked(rei.bit_length() - 1, 1 - cor)
+
+    def see(self, movimento):
+        """
+        Calcula o saldo de material da troca iniciada por uma captura (Static Exchange Evaluation).
+
+        As peças das duas cores que atacam a casa de destino capturam alternadamente, sempre com a peça
+        menos valiosa, e cada lado pode parar a troca quando continuar o faria perder material. As peças
+        que atacam através de outras (por exemplo, uma torre atrás da outra) entram na troca quando a casa
+        da frente é liberada. As cravações não são consideradas.
+
+        Args:
+            movimento (int): Movimento codificado (ver "criar_movimento").
+
+        Returns:
+            int: Material ganho por quem faz o movimento, ao final da troca (negativo se perder material).
+        """
+
+        origem = movimento & 63
+        destino = (movimento >> 6) & 63
+        flag = movimento >> 12
+
+        peca = self.grid[origem >> 3][origem & 7]
+        ocupacao = (self.ocupacao[0] | self.ocupacao[1]) ^ BIT[origem]
+
+        # Ganho do primeiro movimento, e o valor da peça que fica no destino, exposta à recaptura
+        if flag == EN_PASSANT:
+            ganho = VALOR_PECAS[PEAO]
+            ocupacao ^= BIT[destino + 8 if peca.cor == 0 else destino - 8]
+        elif flag & CAPTURA:
+            ganho = VALOR_PECAS[TIPO_PECA[type(self.grid[destino >> 3][destino & 7])]]
+        else:
+            ganho = 0
+        valor_exposto = VALOR_PECAS[TIPO_PECA[type(peca)]]
+        if flag & PROMOCAO:
+            valor_exposto = VALOR_PECAS[peca_promovida(flag)]
+            ganho += valor_exposto - VALOR_PECAS[PEAO]
+
+        ganhos = [ganho]
+        lado = 1 - peca.cor
+        while True:
+
+            # Os atacantes são recalculados com a ocupação atual, revelando as peças que estavam atrás
+            atacantes = atacantes_da_casa(self.bitboards, ocupacao, destino, lado) & ocupacao
+            if not atacantes:
+                break
+
+            # A próxima captura é feita pela peça menos valiosa
+            for tipo in range(6):
+                candidatas = self.bitboards[lado][tipo] & atacantes
+                if candidatas:
+                    break
+            casa = (candidatas & -candidatas).bit_length() - 1
+
+            # O rei só captura se a casa não estiver mais defendida
+            if tipo == REI and atacantes_da_casa(self.bitboards, ocupacao ^ BIT[casa], destino, 1 - lado) & ocupacao:
+                break
+
+            ganhos.append(valor_exposto - ganhos[-1])
+            valor_exposto = VALOR_PECAS[tipo]
+            ocupacao ^= BIT[casa]
+            lado = 1 - lado
+
+        # Do fim para o começo, cada lado escolhe entre capturar ou parar a troca
+        for indice in range(len(ganhos) - 1, 0, -1):
+            ganhos[indice - 1] = -max(-ganhos[indice - 1], ganhos[indice])
+
+        return ganhos[0]
+
+    def casa_rei(self, cor):
+        """
+        Retorna a casa do rei de uma cor.
+
+        Args:
+            cor (int): Cor do rei (0 para branco, 1 para preto).
+
+        Returns:
+            int | None: Índice da casa (0 a 63), ou None se o rei não estiver no tabuleiro.
+        """
+
+        rei = self.bitboards[cor][REI]
+        if not rei:
+            return None
+        return rei.bit_length() - 1
+
+    def direitos_roque(self):
+        """
+        Calcula os direitos de roque, a partir do atributo "mexeu" do rei e das torres em suas casas iniciais.
+
+        Returns:
+            int: Máscara com os direitos de roque (ver "ROQUE_CURTO_BRANCO" e demais em "zobrist.py").
+        """
+
+        direitos = 0
+        for cor, rei, mascara_curto, mascara_longo in ((BRANCO, 60, ROQUE_CURTO_BRANCO, ROQUE_LONGO_BRANCO), (PRETO, 4, ROQUE_CURTO_PRETO, ROQUE_LONGO_PRETO)):
+            peca_rei = self.grid[rei >> 3][rei & 7]
+            if not isinstance(peca_rei, King) or peca_rei.cor != cor or peca_rei.mexeu != 0:
+                continue
+            for casa_torre, mascara in ((rei + 3, mascara_curto), (rei - 4, mascara_longo)):
+                torre = self.grid[casa_torre >> 3][casa_torre & 7]
+                if isinstance(torre, Rook) and torre.cor == cor and torre.mexeu == 0:
+                    direitos |= mascara
+        return direitos
+
+    def chave_posicao(self, cor):
+        """
+        Retorna a chave Zobrist completa da posição.
+
+        A parte das peças é mantida de forma incremental em "chave". A ela são somados (XOR) os direitos
+        de roque, a coluna do en passant e o lado que joga.
+
+        Args:
+            cor (int): Cor de quem joga na posição (0 para branco, 1 para preto).
+
+        Returns:
+            int: Chave de 64 bits que identifica a posição.
+        """
+
+        chave = self.chave ^ ZOBRIST_ROQUES[self.direitos_roque()]
+        if self.en_passant != None:
+            chave ^= ZOBRIST_EN_PASSANT[self.en_passant & 7]
+        if cor == PRETO:
+            chave ^= ZOBRIST_LADO
+        return chave
+
+    def copiar_de(self, outro):
+        """
+        Copia as peças e os bitboards de outro tabuleiro, sem duplicar as instâncias das peças.
+
+        Args:
+            outro (Board): Tabuleiro a ser copiado.
+        """
+
+        self.grid = [list(linha) for linha in outro.grid]
+        self.bitboards = [list(outro.bitboards[0]), list(outro.bitboards[1])]
+        self.ocupacao = list(outro.ocupacao)
+        self.en_passant = outro.en_passant
+        self.chave = outro.chave
+
+    def serializar(self):
+        """
+        Serializa a posição de forma compacta, para ser enviada a outro processo (ver "busca_paralela.py").
+
+        As instâncias das peças não são enviadas: a posição fica descrita pelos bitboards, pelos direitos
+        de roque e pela casa do en passant.
+
+        Returns:
+            tuple[int]: 12 bitboards (brancas e depois pretas, na ordem dos tipos), a máscara dos direitos
+                de roque e a casa do en passant (-1 se não houver).
+        """
+
+        return (*self.bitboards[0], *self.bitboards[1], self.direitos_roque(), self.en_passant if self.en_passant != None else -1)
+
+    def desserializar(self, dados):
+        """
+        Reconstrói a posição gerada por "serializar", criando novas instâncias das peças.
+
+        O rei e as torres que ainda podem rocar ficam com "mexeu" igual a 0, e os demais com 1.
+
+        Args:
+            dados (tuple[int]): Posição serializada.
+        """
+
+        self.reiniciar()
+        for cor in range(2):
+            for tipo in range(6):
+                for casa in iterar_bits(dados[cor * 6 + tipo]):
+                    peca = CLASSES_PECAS[tipo](cor, casa)
+                    if tipo == REI or tipo == TORRE:
+                        peca.mexeu = 1
+                    self.posiciona_peca(peca, casa)
+
+        # Direitos de roque: o rei e as torres de cada roque permitido ainda não se moveram
+        direitos = dados[12]
+        for rei, mascara_curto, mascara_longo in ((60, ROQUE_CURTO_BRANCO, ROQUE_LONGO_BRANCO), (4, ROQUE_CURTO_PRETO, ROQUE_LONGO_PRETO)):
+            for casa_torre, mascara in ((rei + 3, mascara_curto), (rei - 4, mascara_longo)):
+                if direitos & mascara:
+                    self.grid[rei >> 3][rei & 7].mexeu = 0
+                    self.grid[casa_torre >> 3][casa_torre & 7].mexeu = 0
+
+        self.en_passant = dados[13] if dados[13] >= 0 else None
+
+    def carregar_fen(self, fen):
+        """
+        Carrega uma posição descrita na notação FEN (Ex: "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1").
+
+        A primeira linha da FEN é a linha 0 do tabuleiro (a oitava fileira), e a coluna "a" é a coluna 0.
+        Cada cor precisa ter exatamente um rei. Os direitos de roque só são aplicados quando o rei e a torre
+        estão em suas casas iniciais.
+
+        Args:
+            fen (str): Posição na notação FEN. Os contadores de jogadas são opcionais.
+
+        Returns:
+            tuple[int, int, int]: (cor, meias_jogadas, numero_jogada), com a cor de quem joga (0 para branco,
+                1 para preto), as meias-jogadas desde a última captura ou movimento de peão e o número da jogada.
+
+        Raises:
+            ValueError: Se a FEN for inválida.
+        """
+
+        partes = fen.split()
+        if len(partes) not in (4, 6) or partes[1] not in ("w", "b"):
+            raise ValueError(f"FEN inválida: {fen}")
+
+        # Peças, linha a linha
+        bitboards = [0] * 12
+        linhas = partes[0].split("/")
+        if len(linhas) != 8:
+            raise ValueError(f"FEN inválida: {fen}")
+        for x, linha in enumerate(linhas):
+            y = 0
+            for caractere in linha:
+                if caractere.isdigit():
+                    y += int(caractere)
+                    continue
+                if caractere.upper() not in LETRAS_FEN or y > 7:
+                    raise ValueError(f"FEN inválida: {fen}")
+                cor = BRANCO if caractere.isupper() else PRETO
+                bitboards[cor * 6 + LETRAS_FEN.index(caractere.upper())] |= BIT[indice_casa(x, y)]
+                y += 1
+            if y != 8:
+                raise ValueError(f"FEN inválida: {fen}")
+
+        # Sem exatamente um rei de cada cor, a posição não pode ser analisada (seria vista como afogamento)
+        if bin(bitboards[BRANCO * 6 + REI]).count("1") != 1 or bin(bitboards[PRETO * 6 + REI]).count("1") != 1:
+            raise ValueError(f"FEN inválida: {fen}")
+
+        # Direitos de roque ("-" ou letras de "KQkq", sem repetir), apenas com o rei e a torre em suas casas
+        if partes[2] != "-" and (not set(partes[2]) <= set("KQkq") or len(set(partes[2])) != len(partes[2])):
+            raise ValueError(f"FEN inválida: {fen}")
+        direitos = 0
+        for letra, mascara, rei, torre in (("K", ROQUE_CURTO_BRANCO, 60, 63), ("Q", ROQUE_LONGO_BRANCO, 60, 56),
+                                           ("k", ROQUE_CURTO_PRETO, 4, 7), ("q", ROQUE_LONGO_PRETO, 4, 0)):
+            cor = BRANCO if letra.isupper() else PRETO
+            if letra in partes[2] and bitboards[cor * 6 + REI] & BIT[rei] and bitboards[cor * 6 + TORRE] & BIT[torre]:
+                direitos |= mascara
+
+        # Casa do en passant (Ex: "e3" é a linha 5, coluna 4)
+        en_passant = -1
+        if partes[3] != "-":
+            if len(partes[3]) != 2 or partes[3][0] not in "abcdefgh" or partes[3][1] not in "36":
+                raise ValueError(f"FEN inválida: {fen}")
+            en_passant = indice_casa(8 - int(partes[3][1]), ord(partes[3][0]) - ord("a"))
+
+        self.desserializar((*bitboards, direitos, en_passant))
+
+        cor = BRANCO if partes[1] == "w" else PRETO
+        if len(partes) == 6:
+            if not (partes[4].isdigit() and partes[5].isdigit()) or int(partes[5]) < 1:
+                raise ValueError(f"FEN inválida: {fen}")
+            return cor, int(partes[4]), int(partes[5])
+        return cor, 0, 1
+
+    def gerar_fen(self, cor, meias_jogadas = 0, numero_jogada = 1):
+        """
+        Escreve a posição na notação FEN (o inverso de "carregar_fen").
+
+        Args:
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+            meias_jogadas (int, optional): Meias-jogadas desde a última captura ou movimento de peão. Default é 0.
+            numero_jogada (int, optional): Número da jogada. Default é 1.
+
+        Returns:
+            str: Posição na notação FEN.
+        """
+
+        # Peças, linha a linha, com as casas vazias seguidas contadas
+        linhas = []
+        for x in range(8):
+            linha = ""
+            vazias = 0
+            for y in range(8):
+                peca = self.grid[x][y]
+                if peca == None:
+                    vazias += 1
+                    continue
+                if vazias:
+                    linha += str(vazias)
+                    vazias = 0
+                letra = LETRAS_FEN[TIPO_PECA[type(peca)]]
+                linha += letra if peca.cor == BRANCO else letra.lower()
+            if vazias:
+                linha += str(vazias)
+            linhas.append(linha)
+
+        direitos = self.direitos_roque()
+        roque = "".join(letra for letra, mascara in (("K", ROQUE_CURTO_BRANCO), ("Q", ROQUE_LONGO_BRANCO),
+                                                      ("k", ROQUE_CURTO_PRETO), ("q", ROQUE_LONGO_PRETO)) if direitos & mascara)
+
+        en_passant = "-"
+        if self.en_passant != None:
+            en_passant = "abcdefgh"[self.en_passant & 7] + str(8 - (self.en_passant >> 3))
+
+        return f"{'/'.join(linhas)} {'w' if cor == BRANCO else 'b'} {roque or '-'} {en_passant} {meias_jogadas} {numero_jogada}"
+
+    def sincronizar_bitboards(self):
+        """
+        Reconstrói os bitboards (e a chave das peças) a partir da matriz "grid".
+
+        Usado quando a matriz é alterada diretamente, sem passar por "posiciona_peca".
+        """
+
+        self.bitboards = [[0] * 6, [0] * 6]
+        self.ocupacao = [0, 0]
+        for x in range(8):
+            for y in range(8):
+                peca = self.grid[x][y]
+                if peca != None:
+                    bit = BIT[x * 8 + y]
+                    self.bitboards[peca.cor][TIPO_PECA[type(peca)]] |= bit
+                    self.ocupacao[peca.cor] |= bit
+        self.chave = calcular_chave_pecas(self.bitboards)
     
     def reiniciar(self):
         """
-        Reinicia o tabuleiro para o estado inicial (matriz 8x8 com `None`).
+        Reinicia o tabuleiro para o estado inicial (matriz 8x8 com `None`, bitboards vazios e chave zerada).
+        """
+
+        self.grid = [[None for _ in range (8)] for _ in range(8)]
+        self.bitboards = [[0] * 6, [0] * 6]
+        self.ocupacao = [0, 0]
+        self.en_passant = None
+        self.chave = 0
+
+    def codificar_movimento(self, origem, destino, promocao = RAINHA):
+        """
+        Codifica um movimento a partir da origem e do destino, identificando as jogadas especiais
+        (roque, en passant, avanço duplo, captura e promoção) pelo estado atual do tabuleiro.
+
+        Args:
+            origem (int): Casa de origem (0 a 63).
+            destino (int): Casa de destino (0 a 63).
+            promocao (int, optional): Tipo da peça escolhida caso seja uma promoção. Default é RAINHA.
+
+        Returns:
+            int: Movimento codificado (ver "criar_movimento").
+        """
+
+        peca = self.grid[origem >> 3][origem & 7]
+        tipo = TIPO_PECA[type(peca)]
+        capturada = self.grid[destino >> 3][destino & 7]
+        flag = CAPTURA if capturada != None else QUIETO
+
+        # O rei andando duas colunas caracteriza o roque
+        if tipo == REI and abs((destino & 7) - (origem & 7)) == 2:
+            flag = ROQUE_CURTO if destino & 7 == 6 else ROQUE_LONGO
+
+        elif tipo == PEAO:
+
+            # Captura na diagonal de uma casa vazia, é o en passant
+            if destino == self.en_passant and capturada == None and (destino & 7) != (origem & 7):
+                flag = EN_PASSANT
+
+            # Andou duas linhas
+            elif abs(destino - origem) == 16:
+                flag = AVANCO_DUPLO
+
+            # Chegou na última linha, é uma promoção
+            elif destino >> 3 in (0, 7):
+                flag |= PROMOCAO | (promocao - CAVALO)
+
+        return criar_movimento(origem, destino, flag)
+
+    def make_move(self, movimento):
+        """
+        Executa um movimento codificado diretamente no tabuleiro, sem nenhuma cópia.
+
+        Considera as regras especiais (roque, en passant e promoção) e atualiza o atributo "mexeu"
+        do rei e das torres. Tudo o que é necessário para desfazer a jogada é devolvido em um
+        registro compacto, usado por "unmake_move".
+
+        Args:
+            movimento (int): Movimento codificado (ver "criar_movimento").
+
+        Returns:
+            tuple: Registro da jogada, no formato:
+                (movimento, peca, peca_capturada, casa_captura, en_passant_anterior, mexeu_anterior).
+        """
+
+        origem = movimento & 63
+        destino = (movimento >> 6) & 63
+        flag = movimento >> 12
+
+        peca = self.grid[origem >> 3][origem & 7]
+        en_passant_anterior = self.en_passant
+        mexeu_anterior = getattr(peca, "mexeu", None)
+        self.en_passant = None
+
+        # Peça capturada, no en passant ela está atrás do destino
+        casa_captura = destino
+        if flag == EN_PASSANT:
+            casa_captura = destino + 8 if peca.cor == 0 else destino - 8
+            capturada = self.grid[casa_captura >> 3][casa_captura & 7]
+            self.posiciona_peca(None, casa_captura)
+        else:
+            capturada = self.grid[destino >> 3][destino & 7]
+
+        # Coloca a peça no destino, e o None na posição antiga
+        self.posiciona_peca(None, origem)
+        self.posiciona_peca(peca, destino)
+        peca.casa = destino
+        if mexeu_anterior != None:
+            peca.mexeu += 1
+
+        # No roque, a torre também é movida
+        if flag == ROQUE_CURTO or flag == ROQUE_LONGO:
+            origem_torre, destino_torre = ROQUES_TORRE[destino]
+            torre = self.grid[origem_torre >> 3][origem_torre & 7]
+            self.posiciona_peca(None, origem_torre)
+            self.posiciona_peca(torre, destino_torre)
+            torre.casa = destino_torre
+            torre.mexeu += 1
+
+        # O avanço duplo deixa a casa pulada disponível para o en passant
+        elif flag == AVANCO_DUPLO:
+            self.en_passant = (origem + destino) >> 1
+
+        # Na promoção, o peão é substituído pela peça escolhida
+        elif flag & PROMOCAO:
+            classe = CLASSES_PECAS[peca_promovida(flag)]
+            self.posiciona_peca(classe(peca.cor, destino), destino)
+
+        return (movimento, peca, capturada, casa_captura, en_passant_anterior, mexeu_anterior)
+
+    def unmake_move(self, registro):
+        """
+        Desfaz um movimento executado por "make_move", restaurando exatamente o estado anterior.
+
+        Args:
+            registro (tuple): Registro devolvido por "make_move".
+        """
+
+        movimento, peca, capturada, casa_captura, en_passant_anterior, mexeu_anterior = registro
+        origem = movimento & 63
+        destino = (movimento >> 6) & 63
+        flag = movimento >> 12
+
+        # No roque, a torre volta para o seu lugar
+        if flag == ROQUE_CURTO or flag == ROQUE_LONGO:
+            origem_torre, destino_torre = ROQUES_TORRE[destino]
+            torre = self.grid[destino_torre >> 3][destino_torre & 7]
+            self.posiciona_peca(None, destino_torre)
+            self.posiciona_peca(torre, origem_torre)
+            torre.casa = origem_torre
+            torre.mexeu -= 1
+
+        # A peça volta para a origem (no caso da promoção, volta o próprio peão)
+        self.posiciona_peca(None, destino)
+        self.posiciona_peca(peca, origem)
+        peca.casa = origem
+        if mexeu_anterior != None:
+            peca.mexeu = mexeu_anterior
+
+        # A peça capturada retorna
+        if capturada != None:
+            self.posiciona_peca(capturada, casa_captura)
+
+        self.en_passant = en_passant_anterior
+
+    def perft(self, profundidade, cor):
+        """
+        Conta as posições finais da árvore de movimentos legais até uma profundidade (perft).
+
+        Usado para verificar a geração de movimentos, comparando com valores de referência (ver "perft.py").
+        Na última profundidade, os movimentos são apenas contados, sem serem executados.
+
+        Args:
+            profundidade (int): Profundidade, em meias-jogadas (0 ou menos conta apenas a própria posição).
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+
+        Returns:
+            int: Quantidade de posições finais.
+        """
+
+        if profundidade <= 0:
+            return 1
+        movimentos = self.gerar_movimentos_legais(cor)
+        if profundidade == 1:
+            return len(movimentos)
+
+        nos = 0
+        for movimento in movimentos:
+            registro = self.make_move(movimento)
+            nos += self.perft(profundidade - 1, 1 - cor)
+            self.unmake_move(registro)
+        return nos
+
+    def divide(self, profundidade, cor):
+        """
+        Separa a contagem do perft por movimento da raiz, para encontrar qual movimento diverge da referência.
+
+        Args:
+            profundidade (int): Profundidade, em meias-jogadas (pelo menos 1).
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+
+        Returns:
+            dict[int, int]: Quantidade de posições finais de cada movimento codificado da raiz.
         """
 
-        self.grid = [[None for _ in range (8)] for _ in range(8)]
\ No newline at end of file
+        resultado = {}
+        for movimento in self.gerar_movimentos_legais(cor):
+            registro = self.make_move(movimento)
+            resultado[movimento] = self.perft(profundidade - 1, 1 - cor)
+            self.unmake_move(registro)
+        return resultado
@@ -0,0 +1,442 @@
+"""
+Módulo de Busca.
+
+Contém a busca negamax com poda alfa-beta usada pela IA para escolher as suas jogadas.
+
+O negamax aproveita que o valor de uma posição para um jogador é o negativo do valor para o
+adversário. Assim, um único método analisa as jogadas dos dois lados. A poda alfa-beta interrompe
+a análise de uma posição assim que fica provado que o adversário nunca a permitiria.
+
+A busca é feita em um único tabuleiro, alterado através de "make_move" e "unmake_move", e guarda
+os resultados na tabela de transposição (ver "tabela_transposicao.py"), quando informada.
+
+A profundidade é aprofundada de forma iterativa (1, 2, 3...), o que permite limitar a busca por
+tempo ou por quantidade de posições: quando o limite é atingido, a iteração em andamento é
+abandonada e é devolvido o resultado da última profundidade concluída.
+
+Ao fim da profundidade, a busca continua na quiescência, que analisa apenas as capturas e promoções
+até a posição ficar "calma". Assim, uma troca em andamento não é avaliada pela metade (por exemplo,
+logo depois de uma rainha capturar um peão defendido).
+"""
+
+# Imports necessários
+from bitboard import *
+import time
+from avaliacao import avaliar_posicao, VALOR_PECAS
+from ordenacao import OrdenacaoMovimentos, tipo_capturado, ordenar_capturas, captura_perdedora
+from tabela_transposicao import EXATO, LIMITE_INFERIOR, LIMITE_SUPERIOR
+
+# Valor maior do que qualquer avaliação possível
+INFINITO = 1000000
+
+# Valor do xeque-mate. Diminui conforme a distância da raiz, preferindo os mates mais rápidos
+MATE = 100000
+
+# Profundidade padrão da busca, em meias-jogadas (a quiescência completa as trocas em andamento)
+PROFUNDIDADE_PADRAO = 2
+
+# Profundidade máxima, usada quando a busca é limitada apenas pelo tempo ou pela quantidade de posições
+PROFUNDIDADE_MAXIMA = 64
+
+# A cada quantas posições visitadas o tempo é verificado
+INTERVALO_VERIFICACAO = 256
+
+# Margem da poda delta: capturas que, mesmo somadas a essa margem, não alcançam alfa são ignoradas na quiescência
+MARGEM_DELTA = 200
+
+class Busca:
+    """
+    Classe Busca.
+
+    Executa a busca negamax com poda alfa-beta a partir de uma posição.
+
+    Attributes:
+        tabela (TabelaTransposicao | None): Tabela de transposição usada na busca, ou None para não usar.
+        ordenacao (OrdenacaoMovimentos): Ordenação dos movimentos, com os killers e o histórico da busca.
+        promocoes_menores (bool): Se False, apenas as promoções para rainha são analisadas.
+        nos (int): Quantidade de posições visitadas na última busca (somando todas as iterações).
+        valores_raiz (dict[int, int]): Valor de cada movimento da raiz na última profundidade concluída. Os movimentos
+            empatados com o melhor têm valor exato, os demais são limites superiores (o valor real é menor ou igual).
+        valores_por_profundidade (list[dict[int, int]]): Valores da raiz de cada profundidade concluída (o índice 0 é a profundidade 1).
+        profundidade_concluida (int): Última profundidade concluída na busca.
+        interrompida (bool): Se a última iteração foi abandonada por ter atingido o limite de tempo ou de posições.
+        mate_encontrado (bool): Se a busca parou antes da profundidade máxima por ter encontrado um mate (ou não haver
+            movimentos), e não por um limite. Nesse caso, o valor da última profundidade concluída é definitivo.
+    """
+
+    def __init__(self, tabela = None, ordenacao = None, promocoes_menores = True):
+        """
+        Inicializa a busca.
+
+        Args:
+            tabela (TabelaTransposicao, optional): Tabela de transposição. Default é None.
+            ordenacao (OrdenacaoMovimentos, optional): Ordenação dos movimentos, que pode ser mantida entre buscas.
+                Default é None (uma nova ordenação, vazia).
+            promocoes_menores (bool, optional): Se as promoções para cavalo, bispo e torre são analisadas. Default é True.
+        """
+
+        self.tabela = tabela
+        self.ordenacao = ordenacao if ordenacao != None else OrdenacaoMovimentos()
+        self.promocoes_menores = promocoes_menores
+        self.nos = 0
+        self.valores_raiz = {}
+        self.valores_por_profundidade = []
+        self.profundidade_concluida = 0
+        self.interrompida = False
+        self.mate_encontrado = False
+        self.movimentos_raiz = None
+
+        # Limites da busca em andamento
+        self.inicio = 0
+        self.tempo_limite = None
+        self.limite_nos = None
+        self.pode_interromper = False
+
+    def search(self, tabuleiro, profundidade = PROFUNDIDADE_PADRAO, cor = BRANCO, tempo_limite = None, limite_nos = None, movimentos_raiz = None):
+        """
+        Procura o melhor movimento de uma posição, aprofundando a busca de forma iterativa.
+
+        A primeira profundidade é sempre concluída, assim sempre existe um movimento a devolver.
+
+        Args:
+            tabuleiro (Board): Tabuleiro com a posição analisada. Ao final, volta exatamente ao estado inicial.
+            profundidade (int, optional): Profundidade máxima da busca, em meias-jogadas. Default é 2.
+            cor (int, optional): Cor de quem joga na posição (0 para branco, 1 para preto). Default é BRANCO.
+            tempo_limite (float, optional): Tempo máximo da busca, em segundos. Default é None (sem limite).
+            limite_nos (int, optional): Quantidade máxima de posições visitadas. Default é None (sem limite).
+            movimentos_raiz (list[int], optional): Movimentos da raiz a serem analisados, usado para dividir a raiz
+                entre processos (ver "busca_paralela.py"). Default é None (todos os movimentos legais).
+
+        Returns:
+            tuple[int, int]: (melhor_movimento, valor) da última profundidade concluída. O movimento é
+            codificado (0 se não houver movimentos) e o valor é do ponto de vista de "cor".
+        """
+
+        self.nos = 0
+        self.valores_raiz = {}
+        self.valores_por_profundidade = []
+        self.profundidade_concluida = 0
+        self.interrompida = False
+        self.mate_encontrado = False
+        self.movimentos_raiz = movimentos_raiz
+        self.inicio = time.perf_counter()
+        self.tempo_limite = tempo_limite
+        self.limite_nos = limite_nos
+
+        resultado = (0, 0)
+        for profundidade_atual in range(1, max(1, profundidade) + 1):
+
+            # Os valores da raiz só substituem os anteriores se a iteração for concluída
+            valores_anteriores = self.valores_raiz
+            self.valores_raiz = {}
+            self.pode_interromper = profundidade_atual > 1
+
+            valor = self.negamax(tabuleiro, profundidade_atual, -INFINITO, INFINITO, cor, 0)
+            if self.interrompida:
+                self.valores_raiz = valores_anteriores
+                break
+
+            self.profundidade_concluida = profundidade_atual
+            self.valores_por_profundidade.append(self.valores_raiz)
+            resultado = (self.melhor_movimento_raiz(), valor)
+
+            # Um mate já encontrado não muda com mais profundidade, e sem movimentos não há o que aprofundar
+            if not self.valores_raiz or abs(valor) >= MATE - 1000:
+                self.mate_encontrado = True
+                break
+
+            # Caso o limite já tenha sido atingido, não vale começar uma nova iteração
+            if self.limite_atingido():
+                break
+
+        return resultado
+
+    def melhor_movimento_raiz(self):
+        """
+        Retorna o movimento da raiz de maior valor (o primeiro analisado, em caso de empate).
+
+        Returns:
+            int: Movimento codificado, ou 0 se não houver movimentos.
+        """
+
+        melhor_movimento = 0
+        melhor_valor = -INFINITO
+        for movimento, valor_movimento in self.valores_raiz.items():
+            if valor_movimento > melhor_valor:
+                melhor_movimento, melhor_valor = movimento, valor_movimento
+        return melhor_movimento
+
+    def limite_atingido(self):
+        """
+        Verifica se a busca atingiu o limite de tempo ou de posições visitadas.
+
+        Returns:
+            bool: True se algum dos limites foi atingido, False caso contrário.
+        """
+
+        if self.limite_nos != None and self.nos >= self.limite_nos:
+            return True
+        if self.tempo_limite != None and time.perf_counter() - self.inicio >= self.tempo_limite:
+            return True
+        return False
+
+    def gerar_movimentos(self, tabuleiro, cor):
+        """
+        Gera os movimentos legais de uma posição, descartando as promoções menores caso configurado.
+
+        Args:
+            tabuleiro (Board): Tabuleiro analisado.
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+
+        Returns:
+            list[int]: Movimentos legais codificados.
+        """
+
+        movimentos = tabuleiro.gerar_movimentos_legais(cor)
+        if not self.promocoes_menores:
+            movimentos = [m for m in movimentos if not (m >> 12) & PROMOCAO or peca_promovida(m >> 12) == RAINHA]
+        return movimentos
+
+    def negamax(self, tabuleiro, profundidade, alfa, beta, cor, ply):
+        """
+        Calcula o valor de uma posição com a poda alfa-beta ("fail-soft").
+
+        Args:
+            tabuleiro (Board): Tabuleiro analisado.
+            profundidade (int): Profundidade restante, em meias-jogadas.
+            alfa (int): Valor mínimo já garantido para quem joga.
+            beta (int): Valor máximo que o adversário permite.
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+            ply (int): Distância da raiz, em meias-jogadas.
+
+        Returns:
+            int: Valor da posição do ponto de vista de "cor".
+        """
+
+        self.nos += 1
+        alfa_original = alfa
+
+        # Periodicamente, verifica se a busca deve ser abandonada (o valor devolvido é descartado)
+        if self.pode_interromper and self.nos % INTERVALO_VERIFICACAO == 0 and self.limite_atingido():
+            self.interrompida = True
+            return 0
+
+        # Nas folhas, a busca continua apenas com as capturas e promoções
+        if profundidade <= 0:
+            return self.quiescencia(tabuleiro, alfa, beta, cor, ply)
+
+        # Consulta a tabela de transposição. Fora da raiz, uma entrada profunda o bastante pode encerrar a busca
+        chave = tabuleiro.chave_posicao(cor)
+        movimento_tabela = 0
+        if self.tabela != None:
+            entrada = self.tabela.consultar(chave)
+            if entrada != None:
+                profundidade_tabela, valor_tabela, tipo_tabela, movimento_tabela = entrada
+                if ply > 0 and profundidade_tabela >= profundidade:
+                    valor_tabela = valor_da_tabela(valor_tabela, ply)
+                    if tipo_tabela == EXATO:
+                        return valor_tabela
+                    if tipo_tabela == LIMITE_INFERIOR and valor_tabela >= beta:
+                        return valor_tabela
+                    if tipo_tabela == LIMITE_SUPERIOR and valor_tabela <= alfa:
+                        return valor_tabela
+
+        # Sem movimentos, é xeque-mate ou afogamento
+        movimentos = self.gerar_movimentos(tabuleiro, cor)
+        if not movimentos:
+            return -MATE + ply if tabuleiro.rei_em_xeque(cor) else 0
+        if ply == 0 and self.movimentos_raiz != None:
+            movimentos = [movimento for movimento in movimentos if movimento in self.movimentos_raiz]
+
+        melhor_valor = -INFINITO
+        melhor_movimento = 0
+        for movimento in self.ordenacao.ordenar(tabuleiro, movimentos, cor, ply, movimento_tabela):
+
+            # Na raiz, a janela é aberta em um ponto, para que os empates com o melhor movimento tenham valor exato
+            janela_alfa = alfa - 1 if ply == 0 and alfa > -INFINITO else alfa
+
+            registro = tabuleiro.make_move(movimento)
+            valor = -self.negamax(tabuleiro, profundidade - 1, -beta, -janela_alfa, 1 - cor, ply + 1)
+            tabuleiro.unmake_move(registro)
+
+            # Busca interrompida: o tabuleiro já foi restaurado, e nada é guardado na tabela
+            if self.interrompida:
+                return 0
+
+            if ply == 0:
+                self.valores_raiz[movimento] = valor
+
+            if valor > melhor_valor:
+                melhor_valor = valor
+                melhor_movimento = movimento
+                if valor > alfa:
+                    alfa = valor
+
+                    # Corte beta: o adversário já tem uma alternativa melhor, e não permitirá essa posição
+                    if alfa >= beta:
+                        self.ordenacao.registrar_corte(movimento, cor, profundidade, ply)
+                        break
+
+        # Guarda o resultado na tabela, com o tipo de limite conforme a janela. A raiz restrita a parte dos
+        # movimentos (ver "busca_paralela.py") não é guardada, pois o seu valor não é o valor da posição
+        if self.tabela != None and not (ply == 0 and self.movimentos_raiz != None):
+            if melhor_valor <= alfa_original:
+                tipo = LIMITE_SUPERIOR
+            elif melhor_valor >= beta:
+                tipo = LIMITE_INFERIOR
+            else:
+                tipo = EXATO
+            self.tabela.guardar(chave, profundidade, valor_para_tabela(melhor_valor, ply), tipo, melhor_movimento)
+
+        return melhor_valor
+
+    def quiescencia(self, tabuleiro, alfa, beta, cor, ply):
+        """
+        Estende uma folha da busca pelas capturas e promoções, até a posição ficar calma.
+
+        Quem joga pode sempre "parar" e ficar com a avaliação estática (stand-pat), então ela já serve
+        de limite inferior. Com o rei em xeque não há essa opção, e todas as defesas são analisadas.
+        Os resultados da quiescência não são guardados na tabela de transposição.
+
+        Args:
+            tabuleiro (Board): Tabuleiro analisado.
+            alfa (int): Valor mínimo já garantido para quem joga.
+            beta (int): Valor máximo que o adversário permite.
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+            ply (int): Distância da raiz, em meias-jogadas.
+
+        Returns:
+            int: Valor da posição do ponto de vista de "cor".
+        """
+
+        self.nos += 1
+
+        # Periodicamente, verifica se a busca deve ser abandonada (o valor devolvido é descartado)
+        if self.pode_interromper and self.nos % INTERVALO_VERIFICACAO == 0 and self.limite_atingido():
+            self.interrompida = True
+            return 0
+
+        # Em xeque, todas as jogadas são analisadas, e a falta delas é xeque-mate
+        if tabuleiro.rei_em_xeque(cor):
+            movimentos = self.gerar_movimentos(tabuleiro, cor)
+            if not movimentos:
+                return -MATE + ply
+            melhor_valor = -INFINITO
+
+        else:
+            # Stand-pat: se a avaliação estática já supera beta, não é preciso analisar as capturas
+            melhor_valor = avaliar_posicao(tabuleiro, cor)
+            if melhor_valor >= beta:
+                return melhor_valor
+            if melhor_valor > alfa:
+                alfa = melhor_valor
+
+            movimentos = self.movimentos_taticos(tabuleiro, cor, alfa - melhor_valor)
+
+        for movimento in ordenar_capturas(tabuleiro, movimentos):
+            registro = tabuleiro.make_move(movimento)
+            valor = -self.quiescencia(tabuleiro, -beta, -alfa, 1 - cor, ply + 1)
+            tabuleiro.unmake_move(registro)
+
+            if self.interrompida:
+                return 0
+
+            if valor > melhor_valor:
+                melhor_valor = valor
+                if valor > alfa:
+                    alfa = valor
+                    if alfa >= beta:
+                        break
+
+        return melhor_valor
+
+    def movimentos_taticos(self, tabuleiro, cor, ganho_minimo):
+        """
+        Seleciona as capturas e promoções de uma posição, aplicando a poda delta e descartando as capturas perdedoras.
+
+        A poda delta descarta as capturas que não alcançariam alfa nem ganhando a peça capturada de graça
+        (mais uma margem de segurança). As promoções contam também o ganho de trocar o peão pela nova peça.
+        As capturas que perdem material ao final da troca (ver "Board.see") também são descartadas.
+
+        Args:
+            tabuleiro (Board): Tabuleiro analisado.
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+            ganho_minimo (int): Quanto a jogada precisa ganhar sobre a avaliação estática para alcançar alfa.
+
+        Returns:
+            list[int]: Capturas e promoções codificadas que passaram pelas podas.
+        """
+
+        movimentos = []
+        for movimento in self.gerar_movimentos(tabuleiro, cor):
+            flag = movimento >> 12
+            if not flag & (CAPTURA | PROMOCAO):
+                continue
+
+            ganho = MARGEM_DELTA
+            if flag & CAPTURA:
+                ganho += VALOR_PECAS[tipo_capturado(tabuleiro, movimento)]
+            if flag & PROMOCAO:
+                ganho += VALOR_PECAS[peca_promovida(flag)] - VALOR_PECAS[PEAO]
+
+            if ganho < ganho_minimo:
+                continue
+            if not flag & PROMOCAO and captura_perdedora(tabuleiro, movimento):
+                continue
+            movimentos.append(movimento)
+
+        return movimentos
+
+def valor_para_tabela(valor, ply):
+    """
+    Converte um valor de mate para ser guardado na tabela, contando a distância a partir da posição e não da raiz.
+
+    Args:
+        valor (int): Valor calculado na busca.
+        ply (int): Distância da raiz.
+
+    Returns:
+        int: Valor a ser guardado.
+    """
+
+    if valor >= MATE - 1000:
+        return valor + ply
+    if valor <= -MATE + 1000:
+        return valor - ply
+    return valor
+
+def valor_da_tabela(valor, ply):
+    """
+    Converte um valor de mate lido da tabela de volta para a distância a partir da raiz.
+
+    Args:
+        valor (int): Valor guardado na tabela.
+        ply (int): Distância da raiz.
+
+    Returns:
+        int: Valor para ser usado na busca.
+    """
+
+    if valor >= MATE - 1000:
+        return valor - ply
+    if valor <= -MATE + 1000:
+        return valor + ply
+    return valor
+
+def search(tabuleiro, profundidade = PROFUNDIDADE_PADRAO, cor = BRANCO, tabela = None, tempo_limite = None, limite_nos = None):
+    """
+    Atalho para uma busca simples, sem ordenação personalizada.
+
+    Args:
+        tabuleiro (Board): Tabuleiro com a posição analisada.
+        profundidade (int, optional): Profundidade máxima da busca, em meias-jogadas. Default é 2.
+        cor (int, optional): Cor de quem joga (0 para branco, 1 para preto). Default é BRANCO.
+        tabela (TabelaTransposicao, optional): Tabela de transposição. Default é None.
+        tempo_limite (float, optional): Tempo máximo da busca, em segundos. Default é None (sem limite).
+        limite_nos (int, optional): Quantidade máxima de posições visitadas. Default é None (sem limite).
+
+    Returns:
+        tuple[int, int]: (melhor_movimento, valor), ver "Busca.search".
+    """
+
+    return Busca(tabela).search(tabuleiro, profundidade, cor, tempo_limite, limite_nos)
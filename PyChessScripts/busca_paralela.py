@@ -0,0 +1,190 @@
+"""
+Módulo de Busca Paralela.
+
+Divide a busca da IA entre vários processos, para aproveitar todos os núcleos do processador
+(as threads do Python não executam em paralelo por causa do GIL).
+
+Os movimentos da raiz são ordenados e distribuídos de forma alternada entre os processos, assim cada
+um recebe alguns dos movimentos mais promissores. Cada processo reconstrói a posição a partir da sua
+forma compacta (ver "Board.serializar"), executa a busca com aprofundamento iterativo apenas nos seus
+movimentos e devolve os valores de cada profundidade concluída. Os resultados são juntados na maior
+profundidade concluída por todos os processos que não pararam por um mate, assim todos os valores são comparáveis.
+
+Cada processo mantém a sua própria tabela de transposição e ordenação, entre as jogadas da partida.
+
+O tempo limite vale a partir do início da busca no processo principal: os processos recebem o horário
+final, e não a duração, assim o tempo de criação dos processos e de espera pelas tarefas é descontado.
+"""
+
+# Imports necessários
+import multiprocessing
+import os
+import time
+from bitboard import *
+from board import Board
+from busca import Busca, MATE, PROFUNDIDADE_PADRAO
+from ordenacao import OrdenacaoMovimentos
+from tabela_transposicao import TabelaTransposicao, TAMANHO_PADRAO_MB
+
+# Estado de cada processo, criado uma única vez em "_inicializar_processo"
+_tabuleiro_processo = None
+_tabela_processo = None
+_ordenacao_processo = None
+
+def _inicializar_processo(tamanho_tabela_mb):
+    """
+    Cria o tabuleiro, a tabela de transposição e a ordenação de um processo da busca.
+
+    Args:
+        tamanho_tabela_mb (float): Memória máxima da tabela de transposição do processo, em megabytes.
+    """
+
+    global _tabuleiro_processo, _tabela_processo, _ordenacao_processo
+    _tabuleiro_processo = Board()
+    _tabela_processo = TabelaTransposicao(tamanho_tabela_mb)
+    _ordenacao_processo = OrdenacaoMovimentos()
+
+def _buscar_parte(tarefa):
+    """
+    Executa a busca de uma parte dos movimentos da raiz, dentro de um processo.
+
+    Args:
+        tarefa (tuple): (posicao, cor, movimentos, profundidade, prazo, limite_nos, promocoes_menores),
+            com a posição serializada por "Board.serializar" e o prazo no relógio do sistema ("time.time"), ou None.
+
+    Returns:
+        tuple: (valores_por_profundidade, nos, mate_encontrado), ver os atributos de "Busca".
+    """
+
+    posicao, cor, movimentos, profundidade, prazo, limite_nos, promocoes_menores = tarefa
+    tempo_limite = max(0.0, prazo - time.time()) if prazo != None else None
+
+    _tabuleiro_processo.desserializar(posicao)
+    _tabela_processo.nova_busca()
+    _ordenacao_processo.nova_busca()
+
+    busca = Busca(_tabela_processo, _ordenacao_processo, promocoes_menores)
+    busca.search(_tabuleiro_processo, profundidade, cor, tempo_limite, limite_nos, movimentos)
+    return busca.valores_por_profundidade, busca.nos, busca.mate_encontrado
+
+class BuscaParalela:
+    """
+    Classe BuscaParalela.
+
+    Executa a busca dividindo os movimentos da raiz entre um grupo de processos, mantido entre as buscas.
+    Tem a mesma interface de resultados da classe "Busca" (valores_raiz, profundidade_concluida e nos).
+
+    Attributes:
+        processos (int): Quantidade de processos da busca.
+        tamanho_tabela_mb (float): Memória máxima da tabela de transposição de cada processo, em megabytes.
+        promocoes_menores (bool): Se False, apenas as promoções para rainha são analisadas.
+        grupo (multiprocessing.pool.Pool | None): Grupo de processos, criado na primeira busca.
+        ordenacao (OrdenacaoMovimentos): Ordenação usada para distribuir os movimentos da raiz.
+        nos (int): Quantidade de posições visitadas na última busca, somando todos os processos.
+        valores_raiz (dict[int, int]): Valor de cada movimento da raiz, na profundidade usada para juntar os resultados.
+        profundidade_concluida (int): Profundidade usada para juntar os resultados.
+    """
+
+    def __init__(self, processos = None, tamanho_tabela_mb = TAMANHO_PADRAO_MB, promocoes_menores = True):
+        """
+        Inicializa a busca paralela. Os processos só são criados na primeira busca.
+
+        Args:
+            processos (int, optional): Quantidade de processos. Default é None (um por núcleo do processador).
+            tamanho_tabela_mb (float, optional): Memória da tabela de transposição de cada processo. Default é 16.
+            promocoes_menores (bool, optional): Se as promoções para cavalo, bispo e torre são analisadas. Default é True.
+        """
+
+        self.processos = processos if processos else (os.cpu_count() or 1)
+        self.tamanho_tabela_mb = tamanho_tabela_mb
+        self.promocoes_menores = promocoes_menores
+        self.grupo = None
+        self.ordenacao = OrdenacaoMovimentos()
+        self.nos = 0
+        self.valores_raiz = {}
+        self.profundidade_concluida = 0
+
+    def iniciar(self):
+        """
+        Cria o grupo de processos, caso ainda não exista.
+
+        Os processos são iniciados do zero ("spawn"), sem copiar o processo atual, o que é seguro mesmo
+        quando a busca é chamada de uma thread da interface. Não espera os processos ficarem prontos, então
+        pode ser chamado antes da primeira busca, para que os processos já estejam carregados nela.
+        """
+
+        if self.grupo == None:
+            contexto = multiprocessing.get_context("spawn")
+            self.grupo = contexto.Pool(self.processos, _inicializar_processo, (self.tamanho_tabela_mb,))
+
+    def encerrar(self):
+        """
+        Encerra o grupo de processos. Uma nova busca cria o grupo novamente.
+        """
+
+        if self.grupo != None:
+            self.grupo.terminate()
+            self.grupo.join()
+            self.grupo = None
+
+    def dividir_raiz(self, tabuleiro, movimentos, cor):
+        """
+        Divide os movimentos da raiz entre os processos, alternando na ordem de análise.
+
+        Args:
+            tabuleiro (Board): Tabuleiro com a posição analisada.
+            movimentos (list[int]): Movimentos legais da raiz.
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+
+        Returns:
+            list[list[int]]: Uma lista de movimentos para cada processo usado (nenhuma fica vazia).
+        """
+
+        movimentos = self.ordenacao.ordenar(tabuleiro, movimentos, cor, 0)
+        quantidade = min(self.processos, len(movimentos))
+        return [movimentos[indice::quantidade] for indice in range(quantidade)]
+
+    def search(self, tabuleiro, profundidade = PROFUNDIDADE_PADRAO, cor = BRANCO, tempo_limite = None, limite_nos = None):
+        """
+        Procura o melhor movimento de uma posição, dividindo a raiz entre os processos.
+
+        Args:
+            tabuleiro (Board): Tabuleiro com a posição analisada. Não é alterado.
+            profundidade (int, optional): Profundidade máxima da busca, em meias-jogadas. Default é 2.
+            cor (int, optional): Cor de quem joga na posição (0 para branco, 1 para preto). Default é BRANCO.
+            tempo_limite (float, optional): Tempo máximo da busca, em segundos, incluindo a criação dos processos.
+                Default é None (sem limite).
+            limite_nos (int, optional): Quantidade máxima de posições visitadas, dividida entre os processos.
+                Default é None (sem limite).
+
+        Returns:
+            tuple[int, int]: (melhor_movimento, valor), ver "Busca.search".
+        """
+
+        self.nos = 0
+        self.valores_raiz = {}
+        self.profundidade_concluida = 0
+        prazo = time.time() + tempo_limite if tempo_limite != None else None
+
+        movimentos = Busca(promocoes_menores = self.promocoes_menores).gerar_movimentos(tabuleiro, cor)
+        if not movimentos:
+            return (0, -MATE if tabuleiro.rei_em_xeque(cor) else 0)
+
+        self.iniciar()
+        partes = self.dividir_raiz(tabuleiro, movimentos, cor)
+        limite_parte = max(1, limite_nos // len(partes)) if limite_nos != None else None
+        posicao = tabuleiro.serializar()
+        tarefas = [(posicao, cor, parte, profundidade, prazo, limite_parte, self.promocoes_menores) for parte in partes]
+        resultados = self.grupo.map(_buscar_parte, tarefas)
+
+        # Os resultados são juntados na maior profundidade concluída por todas as partes que pararam por um limite
+        # (de tempo, de posições ou a profundidade máxima). As partes que pararam antes por um mate têm o último
+        # valor definitivo, que é usado caso não tenham chegado a essa profundidade
+        limitadas = [len(valores) for valores, _, mate_encontrado in resultados if not mate_encontrado]
+        self.profundidade_concluida = min(limitadas) if limitadas else max(len(valores) for valores, _, _ in resultados)
+        for valores, nos, _ in resultados:
+            self.nos += nos
+            self.valores_raiz.update(valores[min(self.profundidade_concluida, len(valores)) - 1])
+
+        melhor_movimento = max(self.valores_raiz, key = self.valores_raiz.get)
+        return (melhor_movimento, self.valores_raiz[melhor_movimento])
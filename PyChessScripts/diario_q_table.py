@@ -0,0 +1,133 @@
+"""
+Módulo do Diário da Q-table.
+
+Guarda as alterações da Q-table em um arquivo onde só se acrescenta ao final (um "diário"), ao invés
+de reescrever a Q-table inteira a cada salvamento. Cada salvamento grava apenas os valores alterados,
+então o seu custo depende da quantidade de atualizações, e não do tamanho da Q-table.
+
+A Q-table completa continua sendo salva de tempos em tempos (a compactação): depois disso, o diário é
+esvaziado. Ao carregar, a última Q-table completa é lida e as alterações do diário são aplicadas sobre ela.
+
+Cada registro do diário é um lote de alterações, no formato:
+    - 4 bytes -> tamanho do conteúdo.
+    - 4 bytes -> CRC32 do conteúdo, para detectar registros incompletos.
+    - Conteúdo -> lista de (estado, acao, valor), serializada com pickle.
+
+Caso o programa seja interrompido durante a escrita de um registro, apenas esse último registro é perdido:
+ele é ignorado na leitura e descartado antes do próximo registro acrescentado.
+"""
+
+# Imports necessários
+import os
+import pickle
+import struct
+import zlib
+
+# Cabeçalho de cada registro: tamanho e CRC32 do conteúdo
+CABECALHO = struct.Struct("<II")
+
+class DiarioQTable:
+    """
+    Classe DiarioQTable.
+
+    Arquivo de alterações da Q-table, onde os registros são apenas acrescentados ao final.
+
+    Attributes:
+        caminho (str): Localização do arquivo do diário.
+        entradas (int): Quantidade de alterações guardadas no diário desde a última compactação.
+        verificado (bool): Se o final do arquivo já foi verificado (e o registro incompleto, se houver, descartado).
+    """
+
+    def __init__(self, caminho):
+        """
+        Inicializa o diário. O arquivo só é criado no primeiro registro.
+
+        Args:
+            caminho (str): Localização do arquivo do diário.
+        """
+
+        self.caminho = caminho
+        self.entradas = 0
+        self.verificado = False
+
+    def acrescentar(self, alteracoes):
+        """
+        Acrescenta um lote de alterações ao final do diário, garantindo que seja gravado no disco.
+
+        Args:
+            alteracoes (list[tuple]): Alterações no formato (estado, acao, valor).
+        """
+
+        if not alteracoes:
+            return
+
+        if not self.verificado:
+            self.descartar_registro_incompleto()
+
+        conteudo = pickle.dumps(alteracoes, protocol = pickle.HIGHEST_PROTOCOL)
+        os.makedirs(os.path.dirname(self.caminho) or ".", exist_ok = True)
+        with open(self.caminho, "ab") as f:
+            f.write(CABECALHO.pack(len(conteudo), zlib.crc32(conteudo)) + conteudo)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entradas += len(alteracoes)
+
+    def ler_registros(self):
+        """
+        Lê os registros válidos do diário, do primeiro ao último.
+
+        A leitura para no primeiro registro incompleto ou corrompido (o último, caso a escrita tenha sido interrompida).
+
+        Yields:
+            tuple[list[tuple], int]: (alteracoes, posicao), com a posição do arquivo logo após o registro.
+        """
+
+        if not os.path.exists(self.caminho):
+            return
+
+        with open(self.caminho, "rb") as f:
+            while True:
+                cabecalho = f.read(CABECALHO.size)
+                if len(cabecalho) < CABECALHO.size:
+                    return
+                tamanho, crc = CABECALHO.unpack(cabecalho)
+                conteudo = f.read(tamanho)
+                if len(conteudo) < tamanho or zlib.crc32(conteudo) != crc:
+                    return
+                yield pickle.loads(conteudo), f.tell()
+
+    def descartar_registro_incompleto(self):
+        """
+        Corta do arquivo um registro incompleto no final, para que os próximos registros possam ser lidos.
+        """
+
+        self.verificado = True
+        posicao_valida = 0
+        for _, posicao in self.ler_registros():
+            posicao_valida = posicao
+        if os.path.exists(self.caminho) and os.path.getsize(self.caminho) > posicao_valida:
+            with open(self.caminho, "r+b") as f:
+                f.truncate(posicao_valida)
+
+    def aplicar(self, q_table):
+        """
+        Aplica as alterações do diário sobre uma Q-table, na ordem em que foram gravadas.
+
+        Args:
+            q_table (dict): Q-table carregada da última compactação, alterada no lugar.
+        """
+
+        self.entradas = 0
+        for alteracoes, _ in self.ler_registros():
+            for estado, acao, valor in alteracoes:
+                q_table.setdefault(estado, {})[acao] = valor
+            self.entradas += len(alteracoes)
+
+    def limpar(self):
+        """
+        Esvazia o diário, depois que a Q-table completa foi salva (compactação).
+        """
+
+        if os.path.exists(self.caminho):
+            os.remove(self.caminho)
+        self.entradas = 0
@@ -0,0 +1,159 @@
+"""
+Módulo do Estado do Q-Learning.
+
+Codifica o estado do tabuleiro usado pelo Q-Learning em um único inteiro, calculado direto dos
+bitboards do tabuleiro (ver "bitboard.py"). Os bitboards já são mantidos de forma incremental a cada
+jogada ("Board.make_move"), então o estado custa apenas algumas contagens de bits e um mapa de ataques,
+sem gerar os movimentos legais de nenhuma peça.
+
+O estado é dividido em campos de bits (do menos para o mais significativo):
+    - 7 bits -> material relativo da cor, somado de 64 (0 a 127).
+    - 1 bit  -> se o rei da cor está em xeque.
+    - 7 bits -> mobilidade: casas atacadas pela cor, fora as ocupadas por ela mesma (0 a 64).
+    - 5 bits -> centro: peças da cor no centro, menos as do adversário, somado de 8 (0 a 16).
+    - 1 bit  -> direito de roque curto da cor.
+    - 1 bit  -> direito de roque longo da cor.
+    - 8 bits -> versão do formato (a partir do bit 24).
+
+A versão faz parte do estado, assim estados de formatos diferentes nunca se confundem na Q-table.
+A versão 1 é a tupla usada anteriormente por "QLearning.gerar_estado":
+    (material, xeque, mobilidade, centro, roque_rei, roque_torre_esquerda, roque_torre_direita),
+e pode ser convertida para a versão atual por "migrar_estado".
+"""
+
+# Imports necessários
+from bitboard import *
+from zobrist import ROQUE_CURTO_BRANCO, ROQUE_LONGO_BRANCO
+
+# Versão atual do formato do estado
+VERSAO_ESTADO = 2
+
+# Posição de cada campo no inteiro do estado
+BIT_XEQUE = 7
+BIT_MOBILIDADE = 8
+BIT_CENTRO = 15
+BIT_ROQUE_CURTO = 20
+BIT_ROQUE_LONGO = 21
+BIT_VERSAO = 24
+
+# Valor simples de cada tipo de peça, indexado por PEAO ... REI
+VALOR_MATERIAL = (1, 3, 3, 5, 9, 0)
+
+# Casas centrais: colunas 2 a 5 das linhas 3 e 4
+CENTRO = sum(BIT[indice_casa(x, y)] for x in (3, 4) for y in (2, 3, 4, 5))
+
+def _limitar(valor, minimo, maximo):
+    """
+    Limita um valor ao intervalo [minimo, maximo], para que caiba no seu campo de bits.
+    """
+
+    return max(minimo, min(maximo, valor))
+
+def _montar_estado(material, xeque, mobilidade, centro, roque_curto, roque_longo):
+    """
+    Junta os campos no inteiro do estado, na versão atual.
+
+    Returns:
+        int: Estado codificado.
+    """
+
+    return (_limitar(material + 64, 0, 127)
+            | xeque << BIT_XEQUE
+            | _limitar(mobilidade, 0, 64) << BIT_MOBILIDADE
+            | _limitar(centro + 8, 0, 16) << BIT_CENTRO
+            | roque_curto << BIT_ROQUE_CURTO
+            | roque_longo << BIT_ROQUE_LONGO
+            | VERSAO_ESTADO << BIT_VERSAO)
+
+def codificar_estado(tabuleiro, cor):
+    """
+    Codifica o estado do tabuleiro do ponto de vista de uma cor.
+
+    Args:
+        tabuleiro (Board): Tabuleiro analisado.
+        cor (int): Cor da IA (0 para branco, 1 para preto).
+
+    Returns:
+        int: Estado codificado (ver o formato no início do módulo).
+    """
+
+    bitboards = tabuleiro.bitboards
+    aliadas = bitboards[cor]
+    inimigas = bitboards[1 - cor]
+
+    material = 0
+    for tipo in range(REI):
+        material += VALOR_MATERIAL[tipo] * (contar_bits(aliadas[tipo]) - contar_bits(inimigas[tipo]))
+
+    mobilidade = contar_bits(tabuleiro.mapa_ataques(cor) & ~tabuleiro.ocupacao[cor])
+    centro = contar_bits(tabuleiro.ocupacao[cor] & CENTRO) - contar_bits(tabuleiro.ocupacao[1 - cor] & CENTRO)
+
+    # As máscaras de roque das pretas são as das brancas deslocadas 2 bits
+    direitos = tabuleiro.direitos_roque() >> (2 * cor)
+    roque_curto = int(bool(direitos & ROQUE_CURTO_BRANCO))
+    roque_longo = int(bool(direitos & ROQUE_LONGO_BRANCO))
+
+    return _montar_estado(material, int(tabuleiro.rei_em_xeque(cor)), mobilidade, centro, roque_curto, roque_longo)
+
+def versao_estado(estado):
+    """
+    Identifica a versão do formato de um estado.
+
+    Args:
+        estado (int | tuple): Estado guardado na Q-table.
+
+    Returns:
+        int: Versão do formato (1 para as tuplas antigas).
+    """
+
+    if isinstance(estado, tuple):
+        return 1
+    return estado >> BIT_VERSAO
+
+def migrar_estado(estado):
+    """
+    Converte um estado de uma versão anterior para a versão atual.
+
+    Da versão 1, o material e o xeque são mantidos. A mobilidade contava os movimentos legais, e passa
+    a ser limitada a 64. O centro e o roque da versão 1 eram sempre 0 (a busca comparava as peças
+    pelos nomes "Rei" e "Torre", que não existem), então o centro passa a ser 0 e o roque, nenhum.
+
+    Args:
+        estado (int | tuple): Estado guardado na Q-table.
+
+    Returns:
+        int: Estado na versão atual.
+    """
+
+    if versao_estado(estado) == VERSAO_ESTADO:
+        return estado
+    material, xeque, mobilidade = estado[:3]
+    return _montar_estado(material, xeque, mobilidade, 0, 0, 0)
+
+def migrar_q_table(q_table):
+    """
+    Converte todos os estados de uma Q-table para a versão atual.
+
+    Estados antigos diferentes podem virar o mesmo estado novo: nesse caso, o valor de cada ação
+    é a média dos valores dos estados juntados.
+
+    Args:
+        q_table (dict): Q-table em dicionário, indexada pelos estados.
+
+    Returns:
+        tuple[dict, bool]: (q_table, migrada), com a Q-table na versão atual e se algum estado foi convertido.
+    """
+
+    if all(versao_estado(estado) == VERSAO_ESTADO for estado in q_table):
+        return q_table, False
+
+    nova = {}
+    quantidades = {}
+    for estado, acoes in q_table.items():
+        novo_estado = migrar_estado(estado)
+        acoes_novas = nova.setdefault(novo_estado, {})
+        for acao, valor in acoes.items():
+            quantidade = quantidades.get((novo_estado, acao), 0)
+            acoes_novas[acao] = (acoes_novas.get(acao, 0) * quantidade + valor) / (quantidade + 1)
+            quantidades[(novo_estado, acao)] = quantidade + 1
+    return nova, True
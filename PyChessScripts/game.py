@@ -1,6 +1,7 @@
 # Imports necessários
 from pieces import *
 from board import Board
+from bitboard import *
 from ia import IA
 import json
 import os
@@ -16,17 +17,19 @@ class Game:
 
     Attributes:
         tabuleiro (Board): Instância do tabuleiro principal.
-        copia_grid (list[list]): Cópia do tabuleiro para simulações de jogadas.
-        posicao_rei_branco (str): Posição atual do rei branco.
-        posicao_rei_preto (str): Posição atual do rei preto.
+        copia_tabuleiro (Board): Cópia do tabuleiro para simulações de jogadas.
+        posicao_rei_branco (int): Casa atual do rei branco (0 a 63).
+        posicao_rei_preto (int): Casa atual do rei preto (0 a 63).
         rei_branco_check (int): Indica se o rei branco está em xeque (1 = sim, 0 = não).
         rei_preto_check (int): Indica se o rei preto está em xeque (1 = sim, 0 = não).
         roque_branco (int): Flag que indica possibilidade de roque das brancas.
         roque_preto (int): Flag que indica possibilidade de roque das pretas.
         en_passant (int): Flag que indica possibilidade de en passant.
-        promover_posicao (str): Posição de um peão apto à promoção.
+        promover_posicao (int): Casa de um peão apto à promoção.
         historico (list): Lista de jogadas executadas.
         turno (int): Contador do turno atual.
+        meias_jogadas_iniciais (int): Meias-jogadas sem captura ou movimento de peão da posição carregada por "from_fen".
+        en_passant_inicial (int | None): Casa do en passant da posição carregada por "from_fen", usada enquanto o histórico estiver vazio.
         ia (IA): Instância da inteligência artificial associada.
         lista_pecas_perdidas_pretas (list): Peças pretas que foram capturadas.
         lista_pecas_perdidas_brancas (list): Peças brancas que foram capturadas.
@@ -47,11 +50,9 @@ class Game:
         self.tabuleiro = Board()
 
         # Inicialização dos atributos
-        self.copia_grid = [[None for _ in range (8)] for _ in range(8)]
+        self.copia_tabuleiro = Board()
         self.posicao_rei_branco = 0
         self.posicao_rei_preto = 0
-        self.posicao_teste_rei_preto = 0
-        self.posicao_teste_rei_branco = 0
         self.rei_branco_check = 0
         self.rei_preto_check = 0
         self.roque_branco = 0
@@ -62,6 +63,8 @@ class Game:
         # Inicialização da lista, que representa o histórico
         self.historico = []
         self.turno = 0
+        self.meias_jogadas_iniciais = 0
+        self.en_passant_inicial = None
 
         # Inicialização da IA
         self.ia = IA(self, cor_ia)
@@ -80,67 +83,42 @@ class Game:
         """
 
         # Peões
-        for i in range(8):
-            y = i
-            x = 1
-            posicao = str(x) + str(y)
-            self.tabuleiro.posiciona_peca(Pawn(1, posicao), posicao)
-            x = 6
-            posicao = str(x) + str(y)
-            self.tabuleiro.posiciona_peca(Pawn(0, posicao), posicao)
-
-        # Torres
-        self.tabuleiro.posiciona_peca(Rook(1, "00"), "00")
-        self.tabuleiro.posiciona_peca(Rook(1, "07"), "07")
-        self.tabuleiro.posiciona_peca(Rook(0, "70"), "70")
-        self.tabuleiro.posiciona_peca(Rook(0, "77"), "77")
-
-        # Cavalos
-        self.tabuleiro.posiciona_peca(Horse(1, "01"), "01")
-        self.tabuleiro.posiciona_peca(Horse(1, "06"), "06")
-        self.tabuleiro.posiciona_peca(Horse(0, "71"), "71")
-        self.tabuleiro.posiciona_peca(Horse(0, "76"), "76")
-
-        # Bispos
-        self.tabuleiro.posiciona_peca(Bishop(1, "02"), "02")
-        self.tabuleiro.posiciona_peca(Bishop(1, "05"), "05")
-        self.tabuleiro.posiciona_peca(Bishop(0, "72"), "72")
-        self.tabuleiro.posiciona_peca(Bishop(0, "75"), "75")
-
-        # Rainhas
-        self.tabuleiro.posiciona_peca(Queen(1, "03"), "03")
-        self.tabuleiro.posiciona_peca(Queen(0, "73"), "73")
-
-        # Reis
-        self.tabuleiro.posiciona_peca(King(1, "04"), "04")
-        self.tabuleiro.posiciona_peca(King(0, "74"), "74")
-
-    def posiciona_peca_jogo(self, peca, posicao):
+        for y in range(8):
+            casa = indice_casa(1, y)
+            self.tabuleiro.posiciona_peca(Pawn(1, casa), casa)
+            casa = indice_casa(6, y)
+            self.tabuleiro.posiciona_peca(Pawn(0, casa), casa)
+
+        # Torres, cavalos, bispos, rainhas e reis, na ordem em que ficam na primeira linha
+        for y, classe in enumerate((Rook, Horse, Bishop, Queen, King, Bishop, Horse, Rook)):
+            casa = indice_casa(0, y)
+            self.tabuleiro.posiciona_peca(classe(1, casa), casa)
+            casa = indice_casa(7, y)
+            self.tabuleiro.posiciona_peca(classe(0, casa), casa)
+
+    def posiciona_peca_jogo(self, peca, casa):
         """
         Posiciona uma determinada peça no tabuleiro simulado (cópia do tabuleiro real).
 
         Args:
             peca (object | None): Instância da peça a ser posicionada, ou None se for remover.
-            posicao (str): Posição concatenada de dois números, onde o primeiro representa o x e o segundo o y. (Ex: "04")
+            casa (int): Índice da casa (0 a 63). (Ex: 4, a casa "04")
         """
 
-        # Pegando as posições de x e y
-        x, y = int(posicao[0]), int(posicao[1])
-        self.copia_grid[x][y] = peca
+        self.copia_tabuleiro.posiciona_peca(peca, casa)
 
-    def get_peca_jogo(self, posicao):
+    def get_peca_jogo(self, casa):
         """
-        Obtém a peça de uma posição no tabuleiro simulado.
+        Obtém a peça de uma casa no tabuleiro simulado.
 
         Args:
-            posicao (str): Posição no formato "xy".
+            casa (int): Índice da casa (0 a 63).
 
         Returns:
-            Object | None: A peça na posição informada, ou None se estiver vazia.
+            Object | None: A peça na casa informada, ou None se estiver vazia.
         """
 
-        x, y = int(posicao[0]), int(posicao[1])
-        return self.copia_grid[x][y]
+        return self.copia_tabuleiro.get_peca(casa)
     
     def criar_copia_tabuleiro(self):
         """
@@ -151,60 +129,30 @@ class Game:
         de xeque, roque e xeque-mate.
         """
 
+        self.copia_tabuleiro.copiar_de(self.tabuleiro)
 
-        for i in range(8):
-            for j in range(8):
-                self.copia_grid[i][j] = self.tabuleiro.grid[i][j]
-                peca = self.copia_grid[i][j]
-                if peca:
-
-                    # Atualiza a posição dos reis
-                    if type(peca).__name__.lower() == "king" and peca.cor == 0:
-                        self.posicao_rei_branco = str(i) + str(j)
-                    elif type(peca).__name__.lower() == "king" and peca.cor == 1:
-                        self.posicao_rei_preto = str(i) + str(j)
+        # Atualiza a posição dos reis, obtida diretamente dos bitboards
+        casa_rei_branco = self.tabuleiro.casa_rei(0)
+        casa_rei_preto = self.tabuleiro.casa_rei(1)
+        if casa_rei_branco != None:
+            self.posicao_rei_branco = casa_rei_branco
+        if casa_rei_preto != None:
+            self.posicao_rei_preto = casa_rei_preto
 
     def verificar_xeque(self):
         """
         Verifica se algum dos reis sofreu um xeque após o último movimento executado.
 
-        Percorre todas as peças no tabuleiro simulado, calcula seus movimentos e identifica se alguma
-        delas ameaça a posição atual dos reis. Caso sim, é considerado o Xeque.
+        Através dos bitboards do tabuleiro simulado, verifica-se se a casa de cada rei é atacada
+        pela cor adversária ("is_square_attacked"). Caso sim, é considerado o Xeque.
 
         Atualiza:
             rei_branco_check (int): 1 se o rei branco está em xeque, 0 caso contrário.
             rei_preto_check (int): 1 se o rei preto está em xeque, 0 caso contrário.
         """
 
-        # Reseta os atributos
-        self.rei_branco_check = 0
-        self.rei_preto_check = 0
-
-        # Laço para vasculhar todo o tabuleiro
-        for i in range(8):
-            for j in range(8):
-                peca = self.copia_grid[i][j]
-                if peca:
-
-                    # Se algum dos possíveis movimento dessa peça ameaçar o rei, é considerado xeque
-                    peca.movimento(self.copia_grid)
-                    moveset = peca.lista_posicoes_validas
-
-                    # Caso seja uma peça branca
-                    if peca.cor == 0:
-                        for m in moveset:
-                            if m == self.posicao_teste_rei_preto:
-
-                                # Atualiza o atributo
-                                self.rei_preto_check = 1
-
-                    # Caso seja uma peça preta
-                    if peca.cor == 1:
-                        for m in moveset:
-                            if m == self.posicao_teste_rei_branco:
-
-                                # Atualiza o atributo
-                                self.rei_branco_check = 1
+        self.rei_branco_check = int(self.copia_tabuleiro.rei_em_xeque(0))
+        self.rei_preto_check = int(self.copia_tabuleiro.rei_em_xeque(1))
 
     def mover_peca_jogo(self, origem, destino):
         """
@@ -217,8 +165,8 @@ class Game:
             - Histórico de movimentos.
 
         Args:
-            origem (str): posição de origem dessa peça. (Ex: "04").
-            destino (str): posição final dessa peça. (Ex: "05").
+            origem (int): casa de origem dessa peça. (Ex: 4, a casa "04").
+            destino (int): casa final dessa peça. (Ex: 5, a casa "05").
 
         Returns:
             bool: True se a jogada foi executada com sucesso, False caso contrário.
@@ -239,7 +187,7 @@ class Game:
             peca.mexeu += 1
 
             # Se for um roque curto das pretas
-            if origem == "74" and destino == "76" and self.roque_branco:
+            if origem == 60 and destino == 62 and self.roque_branco:
 
                 # Move a peça no tabuleiro original
                 self.tabuleiro.mover_peca(origem, destino, roque_branco = True)
@@ -256,7 +204,7 @@ class Game:
                 return True
             
             # Se for um roque longo das pretas
-            if origem == "74" and destino == "72" and self.roque_branco:
+            if origem == 60 and destino == 58 and self.roque_branco:
                 self.tabuleiro.mover_peca(origem, destino, roque_branco = True)
                 self.roque_branco = 2
                 self.criar_copia_tabuleiro()
@@ -265,7 +213,7 @@ class Game:
                 return True
             
             # Se for um roque curto das brancas
-            if origem == "04" and destino == "06" and self.roque_preto:
+            if origem == 4 and destino == 6 and self.roque_preto:
                 self.tabuleiro.mover_peca(origem, destino, roque_preto = True)
                 self.roque_preto = 2
                 self.criar_copia_tabuleiro()
@@ -274,7 +222,7 @@ class Game:
                 return True
             
             # Se for um roque longo das brancas
-            if origem == "04" and destino == "02" and self.roque_preto:
+            if origem == 4 and destino == 2 and self.roque_preto:
                 self.tabuleiro.mover_peca(origem, destino, roque_preto = True)
                 self.roque_preto = 2
                 self.criar_copia_tabuleiro()
@@ -297,71 +245,37 @@ class Game:
         self.salvar_historico(letra, cor, origem, destino, captura = houve_captura, letra_capturada = peca_capturada_letra)
         return True
         
-    def calcular_movimento_jogo(self, posicao, cor_jogador):
+    def calcular_movimento_jogo(self, casa, cor_jogador):
         """
-        Calcula todos os movimentos válidos para a peça em uma posição.
+        Calcula todos os movimentos válidos para a peça em uma casa.
 
         O cálculo considera movimentos padrões, e jogadas especiais. 
-        Além de bloquear movimentos ilegais.
+        Além de bloquear movimentos ilegais (peças cravadas, xeques e roque passando por casa atacada).
 
         Args:
-            posicao (str): Posição no formato "xy".
+            casa (int): Índice da casa da peça (0 a 63).
             cor_jogador (int): Cor do jogador a ter seu movimento calculado,
             representada por um inteiro. (0 para branco, 1 para preto).
 
         Returns:
-            list[str]: Lista de movimento válidos e filtrados. 
-            str: Retorna "99" se não houver uma peça na posição consultada.
+            list[int]: Lista das casas de destino válidas e filtradas. 
+            Lista vazia se não houver uma peça na casa consultada.
         """
 
-        # É armazenado para testar as posições atuais dos reis
-        self.posicao_teste_rei_preto = self.posicao_rei_preto
-        self.posicao_teste_rei_branco = self.posicao_rei_branco
-
-        movimentos = []
-
         # Pega a peça
-        peca = self.tabuleiro.get_peca(posicao)
+        peca = self.tabuleiro.get_peca(casa)
         if peca == None:
-            return "99"
-
-        # Calcula a lista de seus movimentos
-        peca.movimento(self.tabuleiro.grid)
+            return []
 
-        # Caso seja um rei, é verificado a possibilidade de fazer um roque
-        if type(peca).__name__[0].lower() == "k":
+        # As jogadas especiais atualizam as flags usadas em "mover_peca_jogo" (e a casa do en passant no tabuleiro)
+        if isinstance(peca, King):
             self.verificar_roque(cor_jogador)
+        self.verificar_en_passant(casa)
 
-        self.verificar_en_passant(posicao)
+        # Os movimentos legais são gerados de uma vez, considerando peças cravadas e xeques
+        movimentos = self.tabuleiro.destinos_legais(casa, cor_jogador)
+        peca.lista_casas_validas = list(movimentos)
 
-        moveset = list(peca.lista_posicoes_validas)
-
-        # É analisada individualmente cada possível movimento
-        for m in moveset:
-            self.criar_copia_tabuleiro()
-            destino = m
-            origem = peca.posicao
-
-            # Caso seja um rei é necessário atualizar a posição de teste
-            if type(peca).__name__[0].lower() == "k":
-                if peca.cor == 0:
-                    self.posicao_teste_rei_branco = destino
-                else:
-                    self.posicao_teste_rei_preto = destino
-                
-            # É colocada a peça nessa nova posição no tabuleiro simulado
-            self.posiciona_peca_jogo(peca, destino)
-            self.posiciona_peca_jogo(None, origem)
-
-            # Verifica-se o xeque
-            self.verificar_xeque()
-
-            # Caso não seja um movimento ilegal é armazenada como válido
-            if self.rei_branco_check == 0 and cor_jogador == 0:
-                movimentos.append(m)
-            if self.rei_preto_check == 0 and cor_jogador == 1:
-                movimentos.append(m)
-        
         return movimentos
     
     def verificar_xeque_mate(self, cor_jogador):
@@ -385,14 +299,10 @@ class Game:
         movimentos = []
 
         # É analisado todas as peças do tabuleiro individualmente
-        for i in range(8):
-            for j in range(8):
-                posicao = str(i) + str(j)
-                peca = self.tabuleiro.get_peca(posicao)
+        for casa in iterar_bits(self.tabuleiro.ocupacao[cor_jogador]):
 
-                # É visto se essa peça possui movimentos possíveis
-                if peca and peca.cor == cor_jogador:
-                    movimentos += self.calcular_movimento_jogo(posicao, cor_jogador)
+            # É visto se essa peça possui movimentos possíveis
+            movimentos += self.calcular_movimento_jogo(casa, cor_jogador)
 
         # Caso não haja nenhum movimento válido disponível, é considerado fim de jogo
         if movimentos == []:
@@ -454,7 +364,7 @@ class Game:
                             if torre_branca_direita.mexeu == 0:
 
                                 # Caso tudo esteja correto, é armazenada a posição do roque e a flag é atualizada
-                                rei_branco.lista_posicoes_validas.append("76")
+                                rei_branco.lista_casas_validas.append(62)
                                 self.roque_branco = 1
 
                     # É feita mesma verificação agora com a torre da esquerda           
@@ -464,7 +374,7 @@ class Game:
                         if torre_branca_esquerda != None and type(torre_branca_esquerda).__name__ == "Rook":
 
                             if torre_branca_esquerda.mexeu == 0:
-                                rei_branco.lista_posicoes_validas.append("72")
+                                rei_branco.lista_casas_validas.append(58)
                                 self.roque_branco = 1
 
         
@@ -483,7 +393,7 @@ class Game:
                         if torre_preta_direita != None and type(torre_preta_direita).__name__ == "Rook":
 
                             if torre_preta_direita.mexeu == 0:
-                                rei_preto.lista_posicoes_validas.append("06")
+                                rei_preto.lista_casas_validas.append(6)
                                 self.roque_preto = 1
 
                     if self.tabuleiro.grid[0][3] == None and self.tabuleiro.grid[0][2] == None and self.tabuleiro.grid[0][1] == None:
@@ -492,12 +402,12 @@ class Game:
                         if torre_preta_esquerda != None and type(torre_preta_esquerda).__name__ == "Rook":
 
                             if torre_preta_esquerda.mexeu == 0:
-                                rei_preto.lista_posicoes_validas.append("02")
+                                rei_preto.lista_casas_validas.append(2)
                                 self.roque_preto = 1
 
-    def verificar_en_passant(self, posicao):
+    def verificar_en_passant(self, casa):
         """
-        Verifica se é possível executar en passant para o peão na posição informada.
+        Verifica se é possível executar en passant para o peão na casa informada.
 
         A verificação considera:
             - A última jogada realizada (deve ser um peão adversário).
@@ -508,67 +418,144 @@ class Game:
         de en passant e ativa a flag correspondente.
 
         Args:
-            posicao (str): Posição no formato "xy".
+            casa (int): Índice da casa do peão (0 a 63).
         """
 
-        # Atualiza a flag para zero
+        # Atualiza a flag para zero, assim como a casa alvo do en passant no tabuleiro
         self.en_passant = 0
+        self.tabuleiro.en_passant = None
 
-        # Tenta-se pegar o último movimento, caso não seja possível, por ser a primeira jogada, retorna
-        try:
-            ultima_jogada = self.historico[self.turno - 1]
-        except IndexError:
-            return
-        
-        # Se a última peça movida, não foi um peão, o en passant é impossível, retorna
-        if ultima_jogada[0] != "P":
+        # A casa por onde o peão passou, obtida da última jogada (ou da posição carregada, sem jogadas), caso exista
+        casa_alvo = self.calcular_casa_en_passant()
+        if casa_alvo == None:
             return
-            
-        # É analisada a cor do peão e a cor do jogador com base na cor do peão
-        cor_peao = 0 if ultima_jogada[1] == "b" else 1
-        cor_jogador = 1 - cor_peao    
-
-        # Pega-se qual movimento o peão realizou por último
-        origem = ultima_jogada[2:4]
-        destino = ultima_jogada[4:6]
 
-        # É se atribuído devidamente as linhas e a coluna
-        linha_origem = int(origem[0])
-        linha_destino = int(destino[0])
-        coluna_destino = int(destino[1])
+        # O peão que avançou está na linha seguinte à casa alvo (as brancas avançam para a linha 4, as pretas para a linha 3)
+        cor_peao = 0 if casa_alvo >> 3 == 5 else 1
+        cor_jogador = 1 - cor_peao
+        destino = casa_alvo - 8 if cor_peao == 0 else casa_alvo + 8
 
-        # Caso o peão não andou duas casas (necessário para o en passant), retorna
-        if abs(linha_origem - linha_destino) != 2:
-            return
-        
-        # Se pega a direção do movimento do peão adversário
-        direcao = -1 if cor_jogador == 0 else 1
+        # A casa por onde o peão passou é guardada no tabuleiro, para que a captura seja identificada ao executar o movimento
+        self.tabuleiro.en_passant = casa_alvo
 
-        # Testa os peões adjacentes (esquerda e direita)
+        # Testa os peões adjacentes (esquerda e direita), que precisam estar na mesma linha
+        coluna_destino = destino & 7
         for diferencial in [-1, 1]:
             coluna_lateral = coluna_destino + diferencial
 
-            # Verifica se é uma coluna dentro do tabuleiro
-            if 0 <= coluna_lateral <= 7:
+            # Verifica se é uma coluna dentro do tabuleiro, e se é a casa informada
+            if not 0 <= coluna_lateral <= 7 or casa != destino + diferencial:
+                continue
+
+            # É pego o peão lateral
+            peao_lateral = self.tabuleiro.get_peca(casa)
+
+            # Verifica se realmente é um peão, e se ele pertence ao jogador adversário (aquele que irá fazer o en passant)
+            if (peao_lateral != None and isinstance(peao_lateral, Pawn) and peao_lateral.cor == cor_jogador):
+
+                # Caso sim, a casa por onde o peão adversário passou é armazenada nas casas válidas do peão e a flag atualiza permitindo o en passant
+                peao_lateral.lista_casas_validas.append(self.tabuleiro.en_passant)
+                self.en_passant = 1
+
+
+    def calcular_casa_en_passant(self):
+        """
+        Calcula a casa alvo de um possível en passant, através da última jogada do histórico.
+
+        Returns:
+            int | None: Casa por onde o peão passou no seu avanço de duas casas,
+            ou None caso a última jogada não tenha sido um avanço duplo de peão.
+            Sem jogadas, é a casa do en passant da posição carregada por "from_fen" (ou None).
+        """
+
+        # Caso seja a primeira jogada, só existe en passant na posição carregada
+        if not self.historico:
+            return self.en_passant_inicial
+
+        # Se a última peça movida não foi um peão, o en passant é impossível
+        ultima_jogada = self.historico[-1]
+        if ultima_jogada[0] != "P":
+            return None
+
+        # Caso o peão não tenha andado duas casas, também é impossível
+        origem = CASAS[ultima_jogada[2:4]]
+        destino = CASAS[ultima_jogada[4:6]]
+        if abs(origem - destino) != 16:
+            return None
 
-                # Pega a posição dessa lateral
-                posicao_lateral = str(linha_destino) + str(coluna_lateral)
+        return (origem + destino) >> 1
 
-                # Sendo uma possição diferente continua
-                if posicao != posicao_lateral:
-                    continue
+    def chave_posicao(self, cor_jogador):
+        """
+        Retorna a chave Zobrist da posição atual da partida (ver "Board.chave_posicao").
 
-                # É pego o peão lateral
-                peao_lateral = self.tabuleiro.get_peca(posicao_lateral)
+        Args:
+            cor_jogador (int): Cor de quem joga na posição (0 para branco, 1 para preto).
 
-                # Verifica se realmente é um peão, e se ele pertence ao jogador adversário (aquele que irá fazer o en passant)
-                if (peao_lateral != None and isinstance(peao_lateral, Pawn) and peao_lateral.cor == cor_jogador):
+        Returns:
+            int: Chave de 64 bits que identifica a posição.
+        """
 
-                    # Caso sim, é armazenada nas posições válidas do peão e a flag atualiza permitindo o en passant
-                    posicao_en_passant = str(linha_destino + direcao) + str(coluna_destino)
-                    peao_lateral.lista_posicoes_validas.append(posicao_en_passant)
-                    self.en_passant = 1
+        return self.tabuleiro.chave_posicao(cor_jogador)
 
+    def to_fen(self):
+        """
+        Escreve a posição atual da partida na notação FEN (ver "Board.gerar_fen").
+
+        A cor de quem joga vem do turno, os direitos de roque do atributo "mexeu" do rei e das torres,
+        e a casa do en passant da última jogada do histórico. As meias-jogadas sem captura ou movimento
+        de peão são contadas no final do histórico (somadas às da posição carregada, se não houver nenhuma).
+
+        Returns:
+            str: Posição na notação FEN.
+        """
+
+        meias_jogadas = 0
+        for jogada in reversed(self.historico):
+            if jogada[0] == "P" or "c" in jogada[6:]:
+                break
+            meias_jogadas += 1
+        else:
+            meias_jogadas += self.meias_jogadas_iniciais
+
+        return self.tabuleiro.gerar_fen(self.turno % 2, meias_jogadas, self.turno // 2 + 1)
+
+    def from_fen(self, fen):
+        """
+        Coloca a partida em uma posição descrita na notação FEN, como se ela estivesse nessa posição.
+
+        O turno passa a ser o da jogada da FEN (com a sua paridade indicando a cor de quem joga) e o histórico
+        começa vazio, assim a posição carregada não pode ser desfeita. A casa do en passant, caso exista, é
+        guardada em "en_passant_inicial", usada enquanto não houver jogadas no histórico.
+
+        Args:
+            fen (str): Posição na notação FEN (Ex: "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1").
+
+        Raises:
+            ValueError: Se a FEN for inválida, ou a casa do en passant não corresponder a um avanço duplo de peão.
+        """
+
+        self.reiniciar()
+        cor, meias_jogadas, numero_jogada = self.tabuleiro.carregar_fen(fen)
+
+        self.turno = 2 * (numero_jogada - 1) + cor
+        self.meias_jogadas_iniciais = meias_jogadas
+
+        # O peão que avançou duas casas é do adversário de quem joga, e a casa do en passant fica entre a origem e o destino
+        casa = self.tabuleiro.en_passant
+        if casa != None:
+            cor_peao = 1 - cor
+            origem = casa + 8 if cor_peao == 0 else casa - 8
+            destino = casa - 8 if cor_peao == 0 else casa + 8
+            peao = self.tabuleiro.get_peca(destino)
+            if (casa >> 3) != (5 if cor_peao == 0 else 2) or not isinstance(peao, Pawn) or peao.cor != cor_peao \
+                    or self.tabuleiro.get_peca(origem) != None or self.tabuleiro.get_peca(casa) != None or self.turno == 0:
+                self.reiniciar()
+                raise ValueError(f"FEN inválida: {fen}")
+            self.en_passant_inicial = casa
+
+        self.criar_copia_tabuleiro()
+        self.verificar_xeque()
 
     def verificar_promocao_peao(self):
         """
@@ -590,17 +577,17 @@ class Game:
         for i in range(8):
 
             # Pega-se a peça que ocupa essa posição
-            peca = self.copia_grid[0][i]
+            peca = self.copia_tabuleiro.grid[0][i]
 
             # Se for um peão e pertencer a cor contrária é atualizada a posição de promoção
             if type(peca).__name__ == "Pawn" and peca.cor == 0:
-                self.promover_posicao = str(0) + str(i)
+                self.promover_posicao = indice_casa(0, i)
                 return True
             
             # Faz-se a mesma verificação agora para o outro jogador
-            peca = self.copia_grid[7][i]
+            peca = self.copia_tabuleiro.grid[7][i]
             if type(peca).__name__ == "Pawn" and peca.cor == 1:
-                self.promover_posicao = str(7) + str(i)
+                self.promover_posicao = indice_casa(7, i)
                 return True
             
         return False
@@ -619,11 +606,8 @@ class Game:
             nova_peca (str): Nome da peça para o qual o peão será promovido.
         """
 
-        # Pega-se a posição do peão a ser promovido
-        x, y = int(self.promover_posicao[0]), int(self.promover_posicao[1])
-
-        # Pega-se a cor do peão em formato de int e string
-        cor = self.tabuleiro.grid[x][y].cor
+        # Pega-se a cor do peão a ser promovido, em formato de int e string
+        cor = self.tabuleiro.get_peca(self.promover_posicao).cor
         cor_texto = "b" if cor == 0 else "p"
 
         # Caso a peça a substituir o peão é rainha
@@ -671,8 +655,8 @@ class Game:
         Args:
             letra (str): A primeira letra do nome da peça.
             cor (str) A primeira letra da cor, "b" para branco, "p" para preto.
-            origem (str): Posição em formato "xy", da posição atual da peça.
-            destino (str): Posição em formato "xy", da posição futura da peça.
+            origem (int): Casa atual da peça (0 a 63), gravada no formato "xy".
+            destino (int): Casa futura da peça (0 a 63), gravada no formato "xy".
             roque_branco (bool): Flag que determina se a jogada foi um roque ou não.
             roque_preto (bool): Flag que determina se a jogada foi um roque ou não.
             en_passant (bool): Flag que determina se a jogada foi um en passant ou não.
@@ -691,7 +675,7 @@ class Game:
 
         # Caso seja um roque, é adicionada um "R" para roque grande, e "r" para roque curto
         if roque_branco or roque_preto:
-            especial += "R" if destino.endswith("2") else "r"
+            especial += "R" if destino & 7 == 2 else "r"
 
         # Se for um en passant, é adicionada um "e"
         if en_passant:
@@ -702,14 +686,14 @@ class Game:
             especial += "p" + peca_promovida
 
             # Salva a composição da jogada com o "movimento"
-            movimento = f"{letra}{cor}{origem}{destino}{especial}"
+            movimento = f"{letra}{cor}{NOMES_CASAS[origem]}{NOMES_CASAS[destino]}{especial}"
 
             # Caso seja um movimento duplicado, impede o armazenamento, pois configura um erro
             if self.historico and self.historico[-1] == movimento:
                 return
             
             # Como a promoção acontece separadamente das outras jogadas, ela é armazenada no história e já é retornada
-            self.historico.append(f"{letra}{cor}{origem}{destino}{especial}")
+            self.historico.append(movimento)
 
             # Contabiliza-se mais um para o turno
             self.turno += 1
@@ -720,17 +704,20 @@ class Game:
             especial += "c" + letra_capturada
 
         # É salva a composição da jogada com o "movimento"
-        movimento = f"{letra}{cor}{origem}{destino}{especial}"
+        movimento = f"{letra}{cor}{NOMES_CASAS[origem]}{NOMES_CASAS[destino]}{especial}"
 
         # Impede salvar duplicamente
         if self.historico and self.historico[-1] == movimento:
             return
         
         # É guardada essa jogada no histórico
-        self.historico.append(f"{letra}{cor}{origem}{destino}{especial}")
+        self.historico.append(movimento)
 
         # É contabalizada mais um para o turno
         self.turno += 1
+
+        # A casa do en passant no tabuleiro acompanha a última jogada, mantendo a chave da posição correta
+        self.tabuleiro.en_passant = self.calcular_casa_en_passant()
     
 
     def salvar_partida(self, caminho_arquivo):
@@ -739,6 +726,7 @@ class Game:
 
         O arquivo conterá:
             - Lista de peças em jogo (tipo, cor, posição e, para torres/reis, se já se moveram).
+            - Posição na notação FEN (ver "to_fen"), com os direitos de roque e o en passant.
             - Turno atual.
             - Histórico completo de jogadas.
 
@@ -751,6 +739,9 @@ class Game:
         # Salva-se o número do turno, e o histórico da partida
         dados = {
             "pecas": [],
+            "fen": self.to_fen(),
+            "meias_jogadas_iniciais": self.meias_jogadas_iniciais,
+            "en_passant_inicial": self.en_passant_inicial,
             "turno": self.turno,
             "historico": self.historico
             }
@@ -792,7 +783,7 @@ class Game:
 
         A operação:
             - Limpa o tabuleiro atual.
-            - Recria todas as peças com base nos dados salvos.
+            - Recria todas as peças com base nos dados salvos (pela FEN, se o arquivo tiver uma).
             - Restaura atributos especiais (ex.: `mexeu` para torres e reis).
             - Restaura histórico e turno.
 
@@ -808,9 +799,12 @@ class Game:
             dados = json.load(f)
 
         # Zera-se o tabuleiro original, para não interferir no processo de carregamento
-        for i in range(8):
-            for j in range(8):
-                self.tabuleiro.grid[i][j] = None
+        self.tabuleiro.reiniciar()
+
+        # Os arquivos com a FEN já trazem as peças e os direitos de roque, assim a lista de peças é ignorada
+        if "fen" in dados:
+            self.tabuleiro.carregar_fen(dados["fen"])
+            dados["pecas"] = []
 
         # Abre o dicionário, e pega-se todas as peças gravadas nele
         for peca_info in dados["pecas"]:
@@ -818,7 +812,9 @@ class Game:
             # Pega os principais atributos
             tipo = peca_info["tipo"].lower()
             cor = peca_info["cor"]
-            posicao = peca_info["posicao"]
+
+            # O arquivo guarda a posição no formato "xy", que é convertida para o índice da casa
+            posicao = CASAS[peca_info["posicao"]]
 
             # Se for o rei ou a torre, pega o atributo "mexeu" também.
             if tipo == "king":
@@ -852,6 +848,9 @@ class Game:
         # Por último é pego o histórico e o turno
         self.historico = dados.get("historico", [])
         self.turno = dados.get("turno", 0)
+        self.meias_jogadas_iniciais = dados.get("meias_jogadas_iniciais", 0)
+        self.en_passant_inicial = dados.get("en_passant_inicial")
+        self.tabuleiro.en_passant = self.calcular_casa_en_passant()
 
         return True
     
@@ -875,26 +874,21 @@ class Game:
         # Flag para saber se a jogada foi um xeque
         jogada_xeque = False
 
-        # Se o turno for menor que zero (impossível, afinal o jogo começa no turno zero), retorna
-        if self.turno <= 0:
+        # Se não houver jogadas no histórico (início da partida ou da posição carregada), retorna
+        if not self.historico:
             return
         
         # Diminui um turno no total, para retornar ao estado do jogo antes dessa jogada
         self.turno -= 1
 
-        # Tenta acessar esse elemento na lista, se não existir, é retornado
-        try:
-            ultima_jogada = self.historico[self.turno]
-        except IndexError:
-            return
-        
-        # É retirado esse elemento da lista
-        self.historico.pop(self.turno)
+        # É retirada a última jogada da lista, e a casa do en passant volta a ser a da jogada anterior
+        ultima_jogada = self.historico.pop()
+        self.tabuleiro.en_passant = self.calcular_casa_en_passant()
 
         # Pega-se os principais atributos
         cor = 0 if ultima_jogada[1] == "b" else 1
-        posicao_retornar = ultima_jogada[2:4]
-        posicao_atual = ultima_jogada[4:6]
+        posicao_retornar = CASAS[ultima_jogada[2:4]]
+        posicao_atual = CASAS[ultima_jogada[4:6]]
 
         # Tenta acessar uma possível jogada especial, se não aconteceu, apenas ignora
         try:
@@ -932,13 +926,13 @@ class Game:
                 self.tabuleiro.mover_peca(posicao_atual, posicao_retornar)
 
                 # É pega a posição da torre
-                peca = self.tabuleiro.get_peca("73")
+                peca = self.tabuleiro.get_peca(59)
 
                 # Diminui o seu atributo "mexeu"
                 peca.mexeu -= 1
 
                 # A coloca de volta no seu lugar
-                self.tabuleiro.mover_peca("73", "70")
+                self.tabuleiro.mover_peca(59, 56)
 
                 # Restaura o atributo "roque_branco"
                 self.roque_branco = 0
@@ -948,9 +942,9 @@ class Game:
             # A mesma coisa acontece, agora com as pretas
             elif cor == 1:
                 self.tabuleiro.mover_peca(posicao_atual, posicao_retornar)
-                peca = self.tabuleiro.get_peca("03")
+                peca = self.tabuleiro.get_peca(3)
                 peca.mexeu -= 1
-                self.tabuleiro.mover_peca("03", "00")
+                self.tabuleiro.mover_peca(3, 0)
                 self.roque_preto = 0
                 return
 
@@ -958,16 +952,16 @@ class Game:
         elif especial == "r":
             if cor == 0:
                 self.tabuleiro.mover_peca(posicao_atual, posicao_retornar)
-                peca = self.tabuleiro.get_peca("75")
+                peca = self.tabuleiro.get_peca(61)
                 peca.mexeu -= 1
-                self.tabuleiro.mover_peca("75", "77")
+                self.tabuleiro.mover_peca(61, 63)
                 self.roque_branco = 0
                 return
             elif cor == 1:
                 self.tabuleiro.mover_peca(posicao_atual, posicao_retornar)
-                peca = self.tabuleiro.get_peca("05")
+                peca = self.tabuleiro.get_peca(5)
                 peca.mexeu -= 1
-                self.tabuleiro.mover_peca("05", "07")
+                self.tabuleiro.mover_peca(5, 7)
                 self.roque_preto = 0
                 return
 
@@ -1025,13 +1019,8 @@ class Game:
             # Move-se o peão que capturou de volta ao seu lugar anterior
             self.tabuleiro.mover_peca(posicao_atual, posicao_retornar)
 
-            # É pega a linha, a coluna e a direção
-            linha_atual = int(posicao_atual[0])
-            coluna_atual = posicao_atual[1]
-            direcao = -1 if peca.cor == 0 else 1
-
-            # É calculada a posição que o peão capturado se encontrava antes
-            posicao_peao_comido = str(linha_atual - direcao) + coluna_atual
+            # É calculada a casa que o peão capturado se encontrava antes (uma linha atrás do destino)
+            posicao_peao_comido = posicao_atual + 8 if peca.cor == 0 else posicao_atual - 8
 
             # O peão que foi capturado é posicionada no seu lugar anterior
             self.tabuleiro.posiciona_peca(Pawn(cor_oposta, posicao_peao_comido), posicao_peao_comido)
@@ -1053,7 +1042,7 @@ class Game:
         # Caso não haja nenhum movimento especial, a peça simplesmente retorna para o seu lugar anterior
         self.tabuleiro.mover_peca(posicao_atual, posicao_retornar)
 
-    def jogar_ia(self):
+    def jogar_ia(self, profundidade = None, tempo_limite = None, limite_nos = None, processos = None):
         """
         Método responsável por calcular e executar a jogada da IA.
 
@@ -1062,12 +1051,19 @@ class Game:
             - Ela através de seus métodos de avaliação, escolhe a jogada que trará mais resultado.
             - Executa essa jogada escolhida no tabuleiro real.
 
+        Args:
+            profundidade (int, optional): Profundidade máxima da busca da IA.
+            tempo_limite (float, optional): Tempo máximo da jogada, em segundos.
+            limite_nos (int, optional): Quantidade máxima de posições analisadas.
+            processos (int, optional): Quantidade de processos da busca.
+            Os argumentos não informados usam os valores da própria IA (ver "IA.simular_jogada").
+
         Returns:
             str: Movimento escolhido no formato "origemdestino" (Ex: "0406").
         """
 
-        # A ia simula uma série de jogadas
-        self.ia.simular_jogada()
+        # A ia simula uma série de jogadas, respeitando os limites da jogada
+        self.ia.simular_jogada(profundidade, tempo_limite, limite_nos, processos)
 
         # Ela aplica essa jogada, e gera a sua recompensa
         self.ia.aplicar_jogada_escolhida()
@@ -1078,26 +1074,26 @@ class Game:
         # Se o movimento existir
         if movimento:
 
-            # É separada a origem do movimento, e o seu destino
-            origem = movimento[:2]
-            destino = movimento[2:]
+            # É separada a origem do movimento, e o seu destino (a IA usa o formato "xyxy")
+            origem = CASAS[movimento[:2]]
+            destino = CASAS[movimento[2:]]
 
             # A jogada é executada
             self.mover_peca_jogo(origem, destino)
 
             # É retornada a string concatenada da jogada
-            return f"{origem}{destino}"
+            return movimento
 
-    def colocar_peca_promovida_ia(self, cor, posicao):
+    def colocar_peca_promovida_ia(self, cor, casa):
         """
         Promove automaticamente um peão da IA para rainha (escolha fixa)
 
         Args:
             cor (int): Cor da peça (0 = branco, 1 = preto).
-            posicao (str): Posição do peão a ser promovido.
+            casa (int): Casa do peão a ser promovido (0 a 63).
         """
 
-        self.tabuleiro.posiciona_peca(Queen(cor, posicao), posicao)
+        self.tabuleiro.posiciona_peca(Queen(cor, casa), casa)
 
     def reiniciar(self):
         """
@@ -1114,11 +1110,9 @@ class Game:
         self.inicializar_pecas()
 
         # Zera todos os atributos
-        self.copia_grid = [[None for _ in range (8)] for _ in range(8)]
+        self.copia_tabuleiro = Board()
         self.posicao_rei_branco = 0
         self.posicao_rei_preto = 0
-        self.posicao_teste_rei_preto = 0
-        self.posicao_teste_rei_branco = 0
         self.rei_branco_check = 0
         self.rei_preto_check = 0
         self.roque_branco = 0
@@ -1129,6 +1123,12 @@ class Game:
         self.lista_pecas_perdidas_pretas.clear()
         self.historico = []
         self.turno = 0
+        self.meias_jogadas_iniciais = 0
+        self.en_passant_inicial = None
+
+        # As posições analisadas na partida anterior não são mais úteis
+        self.ia.tabela_transposicao.limpar()
+        self.ia.ordenacao.limpar()
 
     def verificar_insuficiencia_de_material(self):
         """
@@ -1233,7 +1233,7 @@ class Game:
 
             # Tenta acessar a última jogada, se existir
             try:
-                ultimo_movimento = self.historico[self.turno - 1]
+                ultimo_movimento = self.historico[-1]
             except IndexError:
                 return
             
@@ -1,5 +1,10 @@
 # Imports necessários
 from pieces import *
+from bitboard import *
+from tabela_transposicao import TabelaTransposicao, TAMANHO_PADRAO_MB
+from busca import Busca, PROFUNDIDADE_PADRAO, PROFUNDIDADE_MAXIMA
+from ordenacao import OrdenacaoMovimentos
+from busca_paralela import BuscaParalela
 import copy
 
 class IA:
@@ -8,313 +13,189 @@ class IA:
 
     Controladora principal responsável por controlar a inteligência artificial do jogo de xadrez.
 
-    Executa simulações de jogadas em diferentes níveis de profundidade, garantindo que
+    Analisa as jogadas através de uma busca negamax com poda alfa-beta (ver "busca.py"), garantindo que
     apenas movimentos válidos sejam executado. Interage com o sistema Q-Learning para tomada
     de decisões baseadas em aprendizagem por reforço.
+
+    As simulações são feitas em um único tabuleiro, alterado no lugar através de
+    "make_move" e "unmake_move", sem copiar o tabuleiro a cada jogada.
+
+    As posições analisadas ficam guardadas em uma tabela de transposição, e os killers e o histórico da
+    ordenação dos movimentos, mantidos durante toda a partida.
     """
 
-    def __init__(self, jogo, cor_ia = 1):
+    def __init__(self, jogo, cor_ia = 1, tamanho_tabela_mb = TAMANHO_PADRAO_MB, profundidade = PROFUNDIDADE_PADRAO, tempo_limite = None, limite_nos = None, processos = 1):
         """
         Inicialza a IA juntamente de seus atributos.
 
         Args:
             jogo (Game): Instância da classe Game, contendo o estado do jogo.
             cor_ia (int, optional): Representa a cor que a IA irá jogar nessa partida. (0 para branco, 1 para preto). Default é 1.
+            tamanho_tabela_mb (float, optional): Memória máxima da tabela de transposição, em megabytes. Default é 16.
+            profundidade (int, optional): Profundidade máxima da busca, em meias-jogadas. Default é 2.
+            tempo_limite (float, optional): Tempo máximo de cada jogada, em segundos. Default é None (sem limite).
+            limite_nos (int, optional): Quantidade máxima de posições analisadas em cada jogada. Default é None (sem limite).
+            processos (int, optional): Quantidade de processos da busca. Com mais de um, a raiz é dividida entre eles
+                (ver "busca_paralela.py"). Default é 1.
         """
 
         # Atribuição do Game, da cor e a criação da lista de jogadas
         self.jogo = jogo
         self.cor = cor_ia
+        self.profundidade = profundidade
+        self.tempo_limite = tempo_limite
+        self.limite_nos = limite_nos
+        self.processos = processos
+        self.tamanho_tabela_mb = tamanho_tabela_mb
         self.lista_jogadas_possiveis = []
 
+        # Estatísticas da última busca (posições visitadas e profundidade concluída)
+        self.nos = 0
+        self.profundidade_concluida = 0
+
+        # Criação da tabela de transposição e da ordenação dos movimentos, que persistem entre as jogadas da partida
+        self.tabela_transposicao = TabelaTransposicao(tamanho_tabela_mb)
+        self.ordenacao = OrdenacaoMovimentos()
+
+        # A busca paralela só é criada na primeira jogada com mais de um processo, caso não
+        # tenha sido atribuída antes (a interface compartilha uma única busca entre as IAs)
+        self.busca_paralela = None
+
         # Criação e atribuição do QLearning (Classe responsável pelas decições e o aprendizado)
         self.qlearning = QLearning(self.jogo)
 
-    def simular_jogada(self):   
+    def simular_jogada(self, profundidade = None, tempo_limite = None, limite_nos = None, processos = None):
         """
-        Realiza simulação de jogadas em três níveis de profundidade,
-        ou seja, IA -> JOGADOR -> IA.
+        Analisa as jogadas da IA através da busca negamax com poda alfa-beta, aprofundada de forma iterativa.
+
+        Cada movimento da IA é armazenado em "lista_jogadas_possiveis" junto do valor encontrado pela
+        busca, do melhor para o pior. Os movimentos são ordenados por "OrdenacaoMovimentos" (movimento da
+        tabela, capturas, killers e histórico), o que faz a poda acontecer mais cedo.
 
-        Para cada sequência completa, armazena o estado final do tabuleiro junto
-        dos movimentos inicias executados pelas simulações.
+        Com um limite de tempo ou de posições, a busca para ao atingi-lo, e são usados os valores
+        da última profundidade concluída. Os argumentos não informados usam os atributos da IA.
 
-        As jogadas são podadas com base em uma heurística de valor, para evitar simulações gigantescas irrelevantes.
+        Args:
+            profundidade (int, optional): Profundidade máxima da busca. Caso não informada e exista algum limite,
+                a busca vai até "PROFUNDIDADE_MAXIMA", parando pelo limite.
+            tempo_limite (float, optional): Tempo máximo da jogada, em segundos.
+            limite_nos (int, optional): Quantidade máxima de posições analisadas.
+            processos (int, optional): Quantidade de processos da busca.
         """
 
+        # Os limites não informados são os da própria IA
+        tempo_limite = tempo_limite if tempo_limite != None else self.tempo_limite
+        limite_nos = limite_nos if limite_nos != None else self.limite_nos
+        processos = processos if processos != None else self.processos
+        if profundidade == None:
+            profundidade = PROFUNDIDADE_MAXIMA if tempo_limite != None or limite_nos != None else self.profundidade
+
         # Limpa o "lista_jogadas_possiveis" para começar zerado
-        self.lista_jogadas_possiveis.clear()    
+        self.lista_jogadas_possiveis.clear()
 
         # Inicializa os principais atributos, o tabuleiro e as flags necessárias para as simulações
         self.inicializar_tabuleiro_e_flags()
 
-        # Nível 1 Jogada da IA - Vasculha todas as casas do tabuleiro copiado
-        for i in range(8):
-            for j in range(8):
-                peca = self.copia_grid[i][j]
-
-                # Verifica se é uma peça, e se pertence ao computador
-                if peca != None and peca.cor == self.cor:
-
-                    # Pega-se a posição
-                    posicao = str(i) + str(j)
-
-                    # É calculado e armazenado os movimentos dessa peça dentro de "moveset"
-                    moveset = list(self.calcular_movimento(posicao, self.cor))
-
-                    # Caso ela não tenha movimentos possíveis, pula
-                    if not moveset:
-                        continue
-
-                    # Poda: Simula apenas os 7 melhores movimentos
-                    moveset.sort(key = lambda m: self.valor_movimento(posicao, m), reverse = True)
-                    moveset = moveset[:7]
-
-                    # É feita uma cópia para salvar os atributos antes de modifica-los
-                    copia_profundidade_1 = self.copiar_tabuleiro_e_flags()
-
-                    # Agora analisa-se todos os movimentos calculados dessa peça
-                    for m in moveset:
-                        destino = m
-                        origem = str(i) + str(j)
-
-                        # O movimento analisado é executado
-                        self.mover_peca_ia(origem, destino)
-
-                        # É verificado se é possível promover o peão
-                        if self.verificar_promocao_peao() == True:
-                            self.promover_peao()
-
-                        # Nível 2 Jogada do Jogador - Vasculha todas as casas do tabuleiro copiado
-                        for k in range(8):
-                            for l in range(8):
-                                peca_2 = self.copia_grid[k][l]
-
-                                # É feito o mesmo procedimento de antes, agora procurando apenas por peças do jogador
-                                cor = 1 - self.cor
-                                if peca_2 != None and peca_2.cor == cor:
-                                    posicao_2 = str(k) + str(l)
-                                    moveset_2 = list(self.calcular_movimento(posicao_2, cor))
-                                    if not moveset_2:
-                                        continue
-
-                                    moveset_2.sort(key = lambda m: self.valor_movimento(posicao_2, m), reverse = True)
-                                    moveset_2 = moveset_2[:1]
-                                    
-                                    copia_profundidade_2 = self.copiar_tabuleiro_e_flags()
-                                    for n in moveset_2:
-                                        destino_2 = n
-                                        origem_2 = str(k) + str(l)
-                                        self.mover_peca_ia(origem_2, destino_2)
-
-                                        if self.verificar_promocao_peao() == True:
-                                            self.promover_peao()
-
-                                        # Nível 3 Jogada da IA - Vasculha novamente todas as casas do tabuleiro copiado
-                                        for z in range(8):
-                                            for x in range(8):
-                                                peca_3 = self.copia_grid[z][x]
-                                                if peca_3 != None and peca_3.cor == self.cor:
-                                                    posicao_3 = str(z) + str(x)
-                                                    moveset_3 = list(self.calcular_movimento(posicao_3, self.cor))
-                                                    if not moveset_3:
-                                                        continue
-
-                                                    moveset_3.sort(key = lambda m: self.valor_movimento(posicao_3, m), reverse = True)
-                                                    moveset_3 = moveset_3[:1]
-
-                                                    copia_profundidade_3 = self.copiar_tabuleiro_e_flags()
-                                                    for y in moveset_3:
-                                                        destino_3 = y
-                                                        origem_3 = str(z) + str(x)
-                                                        self.mover_peca_ia(origem_3, destino_3)
-
-                                                        if self.verificar_promocao_peao() == True:
-                                                            self.promover_peao()
-
-                                                        # Após os 3 níveis de execução serem concluídos uma vez, é armazenado em uma dicionário, o movimento inicial, e o estado do tabuleiro que foi chegado
-                                                        movimento = origem + destino
-                                                        tabuleiro = self.salvar_tabuleiro()
-                                                        self.lista_jogadas_possiveis.append({"tipo": "movimento",
-                                                                                            "movimento": movimento,
-                                                                                            "tabuleiro": tabuleiro})
-                                                        
-                                                        # As flags e o tabuleiro são restaurados para o seu anterior dentro do nível 3
-                                                        self.restaurar_tabuleiro_e_flags(copia_profundidade_3)
-
-                                        # As flags e o tabuleiro são restaurados para o seu anterior dentro do nível 2
-                                        self.restaurar_tabuleiro_e_flags(copia_profundidade_2)
-
-                        # As flags e o tabuleiro são restaurados para o seu anterior dentro do nível 1
-                        self.restaurar_tabuleiro_e_flags(copia_profundidade_1)
-
-    def valor_movimento(self, origem, destino):
-        """
-        Avalia a relevância de um movimento baseada em heurística simples.
-
-        Critérios avaliados:
-            - Captura de peça (peso baseado no valor da peça capturada).
-            - Centralização (domínio do centro do tabuleiro).
-            - Promoção de peão.
-            - Desenvolvimento inicial das peças.
+        # Uma nova busca começa, as entradas das jogadas anteriores passam a poder ser substituídas
+        self.tabela_transposicao.nova_busca()
+        self.ordenacao.nova_busca()
+
+        # A IA sempre promove para rainha, então as promoções menores não são analisadas
+        if processos > 1:
+            busca = self.obter_busca_paralela(processos)
+        else:
+            busca = Busca(self.tabela_transposicao, self.ordenacao, promocoes_menores = False)
+        busca.search(self.tabuleiro, profundidade, self.cor, tempo_limite, limite_nos)
+        self.nos = busca.nos
+        self.profundidade_concluida = busca.profundidade_concluida
+
+        # Os movimentos da raiz são armazenados no formato "xyxy" usado pela Q-table, do melhor para o pior
+        for movimento, valor in sorted(busca.valores_raiz.items(), key = lambda item: item[1], reverse = True):
+            self.lista_jogadas_possiveis.append({"tipo": "movimento",
+                                                 "movimento": NOMES_CASAS[origem_movimento(movimento)] + NOMES_CASAS[destino_movimento(movimento)],
+                                                 "valor": valor})
+
+    def obter_busca_paralela(self, processos):
+        """
+        Retorna a busca paralela da IA, criando-a (ou recriando, caso a quantidade de processos tenha mudado).
 
         Args:
-            origem (str): Posição de origem no formato "xy".
-            destino (str): Posição de destino no formato "xy".
+            processos (int): Quantidade de processos da busca.
 
         Returns:
-            int: Valor heurístico atríbuido a possível jogada.
-        """
-
-        valor = 0
-
-        # Captura de peças
-        peca_destino = self.get_peca(destino)
-        if peca_destino != None:
-            nome = type(peca_destino).__name__.upper()
-            valores_pecas = {
-                "PAWN": 1,
-                "HORSE": 3,
-                "BISHOP": 3,
-                "TOWER": 5,
-                "QUEEN": 9,
-                "KING": 60
-            }
-
-            # É pego o valor da peça e multiplicado por um peso comum
-            valor += valores_pecas.get(nome, 0) * 10 
-
-        # Centralização da peça
-        linha, coluna = int(destino[0]), int(destino[1])
-        if 2 <= linha <= 5 and 2 <= coluna <= 5:
-            valor += 5
-
-        # Promoção de peão
-        peca_origem = self.get_peca(origem)
-        if type(peca_origem).__name__.upper() == "PAWN":
-            if (peca_origem.cor == 0 and linha == 0) or (peca_origem.cor == 1 and linha == 7):
-                valor += 20
-        
-        # Desenvolvimento do bispo e do cavalo
-        if type(peca_origem).__name__.upper() in ("HORSE", "BISHOP") and (
-        (peca_origem.cor == 0 and int(origem[0]) == 7) or
-        (peca_origem.cor == 1 and int(origem[0]) == 0)):
-            valor += 6
-
-        # Salva estado atual do xeque
-        estado_xeque_branco = self.rei_branco_check
-        estado_xeque_preto = self.rei_preto_check
-
-        # Verifica se o movimento é xeque
-        self.criar_copia_tabuleiro_copiado()
-        self.posiciona_peca_copiado(peca_origem, destino)
-        self.posiciona_peca_copiado(None, origem)
-        self.verificar_xeque()
-        if peca_origem.cor == 0 and self.rei_preto_check == 1:
-                valor += 50
-        elif peca_origem.cor == 1 and self.rei_branco_check == 1:
-                valor += 50
+            BuscaParalela: Busca paralela, com os processos mantidos entre as jogadas.
+        """
 
-        # Restaura estado original
-        self.rei_branco_check = estado_xeque_branco
-        self.rei_preto_check = estado_xeque_preto
+        if self.busca_paralela == None or self.busca_paralela.processos != processos:
+            self.encerrar_busca_paralela()
+            self.busca_paralela = BuscaParalela(processos, self.tamanho_tabela_mb, promocoes_menores = False)
+        return self.busca_paralela
+
+    def encerrar_busca_paralela(self):
+        """
+        Encerra os processos da busca paralela, caso existam.
+        """
 
-        return valor
+        if self.busca_paralela != None:
+            self.busca_paralela.encerrar()
+            self.busca_paralela = None
 
     def inicializar_tabuleiro_e_flags(self):
         """
         Inicializa a cópia do tabuleiro e de todos os atributos relevantes para o jogo.
 
         Usado para isolar simulações e preservar o estado real do jogo intacto.
+        É a única cópia feita em toda a simulação, a partir dela as jogadas são executadas e desfeitas.
 
         Attributes:
-            copia_grid (list[list]): Cópia do tabuleiro para simulações de jogadas.
-            posicao_rei_branco (str): Posição atual do rei branco.
-            posicao_rei_preto (str): Posição atual do rei preto.
-            posicao_teste_rei_branco (str): Posição de teste do rei branco.
-            posicao_teste_rei_preto (str): Posição de teste do rei preto.
+            tabuleiro (Board): Cópia do tabuleiro para simulações de jogadas.
             rei_branco_check (int): Indica se o rei branco está em xeque (1 = sim, 0 = não).
             rei_preto_check (int): Indica se o rei preto está em xeque (1 = sim, 0 = não).
             roque_branco (int): Flag que indica possibilidade de roque das brancas.
             roque_preto (int): Flag que indica possibilidade de roque das pretas.
-            en_passant (int): Flag que indica possibilidade de en passant.
-            promover_posicao (str): Posição de um peão apto à promoção.
+            promover_posicao (int): Casa de um peão apto à promoção.
             turno (int): Contador do turno atual.
             historico (list): Lista de jogadas executadas.
         """
 
-        self.copia_grid = copy.deepcopy(self.jogo.tabuleiro.grid)
-        self.posicao_rei_branco = copy.deepcopy(self.jogo.posicao_rei_branco)
-        self.posicao_rei_preto = copy.deepcopy(self.jogo.posicao_rei_preto)
-        self.posicao_teste_rei_branco = copy.deepcopy(self.jogo.posicao_teste_rei_branco)
-        self.posicao_teste_rei_preto = copy.deepcopy(self.jogo.posicao_teste_rei_preto)
-        self.rei_branco_check = copy.deepcopy(self.jogo.rei_branco_check)
-        self.rei_preto_check = copy.deepcopy(self.jogo.rei_preto_check)
-        self.roque_branco = copy.deepcopy(self.jogo.roque_branco)
-        self.roque_preto = copy.deepcopy(self.jogo.roque_preto)
-        self.en_passant = copy.deepcopy(self.jogo.en_passant)
-        self.promover_posicao = copy.deepcopy(self.jogo.promover_posicao)
-        self.turno = copy.deepcopy(self.jogo.turno)
-        self.historico = copy.deepcopy(self.jogo.historico)
+        self.tabuleiro = copy.deepcopy(self.jogo.tabuleiro)
+        self.rei_branco_check = self.jogo.rei_branco_check
+        self.rei_preto_check = self.jogo.rei_preto_check
+        self.roque_branco = self.jogo.roque_branco
+        self.roque_preto = self.jogo.roque_preto
+        self.promover_posicao = self.jogo.promover_posicao
+        self.turno = self.jogo.turno
+        self.historico = list(self.jogo.historico)
 
-    def copiar_tabuleiro_e_flags(self):
-        """
-        Cópia os atributos e o tabuleiro, direto para um dicionário através do deepcopy,
-        com o objetivo de persistir os dados ao longos das simulações.
+        # A casa alvo do en passant é obtida através da última jogada do histórico
+        self.tabuleiro.en_passant = self.calcular_casa_en_passant()
 
-        Returns:
-            dict: Dicionário, com todos os atributos salvos para a restauração futura.
-        """
-
-        return {
-            "tipo": "copia",
-            "tabuleiro": copy.deepcopy(self.copia_grid),
-            "posicao_rei_branco": copy.deepcopy(self.posicao_rei_branco),
-            "posicao_rei_preto": copy.deepcopy(self.posicao_rei_preto),
-            "posicao_teste_rei_branco": copy.deepcopy(self.posicao_teste_rei_branco),
-            "posicao_teste_rei_preto": copy.deepcopy(self.posicao_teste_rei_preto),
-            "rei_branco_check": copy.deepcopy(self.rei_branco_check),
-            "rei_preto_check": copy.deepcopy(self.rei_preto_check),
-            "roque_branco": copy.deepcopy(self.roque_branco),
-            "roque_preto": copy.deepcopy(self.roque_preto),
-            "en_passant": copy.deepcopy(self.en_passant),
-            "promover_posicao": copy.deepcopy(self.promover_posicao),
-            "turno": copy.deepcopy(self.turno),
-            "historico": copy.deepcopy(self.historico),
-        }
-    
-    def restaurar_tabuleiro_e_flags(self, dicionario):
+    def calcular_casa_en_passant(self):
         """
-        Restaura o estado do tabuleiro e as flags a partir de uma cópia previamente salva.
+        Calcula a casa alvo de um possível en passant, através da última jogada do histórico.
 
-        Args:
-            dicionario (dict): Dicionário onde todos os atributos estavam salvos, 
-            obtida através de "copiar_tabuleiro_e_flags.
+        Returns:
+            int | None: Casa por onde o peão passou no seu avanço de duas casas,
+            ou None caso a última jogada não tenha sido um avanço duplo de peão.
+            Sem jogadas, é a casa do en passant da posição carregada pelo jogo (ou None).
         """
 
-        if dicionario["tipo"] != "copia":
-            return
-        self.copia_grid = copy.deepcopy(dicionario["tabuleiro"])
-        self.posicao_rei_branco = copy.deepcopy(dicionario["posicao_rei_branco"])
-        self.posicao_rei_preto = copy.deepcopy(dicionario["posicao_rei_preto"])
-        self.posicao_teste_rei_branco = copy.deepcopy(dicionario["posicao_teste_rei_branco"])
-        self.posicao_teste_rei_preto = copy.deepcopy(dicionario["posicao_teste_rei_preto"])
-        self.rei_branco_check = copy.deepcopy(dicionario["rei_branco_check"])
-        self.rei_preto_check = copy.deepcopy(dicionario["rei_preto_check"])
-        self.roque_branco = copy.deepcopy(dicionario["roque_branco"])
-        self.roque_preto = copy.deepcopy(dicionario["roque_preto"])
-        self.en_passant = copy.deepcopy(dicionario["en_passant"])
-        self.promover_posicao = copy.deepcopy(dicionario["promover_posicao"])
-        self.turno = copy.deepcopy(dicionario["turno"])
-        self.historico = copy.deepcopy(dicionario["historico"])
+        # Caso seja a primeira jogada, só existe en passant na posição carregada pelo jogo (ver "Game.from_fen")
+        if not self.historico:
+            return self.jogo.en_passant_inicial
 
-    def criar_copia_tabuleiro_copiado(self):
-        """
-        Cria uma cópia da cópia do tabuleiro através do deepcopy.
+        # Se a última peça movida não foi um peão, o en passant é impossível
+        ultima_jogada = self.historico[-1]
+        if ultima_jogada[0] != "P":
+            return None
 
-        Necessário para fazer validações temporárias (Ex: Xeque).
-        """
+        # Caso o peão não tenha andado duas casas, também é impossível
+        origem = CASAS[ultima_jogada[2:4]]
+        destino = CASAS[ultima_jogada[4:6]]
+        if abs(origem - destino) != 16:
+            return None
 
-        self.copia_copia_grid = copy.deepcopy(self.copia_grid)
+        return (origem + destino) >> 1
 
     def aplicar_jogada_escolhida(self):
         """
@@ -330,19 +211,19 @@ class IA:
         # Caso não exista um, impede de gerar erro, retorna
         if not movimento:
             return
-        
+
         # É salvo o estado antigo e o tabuleiro, antes de realizar o movimento
-        estado_antigo = self.qlearning.gerar_estado(self, self.copia_grid, self.cor)
+        estado_antigo = self.qlearning.gerar_estado(self.tabuleiro, self.cor)
         tabuleiro_antigo = self.salvar_tabuleiro()
 
-        # Extrai a origem e o destino, e realiza o movimento
-        origem = movimento[:2]
-        destino = movimento[2:]
+        # Extrai a origem e o destino (o movimento está no formato "xyxy" da Q-table), e realiza o movimento
+        origem = CASAS[movimento[:2]]
+        destino = CASAS[movimento[2:]]
         self.mover_peca_ia(origem, destino)
 
         # É salvo o novo tabuleiro e o estado, após o movimento ser realizada
         tabuleiro_novo = self.salvar_tabuleiro()
-        novo_estado = self.qlearning.gerar_estado(self, self.copia_grid, self.cor)
+        novo_estado = self.qlearning.gerar_estado(self.tabuleiro, self.cor)
 
         # Todas as outras possíveis ações são salvas
         acoes_novas = [mov["movimento"] for mov in self.lista_jogadas_possiveis]
@@ -350,9 +231,8 @@ class IA:
         # A recompensa é calculada
         recompensa = self.qlearning.calcular_recompensa(self, tabuleiro_antigo, tabuleiro_novo)
 
-        # O QLearning é atualizado com a nova jogada e depois é salvo
+        # O QLearning é atualizado com a nova jogada, e a Q-table é salva quando houver atualizações suficientes
         self.qlearning.atualizar(estado_antigo, movimento, recompensa, novo_estado, acoes_novas)
-        self.qlearning.salvar_q_table()
 
     def printar_tabuleiro(self):
         """
@@ -363,21 +243,8 @@ class IA:
             - A cor: "b" para branco, "p" para preto.
             - "--" para casas vazias.
         """
-         
-        cont = 0
-        print("%  0   1   2   3   4   5   6   7")
-        for x in range(8):
-            linha = str(cont) + " "
-            for y in range(8):
-                if self.copia_grid[x][y] != None:
-                    peca = self.copia_grid[x][y]
-                    letra = type(peca).__name__[0]
-                    cor = 'b' if peca.cor == 0 else 'p'
-                    linha += " " + letra + cor + " "
-                else:
-                    linha += " -- "
-            print(linha)
-            cont += 1
+
+        self.tabuleiro.printar_tabuleiro()
 
     def salvar_tabuleiro(self):
         """
@@ -399,11 +266,11 @@ class IA:
         # Percorre todo o tabuleiro copiado em busca das peças
         for x in range(8):
             for y in range(8):
-                peca = self.copia_grid[x][y]
+                peca = self.tabuleiro.grid[x][y]
 
                 # Pega apenas as peças
                 if peca != None:
-                    
+
                     # Pega-se a primeira letra do nome e a sua cor
                     letra = type(peca).__name__[0].upper()
                     cor = peca.cor
@@ -412,11 +279,11 @@ class IA:
                     lista.append({"letra": letra, "cor": cor, "x": x, "y": y})
 
         return lista
-    
+
     def avaliar_movimento(self):
         """
-        Avalia os movimentos que foram simulados, e escolhe um 
-        baseada na política de Q-Learning.
+        Avalia os movimentos que foram simulados, e escolhe um
+        baseada na política de Q-Learning, entre os movimentos de melhor valor na busca.
 
         Returns:
             str | None: Movimento escolhido no formato "origemdestino" (Ex: "2030"),
@@ -424,167 +291,89 @@ class IA:
         """
 
         # Salva o estado atual do tabuleiro
-        estado = self.qlearning.gerar_estado(self, self.copia_grid, self.cor)
-
-        # Pega-se todos os movimentos presentes na "lista_jogadas_possiveis"
-        acoes_possiveis = [mov["movimento"] for mov in self.lista_jogadas_possiveis]
+        estado = self.qlearning.gerar_estado(self.tabuleiro, self.cor)
 
-        # Caso não exista nenhum, retorna para impedir erro
-        if not acoes_possiveis:
+        # Caso não exista nenhum movimento, retorna para impedir erro
+        if not self.lista_jogadas_possiveis:
             return None
-        
+
+        # Pega-se os movimentos de melhor valor na busca (a lista já está ordenada, do melhor para o pior)
+        melhor_valor = self.lista_jogadas_possiveis[0]["valor"]
+        acoes_possiveis = [mov["movimento"] for mov in self.lista_jogadas_possiveis if mov["valor"] == melhor_valor]
+
         # Retorna o movimento escolhido
         return self.qlearning.escolher_acao(estado, acoes_possiveis)
-    
-    def get_peca(self, posicao):
+
+    def get_peca(self, casa):
         """
-        Retorna a peça que está armazenada em uma determinada posição na cópia do tabuleiro.
+        Retorna a peça que está armazenada em uma determinada casa na cópia do tabuleiro.
 
         Args:
-            posicao (str): Posição no formato "xy".
+            casa (int): Índice da casa (0 a 63).
 
         Returns:
             Object | None: Instância da peça, ou None se a casa estiver vazia.
         """
 
-        x, y = int(posicao[0]), int(posicao[1])
-        return self.copia_grid[x][y]
-    
-    def posiciona_peca(self, peca, posicao):
-        """
-        Posiciona uma determinada peça em uma posição específica na cópia do tabuleiro (Ex: "04").
+        return self.tabuleiro.get_peca(casa)
 
-        Args:
-            peca (object | None): Instância da peça a ser posicionada, ou None se for remover.
-            posicao (str): Posição concatenada de dois números, onde o primeiro representa o x e o segundo o y.
-        """
-        x, y = int(posicao[0]), int(posicao[1])
-        self.copia_grid[x][y] = peca
-
-    def posiciona_peca_copiado(self, peca, posicao):
+    def posiciona_peca(self, peca, casa):
         """
-        Posiciona uma determinada peça em uma posição específica na cópia da cópia do tabuleiro (Ex: "04")
-        Usado em vericações de Xeque.
+        Posiciona uma determinada peça em uma casa específica na cópia do tabuleiro (Ex: 4, a casa "04").
 
         Args:
             peca (object | None): Instância da peça a ser posicionada, ou None se for remover.
-            posicao (str): Posição concatenada de dois números, onde o primeiro representa o x e o segundo o y.
+            casa (int): Índice da casa (0 a 63).
         """
-        x, y = int(posicao[0]), int(posicao[1])
-        self.copia_copia_grid[x][y] = peca
 
-    def calcular_movimento(self, posicao, cor):
+        self.tabuleiro.posiciona_peca(peca, casa)
+
+    def calcular_movimento(self, casa, cor):
         """
         Calcula todos os movimentos válidos para a peça em uma posição.
 
-        O cálculo considera movimentos padrões, e jogadas especiais. 
-        Além de bloquear movimentos ilegais.
+        O cálculo considera movimentos padrões, e jogadas especiais.
+        Além de bloquear movimentos ilegais, através das peças cravadas e dos atacantes do rei.
 
         Args:
-            posicao (str): Posição no formato "xy".
+            casa (int): Índice da casa da peça (0 a 63).
             cor_jogador (int): Cor do jogador a ter seu movimento calculado,
             representada por um inteiro. (0 para branco, 1 para preto).
 
         Returns:
-            list[str]: Lista de posições válidas para a peça, lista vazia caso a peça não possua movimentos.
+            list[int]: Lista de casas válidas para a peça, lista vazia caso a peça não possua movimentos.
         """
 
-        # É armazenado para testar as posições atuais dos reis
-        self.posicao_teste_rei_preto = self.posicao_rei_preto
-        self.posicao_teste_rei_branco = self.posicao_rei_branco
-
-        movimentos = []
-
         # Pega a peça
-        peca = self.get_peca(posicao)
+        peca = self.get_peca(casa)
         if peca == None:
-            return "99"
-
-        # Calcula a lista de seus movimentos
-        peca.movimento(self.copia_grid)
+            return []
 
-        # Caso seja um rei, é verificado a possibilidade de fazer um roque
-        if type(peca).__name__[0].lower() == "k":
-            self.verificar_roque(cor)
-
-        self.verificar_en_passant(posicao)
-
-        moveset = list(peca.lista_posicoes_validas)
-
-        # É analisada individualmente cada possível movimento
-        for m in moveset:
-            self.criar_copia_tabuleiro_copiado()
-            origem = posicao
-            destino = m
-
-            # Caso seja um rei é necessário atualizar a posição de teste
-            if type(peca).__name__.lower() == "king":
-                if peca.cor == 0:
-                    self.posicao_teste_rei_branco = destino
-                else:
-                    self.posicao_teste_rei_preto = destino
-
-            # É colocada a peça nessa nova posição no tabuleiro simulado
-            self.posiciona_peca_copiado(peca, destino)
-            self.posiciona_peca_copiado(None, origem)
-
-            # Verifica-se o xeque
-            self.verificar_xeque()
-
-            # Caso não seja um movimento ilegal é armazenada como válido
-            if self.rei_branco_check == 0 and cor == 0:
-                movimentos.append(m)
-            if self.rei_preto_check == 0 and cor == 1:
-                movimentos.append(m)
+        # Os movimentos legais são gerados pelo tabuleiro, considerando peças cravadas, xeques e jogadas especiais
+        movimentos = self.tabuleiro.destinos_legais(casa, cor)
+        peca.lista_casas_validas = list(movimentos)
 
         return movimentos
-    
+
     def verificar_xeque(self):
         """
         Verifica se algum dos reis sofreu um xeque após o último movimento executado.
 
-        Percorre todas as peças no tabuleiro copiado, calcula seus movimentos e identifica se alguma
-        delas ameaça a posição atual dos reis. Caso sim, é considerado o Xeque.
+        Através dos bitboards do tabuleiro, verifica-se se a casa de cada rei é atacada
+        pela cor adversária ("is_square_attacked"). Caso sim, é considerado o Xeque.
 
         Atualiza:
             rei_branco_check (int): 1 se o rei branco está em xeque, 0 caso contrário.
             rei_preto_check (int): 1 se o rei preto está em xeque, 0 caso contrário.
         """
 
-        # Reseta os atributos
-        self.rei_branco_check = 0
-        self.rei_preto_check = 0
-
-        # Laço para vasculhar todo o tabuleiro
-        for i in range(8):
-            for j in range(8):
-                peca = self.copia_copia_grid[i][j]
-                if peca != None:
-                    
-                    # Se algum dos possíveis movimento dessa peça ameaçar o rei, é considerado xeque
-                    peca.movimento(self.copia_copia_grid)
-                    moveset = list(peca.lista_posicoes_validas)
-
-                    # Caso seja uma peça branca
-                    if peca.cor == 0:
-                        for m in moveset:
-                            if m == self.posicao_teste_rei_preto:
-
-                                # Atualiza o atributo
-                                self.rei_preto_check = 1
-
-                    # Caso seja uma peça preta
-                    if peca.cor == 1:
-                        for m in moveset:
-                            if m == self.posicao_teste_rei_branco:
-
-                                # Atualiza o atributo
-                                self.rei_branco_check = 1
+        self.rei_branco_check = int(self.tabuleiro.rei_em_xeque(0))
+        self.rei_preto_check = int(self.tabuleiro.rei_em_xeque(1))
 
     def mover_peca_ia(self, origem, destino):
         """
-        Move uma peça no tabuleiro real e atualiza o estado do jogo.
-        Considera as regras especias do Xadrez.
+        Move uma peça no tabuleiro da simulação e atualiza o estado do jogo.
+        Considera as regras especias do Xadrez, promovendo automaticamente o peão para uma rainha.
 
         Atualiza:
             - Tabuleiro simulado (cópia).
@@ -592,13 +381,16 @@ class IA:
             - Histórico de movimentos.
 
         Args:
-            origem (str): posição de origem dessa peça. (Ex: "04").
-            destino (str): posição final dessa peça. (Ex: "05").
+            origem (int): casa de origem dessa peça. (Ex: 4, a casa "04").
+            destino (int): casa final dessa peça. (Ex: 5, a casa "05").
 
         Returns:
-            bool: True se a jogada foi executada com sucesso, False caso contrário.
+            tuple: Registro da jogada, usado por "desfazer_jogada_ia" para restaurar o estado anterior.
         """
 
+        # Guarda os atributos que serão alterados pela jogada
+        estado_anterior = (self.rei_branco_check, self.rei_preto_check, self.turno, len(self.historico))
+
         # Verifica se seria uma possível captura
         peca_destino_antes = self.get_peca(destino)
         houve_captura = peca_destino_antes is not None
@@ -609,319 +401,39 @@ class IA:
         letra = type(peca).__name__[0].upper()
         cor = "b" if peca.cor == 0 else "p"
 
-        # Caso seja uma torre ou o rei, é necessário contabilizar o atributo "mexeu"
-        if type(peca).__name__.lower() in ["king", "rook"]:
-            peca.mexeu += 1
-
-            # Se for um roque curto das pretas
-            if origem == "74" and destino == "76" and self.roque_branco:
-
-                # Move a peça no tabuleiro original
-                self.mover_peca(origem, destino, roque_branco = True)
-
-                # Atualiza o atributo
-                self.roque_branco == 2
-
-                # Cria uma cópia e verifica se foi uma jogada que resulta em xeque
-                self.criar_copia_tabuleiro_copiado()
-                self.verificar_xeque()
+        # O movimento é executado diretamente no tabuleiro
+        registro = self.tabuleiro.make_move(self.tabuleiro.codificar_movimento(origem, destino))
+        flag = flag_movimento(registro[0])
 
-                # Salva o histórico com os atributos necessários
-                self.salvar_historico(letra, cor, origem, destino, roque_branco = True, captura = houve_captura, letra_capturada = peca_capturada_letra)
-                return True
-            
-            # Se for um roque longo das pretas
-            if origem == "74" and destino == "72" and self.roque_branco:
-                self.mover_peca(origem, destino, roque_branco = True)
-                self.roque_branco == 2
-                self.criar_copia_tabuleiro_copiado()
-                self.verificar_xeque()
-                self.salvar_historico(letra, cor, origem, destino, roque_branco = True, captura = houve_captura, letra_capturada = peca_capturada_letra)
-                return True
-            
-            # Se for um roque curto das brancas
-            if origem == "04" and destino == "06" and self.roque_preto:
-                self.mover_peca(origem, destino, roque_preto = True)
-                self.roque_preto == 2
-                self.criar_copia_tabuleiro_copiado()
-                self.verificar_xeque()
-                self.salvar_historico(letra, cor, origem, destino, roque_preto = True, captura = houve_captura, letra_capturada = peca_capturada_letra)
-                return True
-            
-            # Se for um roque longo das brancas
-            if origem == "04" and destino == "02" and self.roque_preto:
-                self.mover_peca(origem, destino, roque_preto = True)
-                self.roque_preto == 2
-                self.criar_copia_tabuleiro_copiado()
-                self.verificar_xeque()
-                self.salvar_historico(letra, cor, origem, destino, roque_preto = True, captura = houve_captura, letra_capturada = peca_capturada_letra)
-                return True
-
-        # Se for um en passant
-        if self.en_passant:
-            self.mover_peca(origem, destino, en_passant = True)
-            self.criar_copia_tabuleiro_copiado()
-            self.verificar_xeque()
-            self.salvar_historico(letra, cor, origem, destino, en_passant = True, captura = houve_captura, letra_capturada = peca_capturada_letra)
-            return True
-
-        # Caso seja uma jogada comum (captura / movimento)
-        self.mover_peca(origem, destino)
-        self.criar_copia_tabuleiro_copiado()
+        # Verifica se foi uma jogada que resulta em xeque
         self.verificar_xeque()
-        self.salvar_historico(letra, cor, origem, destino, captura = houve_captura, letra_capturada = peca_capturada_letra)
-        return True
-    
-    def mover_peca(self, origem, destino, roque_preto = False, roque_branco = False, en_passant = False):
-        """
-        Move uma peça de "origem" até "destino", aplicando regras especiais (roque, en passant).
-
-        Args:
-            origem (str): posição de origem dessa peça. (Ex: "04").
-            destino (str): posição final dessa peça. (Ex: "05").
-            roque_preto (bool | optional): Se True, indica roque das pretas.
-            roque_branco (bool | optional): Se True, indica roque das brancas.
-            en_passant (bool | optional): Se True, indica movimento en passant.
-        """
-
-        peca = self.get_peca(origem)
-
-        # Se for roque branco, verifica a posição de destino
-        if roque_branco == True:
-            self.posiciona_peca(peca, destino)
-            self.posiciona_peca(None, origem)
-            peca.posicao = destino
-
-            # Verifica se a peça movida será um rei e atualiza a posição da rei
-            if type(peca).__name__[0].lower() == "k":
-                self.posicao_rei_branco = destino
-
-                # Será um roque curto
-                if destino == "76":
-                    torre = self.get_peca("77")
-                    self.posiciona_peca(torre, "75")
-                    self.posiciona_peca(None, "77")
-                    torre.posicao = "75"
-                    torre.mexeu += 1
-                    return 
-                
-                # Será um roque longo
-                if destino == "72":
-                    torre = self.get_peca("70")
-                    self.posiciona_peca(torre, "73")
-                    self.posiciona_peca(None, "70")
-                    torre.posicao = "73"
-                    torre.mexeu += 1
-                    return 
-                
-        # Se for roque preto, verifica a posição de destino        
-        if roque_preto == True:
-            self.posiciona_peca(peca, destino)
-            self.posiciona_peca(None, origem)
-            peca.posicao = destino
-
-            # Verifica se a peça movida será um rei e atualiza a posição da rei
-            if type(peca).__name__[0].lower() == "k":
-                self.posicao_rei_preto = destino
-
-                # Será um roque curto
-                if destino == "06":
-                    torre = self.get_peca("07")
-                    self.posiciona_peca(torre, "05")
-                    self.posiciona_peca(None, "07")
-                    torre.posicao = "05"
-                    torre.mexeu += 1
-                    return 
-                
-                # Será um roque longo
-                if destino == "02":
-                    torre = self.get_peca("00")
-                    self.posiciona_peca(torre, "03")
-                    self.posiciona_peca(None, "00")
-                    torre.posicao = "03"
-                    torre.mexeu += 1
-                    return 
-                
-        # Se for um en passant, calcula a posição do peão comido, e subtitui por None
-        if en_passant == True:
-            direcao = 1 if peca.cor == 0 else -1
-            linha = int(destino[0])
-            coluna = int(destino[1])
-            posicao_antigo_peao = str(linha + direcao) + str(coluna)
-            self.posiciona_peca(None, posicao_antigo_peao)
-            self.posiciona_peca(peca, destino)
-            self.posiciona_peca(None, origem)
-            peca.posicao = destino
-            return 
-        
-        # Coloca a peça na posição de destino, e o none na posição antiga da peça
-        self.posiciona_peca(peca, destino)
-        self.posiciona_peca(None, origem)
-        peca.posicao = destino
-
-        # Atualiza a posição do rei no atributo
-        if isinstance(peca, King):
-            if peca.cor == 0:
-                self.posicao_rei_branco = destino
-            else:
-                self.posicao_rei_preto = destino
-
-    def verificar_roque(self, cor):
-        """
-        Verifica se o roque (curto ou longo) é possível de ser executado.
-
-        A verificação considera:
-            - O rei está em sua posição inicial.
-            - O rei e a torre correspondente nunca se moveram.
-            - As casas entre rei e torre estão livres.
-
-        Caso válido, adiciona a posição final do rei (curto ou longo) à sua 
-        lista de movimentos possíveis e atualiza a flag de roque.  
-    
-        Args:
-            cor_jogador (int): Cor do jogador a ser analisado (0 para branco, 1 para preto).
-        """
-
-        # Qual jogador deve ser verificado
-        if cor == 0:
-
-            # Se o jogador já rocou, retorna
-            if self.roque_branco == 2:
-                return
-            
-            # Pega a posição que o rei ocupa no começo do jogo, caso ele não esteja, é sinal que ele já seu moveu e não deve rocar
-            rei_branco = self.copia_grid[7][4]
-
-            # Verifica se ele está realmente nessa posição
-            if rei_branco != None and type(rei_branco).__name__ == "King":
-
-                # Verifica se ele já moveu. Ele pode andar pra frente e retornar pro mesmo lugar depois, nesse caso o roque não pode acontecer
-                if rei_branco.mexeu == 0:
-
-                    # Verifica se as posições do cavalo e do bispo estão vazias. Necessário para o roque
-                    if self.copia_grid[7][5] == None and self.copia_grid[7][6] == None:
-
-                        # Pega a torre, e faz a mesma verificação do rei
-                        torre_branca_direita = self.copia_grid[7][7]
-                        if torre_branca_direita != None and type(torre_branca_direita).__name__ == "Rook":
-                            if torre_branca_direita.mexeu == 0:
-
-                                # Caso tudo esteja correto, é armazenada a posição do roque e a flag é atualizada
-                                rei_branco.lista_posicoes_validas.append("76")
-                                self.roque_branco = 1
-
-                    # É feita mesma verificação agora com a torre da esquerda 
-                    if self.copia_grid[7][3] == None and self.copia_grid[7][2] == None and self.copia_grid[7][1] == None:
-                        torre_branca_esquerda = self.copia_grid[7][0]
-
-                        if torre_branca_esquerda != None and type(torre_branca_esquerda).__name__ == "Rook":
-
-                            if torre_branca_esquerda.mexeu == 0:
-                                rei_branco.lista_posicoes_validas.append("72")
-                                self.roque_branco = 1
-
-        # É feita a mesma verificação das brancas, agora com as pretas
-        if cor == 1:
-            if self.roque_preto == 2:
-                return
-            
 
-            rei_preto = self.copia_grid[0][4]
-            if rei_preto != None and type(rei_preto).__name__ == "King":
-                if rei_preto.mexeu == 0:
-
-                    if self.copia_grid[0][5] == None and self.copia_grid[0][6] == None:
-                        torre_preta_direita = self.copia_grid[0][7]
-
-                        if torre_preta_direita != None and type(torre_preta_direita).__name__ == "Rook":
-
-                            if torre_preta_direita.mexeu == 0:
-                                rei_preto.lista_posicoes_validas.append("06")
-                                self.roque_preto = 1
-
-                    if self.copia_grid[0][3] == None and self.copia_grid[0][2] == None and self.copia_grid[0][1] == None:
-                        torre_preta_esquerda = self.copia_grid[0][0]
+        # Salva o histórico com os atributos necessários
+        if flag == ROQUE_CURTO or flag == ROQUE_LONGO:
+            self.salvar_historico(letra, cor, origem, destino, roque_branco = peca.cor == 0, roque_preto = peca.cor == 1, captura = houve_captura, letra_capturada = peca_capturada_letra)
+        elif flag == EN_PASSANT:
+            self.salvar_historico(letra, cor, origem, destino, en_passant = True, captura = houve_captura, letra_capturada = peca_capturada_letra)
+        else:
+            self.salvar_historico(letra, cor, origem, destino, captura = houve_captura, letra_capturada = peca_capturada_letra)
 
-                        if torre_preta_esquerda != None and type(torre_preta_esquerda).__name__ == "Rook":
+        # Salva a promoção no histórico, ela acontece separadamente das outras jogadas
+        if flag & PROMOCAO:
+            self.salvar_historico("P", cor, destino, destino, promocao = True, peca_promovida = "Q")
 
-                            if torre_preta_esquerda.mexeu == 0:
-                                rei_preto.lista_posicoes_validas.append("02")
-                                self.roque_preto = 1
+        return (registro, estado_anterior)
 
-    def verificar_en_passant(self, posicao):
+    def desfazer_jogada_ia(self, registro_ia):
         """
-        Verifica se é possível executar en passant para o peão na posição informada.
-
-        A verificação considera:
-            - A última jogada realizada (deve ser um peão adversário).
-            - Se esse peão moveu exatamente duas casas.
-            - Se existe um peão do jogador atual adjacente à coluna final do peão adversário.
-
-        Caso, seja válido, adiciona à lista de movimentos do peão, o movimento
-        de en passant e ativa a flag correspondente.
+        Desfaz uma jogada executada por "mover_peca_ia", restaurando o tabuleiro, as flags e o histórico.
 
         Args:
-            posicao (str): Posição no formato "xy".
+            registro_ia (tuple): Registro devolvido por "mover_peca_ia".
         """
 
-        # Atualiza a flag para zero
-        self.en_passant = 0
-
-        # Tenta-se pegar o último movimento, caso não seja possível, por ser a primeira jogada, retorna
-        try:
-            ultima_jogada = self.historico[self.turno - 1]
-        except IndexError:
-            return
-        
-        # Se a última peça movida, não foi um peão, o en passant é impossível, retorna
-        if ultima_jogada[0] != "P":
-            return
-        
-        # É analisada a cor do peão e a cor do jogador com base na cor do peão
-        cor_peao = 0 if ultima_jogada[1] == "b" else 1
-        cor = 1 - cor_peao    
-
-        # Pega-se qual movimento o peão realizou por último
-        origem = ultima_jogada[2:4]
-        destino = ultima_jogada[4:6]
-
-        # É se atribuído devidamente as linhas e a coluna
-        linha_origem = int(origem[0])
-        linha_destino = int(destino[0])
-        coluna_destino = int(destino[1])
+        registro, (self.rei_branco_check, self.rei_preto_check, self.turno, tamanho_historico) = registro_ia
+        self.tabuleiro.unmake_move(registro)
+        del self.historico[tamanho_historico:]
 
-        # Caso o peão não andou duas casas (necessário para o en passant), retorna
-        if abs(linha_origem - linha_destino) != 2:
-            return
-        
-        # Se pega a direção do movimento do peão adversário
-        direcao = -1 if cor == 0 else 1
-
-        # Testa os peões adjacentes (esquerda e direita)
-        for diferencial in [-1, 1]:
-            coluna_lateral = coluna_destino + diferencial
-
-            # Verifica se é uma coluna dentro do tabuleiro
-            if 0 <= coluna_lateral <= 7:
-
-                # Pega a posição dessa lateral
-                posicao_lateral = str(linha_destino) + str(coluna_lateral)
-
-                # Sendo uma possição diferente continua
-                if posicao != posicao_lateral:
-                    continue
-
-                # É pego o peão lateral
-                peao_lateral = self.get_peca(posicao_lateral)
-
-                # Verifica se realmente é um peão, e se ele pertence ao jogador adversário (aquele que irá fazer o en passant)
-                if (peao_lateral != None and isinstance(peao_lateral, Pawn) and peao_lateral.cor == cor):
-
-                    # Caso sim, é armazenada nas posições válidas do peão e a flag atualiza permitindo o en passant
-                    posicao_en_passant = str(linha_destino + direcao) + str(coluna_destino)
-                    peao_lateral.lista_posicoes_validas.append(posicao_en_passant)
-                    self.en_passant = 1
-    
     def salvar_historico(self, letra, cor, origem, destino, roque_branco = False, roque_preto = False, en_passant = False, promocao = False, peca_promovida = "", captura = False, letra_capturada = ""):
         """
         Salva a última jogada no histórico, utilizando notação simples.
@@ -939,8 +451,8 @@ class IA:
         Args:
             letra (str): A primeira letra do nome da peça.
             cor (str) A primeira letra da cor, "b" para branco, "p" para preto.
-            origem (str): Posição em formato "xy", da posição atual da peça.
-            destino (str): Posição em formato "xy", da posição futura da peça.
+            origem (int): Casa atual da peça (0 a 63), gravada no formato "xy".
+            destino (int): Casa futura da peça (0 a 63), gravada no formato "xy".
             roque_branco (bool): Flag que determina se a jogada foi um roque ou não.
             roque_preto (bool): Flag que determina se a jogada foi um roque ou não.
             en_passant (bool): Flag que determina se a jogada foi um en passant ou não.
@@ -959,7 +471,7 @@ class IA:
 
         # Caso seja um roque, é adicionada um "R" para roque grande, e "r" para roque curto
         if roque_branco or roque_preto:
-            especial += "R" if destino.endswith("2") else "r"
+            especial += "R" if destino & 7 == 2 else "r"
 
         # Se for um en passant, é adicionada um "e"
         if en_passant:
@@ -970,14 +482,14 @@ class IA:
             especial += "p" + peca_promovida
 
             # Salva a composição da jogada com o "movimento"
-            movimento = f"{letra}{cor}{origem}{destino}{especial}"
+            movimento = f"{letra}{cor}{NOMES_CASAS[origem]}{NOMES_CASAS[destino]}{especial}"
 
             # Caso seja um movimento duplicado, impede o armazenamento, pois configura um erro
             if self.historico and self.historico[-1] == movimento:
                 return
             
             # Como a promoção acontece separadamente das outras jogadas, ela é armazenada no história e já é retornada
-            self.historico.append(f"{letra}{cor}{origem}{destino}{especial}")
+            self.historico.append(movimento)
 
             # Contabiliza-se mais um para o turno
             self.turno += 1
@@ -988,7 +500,7 @@ class IA:
             especial += "c" + letra_capturada
 
         # É salva a composição da jogada com o "movimento"
-        movimento = f"{letra}{cor}{origem}{destino}{especial}"
+        movimento = f"{letra}{cor}{NOMES_CASAS[origem]}{NOMES_CASAS[destino]}{especial}"
 
         # Impede salvar duplicamente
         if self.historico and self.historico[-1] == movimento:
@@ -998,57 +510,6 @@ class IA:
         self.historico.append(movimento)
         self.turno += 1
 
-    def verificar_promocao_peao(self):
-        """
-        Verifica se o peão chegou na posição necessária para poder ser promovido.
-
-        A promoção ocorre quando:
-            - Um peão branco alcança a linha 0.
-            - Um peão preto alcança a linha 7.
-
-        Caso seja possível, define a posição do peão em "self.promover_posicao".
-
-        Returns:
-            bool: Se True é possível realizar a promoção, caso False, não.
-        """
-
-        # Percorre as duas pontas do mapa
-        for i in range(8):
-
-            # Pega-se a peça que ocupa essa posição
-            peca = self.copia_grid[0][i]
-
-            # Se for um peão e pertencer a cor contrária é atualizada a posição de promoção
-            if type(peca).__name__ == "Pawn" and peca.cor == 0:
-                self.promover_posicao = str(0) + str(i)
-                return True
-            
-            # Faz-se a mesma verificação agora para o outro jogador
-            peca = self.copia_grid[7][i]
-            if type(peca).__name__ == "Pawn" and peca.cor == 1:
-                self.promover_posicao = str(7) + str(i)
-                return True
-            
-        return False
-    
-    def promover_peao(self):
-        """
-        Promove o peão na posição indicada por `self.promover_posicao` para uma rainha automaticamente.
-        """
-
-        # Pega-se a posição do peão através do "promover_posicao"
-        peao = self.get_peca(self.promover_posicao)
-
-        # Caso não haja um peão, ou for None, retorna
-        if peao == None or type(peao).__name__ != "Pawn":
-            return
-        
-        # É posicionada uma rainha no lugar atual desse peão
-        self.posiciona_peca(Queen(self.cor, self.promover_posicao), self.promover_posicao)
-
-        # Salva o histórico com a promoção
-        self.salvar_historico("P", "b" if self.cor == 0 else "p", self.promover_posicao, self.promover_posicao, promocao = True, peca_promovida = "Q")
-
     def esta_em_mate_ou_afogamento(self, cor):
         """
         Verifica se o jogador da cor especificada está em xeque-mate ou afogamento (impasse).
@@ -1061,23 +522,8 @@ class IA:
             ou None caso não seja nenhuma dessas possibilidades.
         """
 
-        # Lista para conter todos movimentos possíveis
-        movimentos_possiveis = []
-
-        # Vasculha todo o tabuleiro em busca das peças
-        for i in range(8):
-            for j in range(8):
-                peca = self.copia_grid[i][j]
-
-                # Se for uma peça do jogador analisado
-                if peca and peca.cor == cor:
-
-                    # Através da origem e da cor, é calculado os movimentos da peça
-                    origem = f"{i}{j}"
-                    destinos = self.calcular_movimento(origem, cor)
-
-                    # Os movimentos calculados são adicionados na lista de movimentos possíveis
-                    movimentos_possiveis.extend(destinos)
+        # Todos os movimentos legais do jogador, gerados de uma só vez
+        movimentos_possiveis = self.tabuleiro.gerar_movimentos_legais(cor)
 
         # Caso a lista esteja vazia            
         if not movimentos_possiveis:
@@ -1098,6 +544,45 @@ class IA:
 import random
 import os
 import pickle
+import time
+import atexit
+import weakref
+from diario_q_table import DiarioQTable
+from q_table_disco import abrir_q_table_disco
+from estado_qlearning import codificar_estado, migrar_q_table
+
+# Arquivo padrão da Q-table (o diário de alterações fica ao lado, com a extensão ".log")
+CAMINHO_Q_TABLE = "save/q_table.pkl"
+
+# Q-table em disco (ver "q_table_disco.py"): consultada direto do arquivo, sem carregar tudo na memória.
+# Ao ser criada, importa a Q-table do arquivo ".pkl" (e o seu diário), caso exista
+Q_TABLE_EM_DISCO = False
+CAMINHO_Q_TABLE_DISCO = "save/q_table.bin"
+
+# Salvamento das alterações no diário: a cada quantas atualizações, ou a cada quantos segundos, o que ocorrer primeiro.
+# Nas partidas contra o jogador as atualizações são poucas, e no treinamento são muitas e seguidas
+SALVAR_A_CADA_INTERATIVO = 10
+INTERVALO_SALVAMENTO_INTERATIVO = 30.0
+SALVAR_A_CADA_TREINAMENTO = 2000
+INTERVALO_SALVAMENTO_TREINAMENTO = 60.0
+
+# Quantidade mínima de alterações no diário antes da compactação (a Q-table completa é salva e o diário esvaziado).
+# A compactação só ocorre quando o diário também tem pelo menos tantas alterações quanto estados na Q-table
+COMPACTACAO_MINIMA = 50000
+
+# Instâncias do QLearning ainda em uso, com as alterações pendentes salvas ao encerrar o programa.
+# As referências são fracas, assim as instâncias descartadas (e o jogo e a IA ligados a elas) podem ser liberadas
+INSTANCIAS_QLEARNING = weakref.WeakSet()
+
+def salvar_pendentes_instancias():
+    """
+    Grava as alterações pendentes de todas as instâncias do QLearning ainda em uso (registrado no "atexit").
+    """
+
+    for instancia in list(INSTANCIAS_QLEARNING):
+        instancia.salvar_pendentes()
+
+atexit.register(salvar_pendentes_instancias)
 
 class QLearning:
     """
@@ -1110,15 +595,32 @@ class QLearning:
     vantajosa de cada situação.
     """
 
-    def __init__(self, jogo, alpha = 0.1, gamma = 0.9, epsilon = 0.5):
+    def __init__(self, jogo, alpha = 0.1, gamma = 0.9, epsilon = 0.5, salvar_a_cada = SALVAR_A_CADA_INTERATIVO,
+                 intervalo_salvamento = INTERVALO_SALVAMENTO_INTERATIVO, caminho = None, em_disco = Q_TABLE_EM_DISCO):
         """
         Inicializa o QLearning com seus principais atributos.
 
+        A Q-table não é salva a cada atualização: as atualizações se acumulam e apenas os valores alterados
+        são acrescentados ao diário (ver "diario_q_table.py"), a cada "salvar_a_cada" atualizações ou
+        "intervalo_salvamento" segundos, e ao encerrar o programa. A Q-table completa só é salva quando o
+        diário fica grande (a compactação).
+
+        Com a Q-table em disco, os valores já são escritos direto no arquivo, e salvar apenas garante que
+        as páginas alteradas sejam gravadas no disco.
+
         Args:
             jogo (Game): Instância da classe Game, representando o estado atual do tabuleiro.
             alpha (int | optional): Taxa de aprendizado. Padrão: 0.1.
             gamma (int | optional): Fator de desconto para recompensas futuras. Padrão: 0.9.
             epsilon (int | optional): Taxa de exploração, a probabilidade de escolher uma jogada aleatória. Padrão: 0.5.
+            salvar_a_cada (int | optional): Quantidade de atualizações pendentes que faz a Q-table ser salva,
+                ou None para não salvar pela quantidade. Padrão: SALVAR_A_CADA_INTERATIVO.
+            intervalo_salvamento (float | optional): Tempo máximo, em segundos, entre uma atualização e o seu salvamento,
+                ou None para não salvar pelo tempo. Padrão: INTERVALO_SALVAMENTO_INTERATIVO.
+            caminho (str | optional): Localização do arquivo da Q-table. Padrão: "save/q_table.pkl",
+                ou "save/q_table.bin" com a Q-table em disco.
+            em_disco (bool | optional): Se a Q-table é guardada em disco (QTableDisco), ao invés de em um dicionário.
+                Padrão: Q_TABLE_EM_DISCO.
         """
 
         # Inicialização dos atributos
@@ -1128,8 +630,26 @@ class QLearning:
         self.gamma = gamma
         self.epsilon = epsilon
 
-        # Carregamento da q-table
+        # Quando for uma lista, cada atualização também é registrada nela, para ser enviada ao processo
+        # que é dono da Q-table (ver "treinar_ia.py"). Nesse caso, a Q-table nunca é salva por este processo
+        self.transicoes = None
+
+        # Na Q-table em disco, os valores alterados por um processo que não é o dono da Q-table ficam apenas na memória
+        self.em_disco = em_disco
+        self.valores_locais = {}
+
+        # Controle do salvamento, com os pares (estado, ação) alterados desde a última gravação no diário
+        self.caminho = caminho if caminho != None else (CAMINHO_Q_TABLE_DISCO if em_disco else CAMINHO_Q_TABLE)
+        self.diario = DiarioQTable(os.path.splitext(self.caminho)[0] + ".log")
+        self.salvar_a_cada = salvar_a_cada
+        self.intervalo_salvamento = intervalo_salvamento
+        self.atualizacoes_pendentes = 0
+        self.ultimo_salvamento = time.monotonic()
+        self.alteracoes = set()
+
+        # Carregamento da q-table, e o salvamento das atualizações pendentes ao encerrar o programa
         self.q_table = self.carregar_q_table()
+        INSTANCIAS_QLEARNING.add(self)
 
     def contar_pecas(self, tabuleiro, cor):
         """
@@ -1150,7 +670,7 @@ class QLearning:
         Escolhe uma ação usando a política epsilon-greedy baseada no Q-Table.
 
         Args:
-            estado (string): Representação única do estado atual do tabuleiro.
+            estado (int): Representação única do estado atual do tabuleiro.
             acoes_possiveis (list): Lista de possíveis movimentos.
             forcar_melhor (bool | optional): Se True, sempre escolhe a melhor ação conhecida, ignorando exploração. Padrão: False.
 
@@ -1167,11 +687,13 @@ class QLearning:
             return random.choice(acoes_possiveis)
 
         # Se o estado não existir na Q-table, inicializa com valor 0 para todas as ações possíveis
-        if estado not in self.q_table:
+        # (na Q-table em disco, os pares ausentes já valem 0 e não ocupam espaço)
+        if not self.em_disco and estado not in self.q_table:
             self.q_table[estado] = {acao: 0 for acao in acoes_possiveis}
+            self.alteracoes.update((estado, acao) for acao in acoes_possiveis)
 
         # Obtém os valores Q das ações possíveis para este estado
-        acoes_q = {acao: self.q_table[estado].get(acao, 0) for acao in acoes_possiveis}
+        acoes_q = {acao: self.valor_q(estado, acao) for acao in acoes_possiveis}
 
         # Encontra o maior valor Q e filtra apenas as ações que possuem esse valor
         max_valor = max(acoes_q.values())
@@ -1185,84 +707,144 @@ class QLearning:
         Atualiza a Q-Table aplicando a fórmula do Q-Learning para o estado e ação atual.
 
         Args:
-            estado (str): Representação do estado do tabuleiro.
+            estado (int): Representação do estado do tabuleiro.
             acao (str): Ação realizada no formato "xyxy" (Ex: "0406").
             recompensa (float): Valor da recompensa obtida após realizar a ação.
-            proximo_estado (str): Representação nova do estado do tabuleiro após realizar a ação.
+            proximo_estado (int): Representação nova do estado do tabuleiro após realizar a ação.
             acoes_proximas (list): Lista de ações possíveis a partir do próximo estado.
         """
 
-        # Garante que o estado atual e a ação existam no Q-Table
-        self.q_table.setdefault(estado, {})
-        self.q_table[estado].setdefault(acao, 0)
+        if not self.em_disco:
+
+            # Garante que o estado atual e a ação existam no Q-Table
+            self.q_table.setdefault(estado, {})
+            self.q_table[estado].setdefault(acao, 0)
 
-        # Garante que o próximo estado e a ação estejam presentes no Q-Table
-        self.q_table.setdefault(proximo_estado, {})
-        for a in acoes_proximas:
-            self.q_table[proximo_estado].setdefault(a, 0)
+            # Garante que o próximo estado e a ação estejam presentes no Q-Table
+            self.q_table.setdefault(proximo_estado, {})
+            for a in acoes_proximas:
+                if a not in self.q_table[proximo_estado]:
+                    self.q_table[proximo_estado][a] = 0
+                    self.alteracoes.add((proximo_estado, a))
 
         # Obtém o maior valor Q entre as ações do próximo estado
         max_q_proximo = max(
-            [self.q_table[proximo_estado].get(a, 0) for a in acoes_proximas],
+            [self.valor_q(proximo_estado, a) for a in acoes_proximas],
             default=0
         )
 
         # Fórmula do Q-Learning
         # Q(s, a) <- Q(s, a) + a * (recompensa + y * maxQ(s', a') - Q(s, a))
-        q_antigo = self.q_table[estado][acao]
+        q_antigo = self.valor_q(estado, acao)
         novo_valor = q_antigo + self.alpha * (recompensa + self.gamma * max_q_proximo - q_antigo)
-        self.q_table[estado][acao] = novo_valor
-        
-    def gerar_estado(self, ia, tabuleiro, cor_ia):
+        self.definir_q(estado, acao, novo_valor)
+
+        if self.transicoes != None:
+            self.transicoes.append((estado, acao, recompensa, proximo_estado, list(acoes_proximas)))
+
+        # Salva a Q-table caso já existam atualizações suficientes, ou tenha passado o intervalo
+        self.atualizacoes_pendentes += 1
+        self.verificar_salvamento()
+
+    def valor_q(self, estado, acao):
         """
-        Gera uma tupla representando o estado atual do tabuleiro para uso no Q-Learning.
+        Retorna o valor Q de um par (estado, ação), seja a Q-table um dicionário ou em disco.
 
         Args:
-            ia (IA): Instância da classe IA.
-            tabuleiro (list): Lista aninhada 8x8 com as peças do jogo (None ou as instâncias das peças)
-            cor_ia (int): Cor da IA nessa partida (0 = branco, 1 = preto).
+            estado (int): Representação do estado do tabuleiro.
+            acao (str): Ação no formato "xyxy".
 
         Returns:
-            tuple: Estado do tabuleiro no formato:
-                (material, xeque, mobilidade, centro, roque_rei, roque_torre_esquerda, roque_torre_direita).
+            float: Valor Q do par, ou 0 se ainda não existir.
+        """
+
+        if not self.em_disco:
+            return self.q_table.get(estado, {}).get(acao, 0)
+        if (estado, acao) in self.valores_locais:
+            return self.valores_locais[(estado, acao)]
+        return self.q_table.obter(estado, acao)
+
+    def definir_q(self, estado, acao, valor):
+        """
+        Altera o valor Q de um par (estado, ação), registrando-o para o próximo salvamento.
+
+        Na Q-table em disco, um processo que não é o dono da Q-table (ver "treinar_ia.py") guarda
+        o valor apenas na memória, sem alterar o arquivo compartilhado.
+
+        Args:
+            estado (int): Representação do estado do tabuleiro.
+            acao (str): Ação no formato "xyxy".
+            valor (float): Novo valor Q.
         """
 
-        # Calcula o material da IA
-        material = self.calcular_material(tabuleiro, cor_ia)
+        if not self.em_disco:
+            self.q_table.setdefault(estado, {})[acao] = valor
+            self.alteracoes.add((estado, acao))
+        elif self.transicoes != None:
+            self.valores_locais[(estado, acao)] = valor
+        else:
+            self.q_table.definir(estado, acao, valor)
+
+    def verificar_salvamento(self):
+        """
+        Grava as alterações no diário caso a quantidade de atualizações pendentes ou o tempo desde o último salvamento tenha atingido o limite.
+        """
+
+        if self.transicoes != None or not self.atualizacoes_pendentes:
+            return
+        if self.salvar_a_cada != None and self.atualizacoes_pendentes >= self.salvar_a_cada:
+            self.gravar_alteracoes()
+        elif self.intervalo_salvamento != None and time.monotonic() - self.ultimo_salvamento >= self.intervalo_salvamento:
+            self.gravar_alteracoes()
+
+    def salvar_pendentes(self):
+        """
+        Grava as alterações apenas se existirem alterações ainda não salvas (chamado ao encerrar o programa).
+        """
+
+        if self.transicoes == None and (self.alteracoes or self.atualizacoes_pendentes):
+            self.gravar_alteracoes()
+
+    def gravar_alteracoes(self):
+        """
+        Acrescenta ao diário os valores alterados desde a última gravação e, caso o diário tenha crescido
+        o bastante, compacta-o, salvando a Q-table completa.
+
+        A compactação custa o tamanho da Q-table, mas só ocorre depois de pelo menos tantas alterações quanto
+        estados na Q-table, então o custo de cada atualização continua constante.
+
+        Na Q-table em disco não há diário: as páginas alteradas do arquivo são gravadas no disco.
+        """
 
-        # Indica se o adversário está em xeque
-        xeque = int(self.jogo.rei_preto_check if cor_ia == 1 else self.jogo.rei_branco_check)
+        if self.em_disco:
+            self.salvar_q_table()
+            return
 
-        # Conta a quantidade de movimentos disponíveis para a IA
-        mobilidade = self.contar_movimentos_validos(ia, cor_ia, tabuleiro)
+        self.diario.acrescentar([(estado, acao, self.q_table[estado][acao]) for estado, acao in self.alteracoes])
+        self.alteracoes = set()
+        self.atualizacoes_pendentes = 0
+        self.ultimo_salvamento = time.monotonic()
 
-        # Soma pontos por peças posicionadas no centro do tabuleiro
-        centro = self.pontos_centro(tabuleiro, cor_ia, tabuleiro_notacao_normal = True)
+        if self.diario.entradas >= max(COMPACTACAO_MINIMA, len(self.q_table)):
+            self.salvar_q_table()
         
-        rei = None
-        torre_esquerda = None
-        torre_direita = None
+    def gerar_estado(self, tabuleiro, cor_ia):
+        """
+        Gera o estado atual do tabuleiro para uso no Q-Learning.
+
+        O estado é um inteiro calculado direto dos bitboards do tabuleiro (ver "estado_qlearning.py"), com o
+        material, o xeque, a mobilidade, o centro e os direitos de roque da IA, e a versão do formato.
+
+        Args:
+            tabuleiro (Board): Tabuleiro analisado.
+            cor_ia (int): Cor da IA nessa partida (0 = branco, 1 = preto).
+
+        Returns:
+            int: Estado codificado do tabuleiro.
+        """
+
+        return codificar_estado(tabuleiro, cor_ia)
 
-        # Vasculha todo o tabuleiro em busca do rei e das torres da IA
-        for i in range(8):
-            for j in range(8):
-                peca = tabuleiro[i][j]
-                if peca:
-                    if type(peca).__name__ == "Rei" and peca.cor == cor_ia:
-                        rei = peca
-                    elif type(peca).__name__ == "Torre" and peca.cor == cor_ia:
-                        if j == 0:
-                            torre_esquerda = peca
-                        elif j == 7:
-                            torre_direita = peca
-
-        # Confere se é possível realizar o Xeque
-        roque_rei = 0 if not rei or rei.mexeu else 1
-        roque_torre_esquerda = 0 if not torre_esquerda or torre_esquerda.mexeu else 1
-        roque_torre_direita = 0 if not torre_direita or torre_direita.mexeu else 1
-
-        return (material, xeque, mobilidade, centro, roque_rei, roque_torre_esquerda, roque_torre_direita)
-       
     def calcular_recompensa(self, ia, tabuleiro_anterior, tabuleiro_atual):
         """
         Calcula a recompensa gerada por um movimento da IA, 
@@ -1334,76 +916,88 @@ class QLearning:
 
         return recompensa
     
-    def calcular_material(self, tabuleiro, cor_ia): 
+    def salvar_q_table(self, nome = None):
         """
-        Calcula o valor do material relativo que a IA possui, 
-        levando em consideração o material do oponente.
+        Salva o estado atual da Q-Table completa em um arquivo. No caminho da própria Q-table, o diário é esvaziado (compactação).
 
-        Cada peça recebe um valor fixo e o saldo é calculado como a diferença do,
-        valor das peças da IA, menos, o valor das peças do oponente.
+        A Q-table é escrita em um arquivo temporário, que depois substitui o original de uma só vez.
+        Assim, uma interrupção durante o salvamento nunca deixa o arquivo corrompido. Caso a interrupção
+        ocorra antes do diário ser esvaziado, as suas alterações são apenas aplicadas novamente ao carregar.
 
         Args:
-            tabuleiro (list): Lista aninhada do tabuleiro.
-            cor_ia (int): Cor do jogador (0 = branco, 1 = preto).
-
-        Returns:
-            int: Valor material relativo.
+            nome (str | optional): Localização do arquivo. Padrão é o caminho da Q-table ("save/q_table.pkl").
+                A Q-table em disco é sempre salva no seu próprio arquivo.
         """
 
-        # Definição do valor simples das peças
-        valor_pecas = {
-            "K": 0,
-            "Q": 9,
-            "R": 5,
-            "B": 3,
-            "H": 3,
-            "P": 1
-        }
-        material = 0
-
-        # Vasculha todo o tabuleiro em busca das peças
-        for i in range(8):
-            for j in range(8):
-                peca = tabuleiro[i][j]
-                if peca:
-                    letra = type(peca).__name__[0].upper()
-                    valor = valor_pecas.get(letra, 0)
-                    
-                    # Se a peça pertencer a IA é somado, se pertencer ao jogador, é diminuido
-                    if peca.cor == cor_ia:
-                        material += valor
-                    else:
-                        material -= valor
-        return material
-
-    def salvar_q_table(self, nome = "save/q_table.pkl"):
-        """
-        Salva o estado atual da Q-Table em um arquivo.
+        if self.em_disco:
+            self.q_table.sincronizar()
+            self.atualizacoes_pendentes = 0
+            self.ultimo_salvamento = time.monotonic()
+            return
 
-        Args:
-            nome (str | optional): Localização do arquivo. Padrão é: "save/q_table.pkl".
-        """
+        nome = nome if nome != None else self.caminho
+        os.makedirs(os.path.dirname(nome) or ".", exist_ok = True)
+        temporario = nome + ".tmp"
+        with open(temporario, 'wb') as f:
+            pickle.dump(self.q_table, f, protocol = pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, nome)
 
-        os.makedirs(os.path.dirname(nome), exist_ok = True)
-        with open(nome, 'wb') as f:
-            pickle.dump(self.q_table, f)
-        print(f"[Q-TABLE SALVA] Total de estados: {len(self.q_table)}")
+        if nome == self.caminho:
+            self.diario.limpar()
+            self.alteracoes = set()
+            self.atualizacoes_pendentes = 0
+            self.ultimo_salvamento = time.monotonic()
 
-    def carregar_q_table(self, nome = "save/q_table.pkl"):
+    def carregar_q_table(self, nome = None):
         """
-        Carrega uma Q-Table salva de um arquivo.
+        Carrega uma Q-Table salva de um arquivo. No caminho da própria Q-table, as alterações do diário são aplicadas em seguida.
+        Os estados de versões anteriores do formato são convertidos para a versão atual (ver "estado_qlearning.py").
 
         Args:   
-            nome (str | optional): Localização do arquivo. Padrão é: "save/q_table.pkl".
+            nome (str | optional): Localização do arquivo. Padrão é o caminho da Q-table ("save/q_table.pkl").
 
-        Returns:
-            dict: Q-Table carregada. Retorna um dicionário vazio, se o arquivo não existir.
-        """
+        A Q-table em disco apenas é aberta (os valores são lidos conforme consultados). Caso o arquivo ainda
+        não exista, ele é criado com os valores da Q-table em dicionário ("save/q_table.pkl" e o seu diário).
 
+        Returns:
+            dict | QTableDisco: Q-Table carregada. Retorna um dicionário vazio, se o arquivo não existir (e o diário estiver vazio).
+        """
+
+        nome = nome if nome != None else self.caminho
+        if self.em_disco:
+            existia = os.path.exists(nome)
+            q_table = abrir_q_table_disco(nome)
+            if not existia:
+                q_table_antiga = {}
+                if os.path.exists(CAMINHO_Q_TABLE):
+                    with open(CAMINHO_Q_TABLE, 'rb') as f:
+                        q_table_antiga = pickle.load(f)
+                DiarioQTable(os.path.splitext(CAMINHO_Q_TABLE)[0] + ".log").aplicar(q_table_antiga)
+                q_table_antiga, _ = migrar_q_table(q_table_antiga)
+
+                # Os pares com valor 0 não precisam ser guardados, pois é o valor dos pares ausentes
+                for estado, acoes in q_table_antiga.items():
+                    for acao, valor in acoes.items():
+                        if valor != 0:
+                            q_table.definir(estado, acao, valor)
+                q_table.sincronizar()
+            return q_table
+
+        q_table = {}
         if os.path.exists(nome):
             with open(nome, 'rb') as f:
-                return pickle.load(f)
-        return {}
+                q_table = pickle.load(f)
+        if nome == self.caminho:
+            self.diario.aplicar(q_table)
+
+        # Estados de um formato anterior são convertidos, e a Q-table convertida substitui a antiga
+        q_table, migrada = migrar_q_table(q_table)
+        if migrada and nome == self.caminho:
+            self.q_table = q_table
+            self.salvar_q_table()
+        return q_table
     
     def avaliar_tabuleiro(self, tabuleiro, cor_ia):
         """
@@ -1470,11 +1064,11 @@ class QLearning:
         movimentos = 0
         for i in range(8):
             for j in range(8):
-                peca = self.jogo.tabuleiro.get_peca(f"{i}{j}")
+                peca = self.jogo.tabuleiro.get_peca(indice_casa(i, j))
 
                 # Se a peça pertencer a IA, é calculado a quantidade de movimentos possíveis para essa peça
                 if peca and peca.cor == cor_ia:
-                    moves = len(peca.lista_posicoes_validas) if hasattr(peca, 'lista_posicoes_validas') else 0
+                    moves = len(peca.lista_casas_validas) if hasattr(peca, 'lista_casas_validas') else 0
                     movimentos += moves
 
         # Essa quantidade é somado no valor (valoriza desenvolver peças, e possuir mais possibilidades de respostas)
@@ -1505,7 +1099,7 @@ class QLearning:
         if isinstance(tabuleiro, list) and tabuleiro != None and isinstance(tabuleiro[0], dict):
             grid = [[None for _ in range(8)] for _ in range(8)]
             for p in tabuleiro:
-                grid[p["x"]][p["y"]] = ia.get_peca(f"{p['x']}{p['y']}")
+                grid[p["x"]][p["y"]] = ia.get_peca(indice_casa(p["x"], p["y"]))
 
         # Caso não seja, então é só admitir, assumindo que está no formato certo
         else:
@@ -1519,7 +1113,7 @@ class QLearning:
             for j in range(8):
                 peca = grid[i][j]
                 if peca and peca.cor == cor: 
-                    origem = f"{i}{j}"
+                    origem = indice_casa(i, j)
                     moveset = ia.calcular_movimento(origem, cor)
                     cont += len(moveset)
                     
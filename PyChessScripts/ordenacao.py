@@ -0,0 +1,207 @@
+"""
+Módulo de Ordenação dos Movimentos.
+
+A poda alfa-beta só compensa quando os melhores movimentos são analisados primeiro: quanto antes
+aparece um movimento bom, mais cedo os demais são descartados. Este módulo define a ordem de análise
+dos movimentos da busca sem executar nenhuma jogada, apenas consultando o tabuleiro.
+
+A ordem segue as prioridades:
+    1. Movimento da tabela de transposição (o melhor encontrado em uma busca anterior).
+    2. Capturas e promoções, pela vítima mais valiosa e, em seguida, pelo atacante menos valioso (MVV-LVA).
+    3. Movimentos "killer": jogadas quietas que causaram um corte beta na mesma distância da raiz.
+    4. Demais jogadas quietas, pela tabela de histórico (quantas vezes e a que profundidade causaram cortes).
+    5. Capturas que perdem material ao final da troca (ver "Board.see").
+"""
+
+# Imports necessários
+from bitboard import *
+from avaliacao import PESO_CAPTURA, VALOR_PECAS
+
+# Quantidade de movimentos "killer" guardados por distância da raiz
+QUANTIDADE_KILLERS = 2
+
+# Pontuações base de cada grupo de movimentos. O histórico é limitado para nunca passar dos killers
+PONTOS_TABELA = 1000000
+PONTOS_CAPTURA = 100000
+PONTOS_KILLER = 90000
+LIMITE_HISTORICO = 80000
+
+def tipo_capturado(tabuleiro, movimento):
+    """
+    Retorna o tipo da peça capturada por um movimento.
+
+    Args:
+        tabuleiro (Board): Tabuleiro antes do movimento.
+        movimento (int): Movimento codificado, que deve ser uma captura.
+
+    Returns:
+        int: Tipo da peça capturada (PEAO no en passant).
+    """
+
+    if movimento >> 12 == EN_PASSANT:
+        return PEAO
+    destino = (movimento >> 6) & 63
+    return TIPO_PECA[type(tabuleiro.grid[destino >> 3][destino & 7])]
+
+def mvv_lva(tabuleiro, movimento):
+    """
+    Pontua uma captura ou promoção pela vítima mais valiosa e, em seguida, pelo atacante menos valioso.
+
+    As promoções somam o peso da nova peça, como se ela fosse capturada.
+
+    Args:
+        tabuleiro (Board): Tabuleiro antes do movimento.
+        movimento (int): Movimento codificado.
+
+    Returns:
+        int: Pontos do movimento (0 para as jogadas quietas).
+    """
+
+    flag = movimento >> 12
+    pontos = 0
+    if flag & CAPTURA:
+        origem = movimento & 63
+        atacante = TIPO_PECA[type(tabuleiro.grid[origem >> 3][origem & 7])]
+        pontos += PESO_CAPTURA[tipo_capturado(tabuleiro, movimento)] * 8 - atacante
+    if flag & PROMOCAO:
+        pontos += PESO_CAPTURA[peca_promovida(flag)] * 8
+    return pontos
+
+def captura_perdedora(tabuleiro, movimento):
+    """
+    Verifica se uma captura perde material ao final da troca na casa de destino.
+
+    Capturar uma peça de valor igual ou maior nunca perde material, então a troca completa
+    ("Board.see") só é calculada quando a peça que captura vale mais do que a capturada.
+
+    Args:
+        tabuleiro (Board): Tabuleiro antes do movimento.
+        movimento (int): Movimento codificado, que deve ser uma captura.
+
+    Returns:
+        bool: True se a captura perde material, False caso contrário.
+    """
+
+    origem = movimento & 63
+    atacante = TIPO_PECA[type(tabuleiro.grid[origem >> 3][origem & 7])]
+    if VALOR_PECAS[tipo_capturado(tabuleiro, movimento)] >= VALOR_PECAS[atacante]:
+        return False
+    return tabuleiro.see(movimento) < 0
+
+def ordenar_capturas(tabuleiro, movimentos):
+    """
+    Ordena as capturas e promoções por MVV-LVA, deixando as demais jogadas por último.
+
+    Args:
+        tabuleiro (Board): Tabuleiro analisado.
+        movimentos (list[int]): Movimentos codificados.
+
+    Returns:
+        list[int]: Movimentos na ordem de análise.
+    """
+
+    return sorted(movimentos, key = lambda movimento: mvv_lva(tabuleiro, movimento), reverse = True)
+
+class OrdenacaoMovimentos:
+    """
+    Classe OrdenacaoMovimentos.
+
+    Guarda as informações aprendidas durante a busca (killers e histórico) e ordena os movimentos de cada posição.
+
+    Attributes:
+        killers (list[list[int]]): Movimentos "killer" de cada distância da raiz, o mais recente primeiro.
+        historico (list[list[int]]): Pontos de histórico, indexados por [cor][origem * 64 + destino].
+    """
+
+    def __init__(self):
+        """
+        Inicializa a ordenação com as tabelas vazias.
+        """
+
+        self.killers = []
+        self.historico = [[0] * 4096, [0] * 4096]
+
+    def nova_busca(self):
+        """
+        Prepara a ordenação para uma nova busca (a cada jogada da IA).
+
+        Os killers são apagados, pois as distâncias da raiz mudam de uma jogada para outra.
+        O histórico é reduzido pela metade, assim as informações antigas perdem peso aos poucos.
+        """
+
+        self.killers = []
+        for historico_cor in self.historico:
+            for indice in range(4096):
+                historico_cor[indice] >>= 1
+
+    def limpar(self):
+        """
+        Apaga todas as informações (usado ao começar uma nova partida).
+        """
+
+        self.killers = []
+        self.historico = [[0] * 4096, [0] * 4096]
+
+    def ordenar(self, tabuleiro, movimentos, cor, ply, movimento_tabela = 0):
+        """
+        Ordena os movimentos de uma posição da busca, do mais para o menos promissor.
+
+        Args:
+            tabuleiro (Board): Tabuleiro analisado.
+            movimentos (list[int]): Movimentos legais codificados.
+            cor (int): Cor de quem joga (0 para branco, 1 para preto).
+            ply (int): Distância da raiz, em meias-jogadas.
+            movimento_tabela (int, optional): Melhor movimento da tabela de transposição, ou 0. Default é 0.
+
+        Returns:
+            list[int]: Movimentos na ordem de análise.
+        """
+
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        historico = self.historico[cor]
+
+        def pontuar(movimento):
+            if movimento == movimento_tabela:
+                return PONTOS_TABELA
+            flag = movimento >> 12
+            if flag & (CAPTURA | PROMOCAO):
+                if not flag & PROMOCAO and captura_perdedora(tabuleiro, movimento):
+                    return mvv_lva(tabuleiro, movimento) - PONTOS_CAPTURA
+                return PONTOS_CAPTURA + mvv_lva(tabuleiro, movimento)
+            if movimento in killers:
+                return PONTOS_KILLER - killers.index(movimento)
+            return historico[movimento & 4095]
+
+        return sorted(movimentos, key = pontuar, reverse = True)
+
+    def registrar_corte(self, movimento, cor, profundidade, ply):
+        """
+        Registra um movimento que causou um corte beta. Apenas as jogadas quietas são registradas,
+        pois as capturas já são bem ordenadas pelo MVV-LVA.
+
+        Args:
+            movimento (int): Movimento codificado que causou o corte.
+            cor (int): Cor de quem jogou o movimento (0 para branco, 1 para preto).
+            profundidade (int): Profundidade restante na posição do corte.
+            ply (int): Distância da raiz, em meias-jogadas.
+        """
+
+        if movimento >> 12 & (CAPTURA | PROMOCAO):
+            return
+
+        # Killer: o mais recente fica na frente, sem repetir o mesmo movimento
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if movimento in killers:
+            killers.remove(movimento)
+        killers.insert(0, movimento)
+        del killers[QUANTIDADE_KILLERS:]
+
+        # Histórico: cortes mais profundos valem mais. Ao passar do limite, toda a tabela da cor é reduzida
+        historico = self.historico[cor]
+        indice = movimento & 4095
+        historico[indice] += profundidade * profundidade
+        if historico[indice] >= LIMITE_HISTORICO:
+            for i in range(4096):
+                historico[i] >>= 1
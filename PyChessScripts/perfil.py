@@ -0,0 +1,234 @@
+"""
+Módulo de Perfil das Jogadas da IA.
+
+Mede onde o tempo de cada jogada da IA é gasto, separado por fase (busca, geração de movimentos,
+avaliação, Q-Learning, salvamento, ...), com a quantidade de chamadas e o tempo acumulado de cada uma.
+
+A medição é opcional e não custa nada quando desligada: ao ativar o perfil, as funções de cada fase são
+substituídas por versões que medem o tempo, e ao desativar, as originais voltam. Cada chamada de
+"Game.jogar_ia" ou "IA.simular_jogada" (a que vier primeiro) gera um relatório separado.
+
+Nas fases recursivas ou chamadas dentro de si mesmas, todas as chamadas são contadas, mas o tempo é
+medido apenas na chamada mais externa, assim nada é somado duas vezes. O tempo de uma fase inclui o
+das fases chamadas dentro dela (Ex: a busca inclui a geração de movimentos e a avaliação).
+
+Exemplo:
+    with Perfil() as perfil:
+        jogo.jogar_ia()
+    print(formatar_relatorio(perfil.relatorios[-1]))
+"""
+
+# Imports necessários
+import cProfile
+import functools
+import time
+import busca
+from board import Board
+from busca import Busca
+from busca_paralela import BuscaParalela
+from ordenacao import OrdenacaoMovimentos
+from ia import IA, QLearning
+from game import Game
+
+# Fases medidas: dono da função (classe ou módulo), nome da função e nome da fase
+FASES = [
+    (Game, "jogar_ia", "jogar_ia"),
+    (IA, "simular_jogada", "simular_jogada"),
+    (IA, "inicializar_tabuleiro_e_flags", "copia_tabuleiro"),
+    (Busca, "search", "busca"),
+    (BuscaParalela, "search", "busca"),
+    (Busca, "quiescencia", "quiescencia"),
+    (Board, "gerar_movimentos_legais", "geracao_movimentos"),
+    (Board, "see", "see"),
+    (OrdenacaoMovimentos, "ordenar", "ordenacao"),
+    (busca, "avaliar_posicao", "avaliacao"),
+    (IA, "aplicar_jogada_escolhida", "aplicar_jogada"),
+    (IA, "calcular_movimento", "calcular_movimento"),
+    (IA, "verificar_xeque", "verificar_xeque"),
+    (IA, "avaliar_movimento", "escolha_qlearning"),
+    (QLearning, "gerar_estado", "gerar_estado"),
+    (QLearning, "calcular_recompensa", "calcular_recompensa"),
+    (QLearning, "atualizar", "qlearning_atualizar"),
+    (QLearning, "gravar_alteracoes", "salvar_q_table"),
+    (Game, "mover_peca_jogo", "mover_peca_jogo"),
+]
+
+# Fases que abrem um relatório, quando chamadas fora de outra jogada
+FASES_RAIZ = ("jogar_ia", "simular_jogada")
+
+class Perfil:
+    """
+    Classe Perfil.
+
+    Mede as fases das jogadas da IA enquanto estiver ativo.
+
+    Attributes:
+        relatorios (list[dict]): Relatório de cada jogada medida, na ordem (ver "iniciar_relatorio").
+        prefixo_cprofile (str | None): Se informado, cada jogada também é medida pelo cProfile, e salva
+            no arquivo "<prefixo>_<numero>.prof" (que pode ser lido com o módulo "pstats").
+        relatorio_atual (dict | None): Relatório da jogada em andamento.
+        profundidades (dict[str, int]): Quantas chamadas de cada fase estão em andamento.
+        originais (list[tuple]): Funções substituídas, para serem restauradas ao desativar.
+        cprofile (cProfile.Profile | None): cProfile da jogada em andamento.
+        inicio_relatorio (float): Momento em que a jogada em andamento começou.
+    """
+
+    def __init__(self, prefixo_cprofile = None):
+        """
+        Inicializa o perfil, ainda desativado.
+
+        Args:
+            prefixo_cprofile (str, optional): Prefixo dos arquivos do cProfile. Default é None (sem cProfile).
+        """
+
+        self.relatorios = []
+        self.prefixo_cprofile = prefixo_cprofile
+        self.relatorio_atual = None
+        self.profundidades = {}
+        self.originais = []
+        self.cprofile = None
+        self.inicio_relatorio = 0.0
+
+    def __enter__(self):
+        self.ativar()
+        return self
+
+    def __exit__(self, *excecao):
+        self.desativar()
+
+    def ativar(self):
+        """
+        Substitui as funções de cada fase pelas versões que medem o tempo.
+
+        Raises:
+            RuntimeError: Se algum perfil já estiver ativo.
+        """
+
+        if self.originais:
+            return
+        for dono, atributo, _ in FASES:
+            if hasattr(getattr(dono, atributo), "__perfil__"):
+                raise RuntimeError("Já existe um perfil ativo.")
+
+        for dono, atributo, fase in FASES:
+            original = getattr(dono, atributo)
+            self.originais.append((dono, atributo, original))
+            setattr(dono, atributo, self.envolver(original, fase))
+
+    def desativar(self):
+        """
+        Restaura as funções originais de cada fase.
+        """
+
+        for dono, atributo, original in reversed(self.originais):
+            setattr(dono, atributo, original)
+        self.originais = []
+
+    def envolver(self, funcao, fase):
+        """
+        Cria a versão de uma função que mede o tempo da sua fase.
+
+        Args:
+            funcao (callable): Função original.
+            fase (str): Nome da fase.
+
+        Returns:
+            callable: Função que chama a original, medindo-a.
+        """
+
+        perfil = self
+
+        @functools.wraps(funcao)
+        def medida(*args, **kwargs):
+            return perfil.executar(funcao, fase, args, kwargs)
+
+        medida.__perfil__ = True
+        return medida
+
+    def executar(self, funcao, fase, args, kwargs):
+        """
+        Executa uma função de uma fase, somando a chamada e o tempo ao relatório da jogada em andamento.
+
+        As fases chamadas fora de uma jogada (Ex: o Q-Learning no processo principal do treinamento) não são medidas.
+
+        Args:
+            funcao (callable): Função original.
+            fase (str): Nome da fase.
+            args (tuple): Argumentos posicionais.
+            kwargs (dict): Argumentos nomeados.
+
+        Returns:
+            Any: O retorno da função original.
+        """
+
+        raiz = fase in FASES_RAIZ and self.relatorio_atual == None
+        if raiz:
+            self.iniciar_relatorio(fase)
+        elif self.relatorio_atual == None:
+            return funcao(*args, **kwargs)
+
+        dados = self.relatorio_atual["fases"].setdefault(fase, {"chamadas": 0, "tempo": 0.0})
+        dados["chamadas"] += 1
+        profundidade = self.profundidades.get(fase, 0)
+        self.profundidades[fase] = profundidade + 1
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            self.profundidades[fase] = profundidade
+            if profundidade == 0:
+                dados["tempo"] += time.perf_counter() - inicio
+            if raiz:
+                self.finalizar_relatorio()
+
+    def iniciar_relatorio(self, raiz):
+        """
+        Começa o relatório de uma jogada, no formato:
+            {"raiz": fase que abriu o relatório, "total": tempo total, "arquivo_cprofile": arquivo ou None,
+             "fases": {fase: {"chamadas": quantidade, "tempo": segundos}}}
+
+        Args:
+            raiz (str): Fase que iniciou a jogada ("jogar_ia" ou "simular_jogada").
+        """
+
+        self.relatorio_atual = {"raiz": raiz, "total": 0.0, "arquivo_cprofile": None, "fases": {}}
+        self.inicio_relatorio = time.perf_counter()
+        if self.prefixo_cprofile != None:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def finalizar_relatorio(self):
+        """
+        Encerra o relatório da jogada em andamento, salvando o arquivo do cProfile caso tenha sido pedido.
+        """
+
+        relatorio = self.relatorio_atual
+        relatorio["total"] = time.perf_counter() - self.inicio_relatorio
+        if self.cprofile != None:
+            self.cprofile.disable()
+            relatorio["arquivo_cprofile"] = f"{self.prefixo_cprofile}_{len(self.relatorios) + 1}.prof"
+            self.cprofile.dump_stats(relatorio["arquivo_cprofile"])
+            self.cprofile = None
+
+        self.relatorios.append(relatorio)
+        self.relatorio_atual = None
+
+def formatar_relatorio(relatorio):
+    """
+    Escreve um relatório de jogada como texto, com as fases da mais para a menos demorada.
+
+    Args:
+        relatorio (dict): Relatório gerado pelo "Perfil".
+
+    Returns:
+        str: Uma linha por fase, com as chamadas, o tempo e a porcentagem do tempo total.
+    """
+
+    total = relatorio["total"]
+    linhas = [f"[PERFIL] {relatorio['raiz']}: {total * 1000:.1f} ms"]
+    for fase, dados in sorted(relatorio["fases"].items(), key = lambda item: item[1]["tempo"], reverse = True):
+        porcentagem = dados["tempo"] / total if total > 0 else 0
+        linhas.append(f"    {fase}: {dados['chamadas']} chamadas, {dados['tempo'] * 1000:.1f} ms ({porcentagem:.0%})")
+    if relatorio["arquivo_cprofile"] != None:
+        linhas.append(f"    cProfile: {relatorio['arquivo_cprofile']}")
+    return "\n".join(linhas)
@@ -0,0 +1,175 @@
+"""
+Script de Perft.
+
+Mede a velocidade e verifica a correção da geração de movimentos, contando as posições finais da árvore
+de movimentos legais (ver "Board.perft") e comparando com os valores de referência conhecidos.
+
+Uso:
+    - python perft.py: Verifica todas as posições de referência, até a profundidade 3.
+    - python perft.py 5: Verifica todas as posições de referência, até a profundidade 5 (quando houver referência).
+    - python perft.py 4 --fen "<fen>": Conta as posições de uma FEN qualquer.
+    - python perft.py 3 --divide: Mostra também a contagem de cada movimento da raiz.
+
+Encerra com o código 1 caso alguma contagem seja diferente da referência.
+"""
+
+# Imports necessários
+import argparse
+import sys
+import time
+from bitboard import *
+from board import Board
+
+# Posições de referência (https://www.chessprogramming.org/Perft_Results): nome, FEN e a quantidade
+# de posições finais em cada profundidade, a partir de 1
+POSICOES_REFERENCIA = [
+    ("Inicial", "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+        [20, 400, 8902, 197281, 4865609]),
+    ("Kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+        [48, 2039, 97862, 4085603]),
+    ("Posição 3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+        [14, 191, 2812, 43238, 674624]),
+    ("Posição 4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1",
+        [6, 264, 9467, 422333]),
+    ("Posição 5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+        [44, 1486, 62379, 2103487]),
+    ("Posição 6", "r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10",
+        [46, 2079, 89890, 3894594]),
+]
+
+PROFUNDIDADE_PADRAO = 3
+
+def profundidade_valida(texto):
+    """
+    Converte a profundidade informada na linha de comando, que deve ser de pelo menos 1.
+
+    Args:
+        texto (str): Profundidade informada.
+
+    Returns:
+        int: Profundidade.
+
+    Raises:
+        argparse.ArgumentTypeError: Se não for um número inteiro maior ou igual a 1.
+    """
+
+    try:
+        profundidade = int(texto)
+    except ValueError:
+        profundidade = 0
+    if profundidade < 1:
+        raise argparse.ArgumentTypeError(f"a profundidade deve ser um inteiro maior ou igual a 1: {texto}")
+    return profundidade
+
+def nome_movimento(movimento):
+    """
+    Escreve um movimento codificado na notação usada pelos programas de referência (Ex: "e2e4", "a7a8q").
+
+    Args:
+        movimento (int): Movimento codificado.
+
+    Returns:
+        str: Casa de origem, casa de destino e, na promoção, a letra da nova peça.
+    """
+
+    nome = ""
+    for casa in (movimento & 63, (movimento >> 6) & 63):
+        nome += "abcdefgh"[casa & 7] + str(8 - (casa >> 3))
+    flag = movimento >> 12
+    if flag & PROMOCAO:
+        nome += LETRAS_FEN[peca_promovida(flag)].lower()
+    return nome
+
+def executar_perft(fen, profundidade, divide = False):
+    """
+    Executa o perft de uma posição, medindo o tempo.
+
+    Args:
+        fen (str): Posição na notação FEN.
+        profundidade (int): Profundidade, em meias-jogadas.
+        divide (bool, optional): Se a contagem de cada movimento da raiz é mostrada. Default é False.
+
+    Returns:
+        tuple[int, float]: (nos, segundos), com a quantidade de posições finais e o tempo gasto.
+    """
+
+    tabuleiro = Board()
+    cor, _, _ = tabuleiro.carregar_fen(fen)
+
+    inicio = time.perf_counter()
+    if divide:
+        resultado = tabuleiro.divide(profundidade, cor)
+        nos = sum(resultado.values())
+    else:
+        nos = tabuleiro.perft(profundidade, cor)
+    segundos = time.perf_counter() - inicio
+
+    if divide:
+        for nome, quantidade in sorted((nome_movimento(movimento), quantidade) for movimento, quantidade in resultado.items()):
+            print(f"    {nome}: {quantidade}")
+    return nos, segundos
+
+def mostrar_resultado(nome, profundidade, nos, segundos, esperado = None):
+    """
+    Mostra o resultado de um perft, com a velocidade e a comparação com a referência.
+
+    Args:
+        nome (str): Nome da posição.
+        profundidade (int): Profundidade do perft.
+        nos (int): Quantidade de posições finais contadas.
+        segundos (float): Tempo gasto.
+        esperado (int | None, optional): Valor de referência, ou None se não houver. Default é None.
+
+    Returns:
+        bool: False se o valor for diferente da referência, True caso contrário.
+    """
+
+    velocidade = nos / segundos if segundos > 0 else 0
+    situacao = "" if esperado == None else (" OK" if nos == esperado else f" ERRO (esperado {esperado})")
+    print(f"[{nome}] profundidade {profundidade}: {nos} nós em {segundos:.2f}s ({velocidade:,.0f} nós/s){situacao}")
+    return esperado == None or nos == esperado
+
+def verificar_referencias(profundidade_maxima = PROFUNDIDADE_PADRAO, divide = False):
+    """
+    Executa o perft de todas as posições de referência, de 1 até a profundidade máxima.
+
+    Args:
+        profundidade_maxima (int, optional): Maior profundidade verificada. Default é PROFUNDIDADE_PADRAO.
+        divide (bool, optional): Se a contagem de cada movimento da raiz é mostrada. Default é False.
+
+    Returns:
+        bool: True se todas as contagens forem iguais às referências.
+    """
+
+    correto = True
+    nos_total = 0
+    segundos_total = 0
+    for nome, fen, esperados in POSICOES_REFERENCIA:
+        for profundidade, esperado in enumerate(esperados[:profundidade_maxima], start = 1):
+            nos, segundos = executar_perft(fen, profundidade, divide and profundidade == min(profundidade_maxima, len(esperados)))
+            correto = mostrar_resultado(nome, profundidade, nos, segundos, esperado) and correto
+            nos_total += nos
+            segundos_total += segundos
+
+    mostrar_resultado("Total", profundidade_maxima, nos_total, segundos_total)
+    return correto
+
+if __name__ == "__main__":
+    argumentos = argparse.ArgumentParser(description = "Perft: contagem das posições da árvore de movimentos legais.")
+    argumentos.add_argument("profundidade", type = profundidade_valida, nargs = "?", default = PROFUNDIDADE_PADRAO)
+    argumentos.add_argument("--fen", help = "Posição analisada. Sem ela, são verificadas as posições de referência.")
+    argumentos.add_argument("--divide", action = "store_true", help = "Mostra a contagem de cada movimento da raiz.")
+    parametros = argumentos.parse_args()
+
+    if parametros.fen:
+        try:
+            nos, segundos = executar_perft(parametros.fen, parametros.profundidade, parametros.divide)
+        except ValueError as erro:
+            argumentos.error(str(erro))
+        esperado = next((esperados[parametros.profundidade - 1] for _, fen, esperados in POSICOES_REFERENCIA
+                         if fen == parametros.fen and parametros.profundidade <= len(esperados)), None)
+        correto = mostrar_resultado("FEN", parametros.profundidade, nos, segundos, esperado)
+    else:
+        correto = verificar_referencias(parametros.profundidade, parametros.divide)
+
+    sys.exit(0 if correto else 1)
@@ -19,6 +19,9 @@ As classes podem ser importadas diretamente deste pacote para facilitar o uso:
 Cada peça implementa o método ".movimento(tabuleiro)" método comum a todas elas
 e que serve para atualizar os movimentos válidos de acordo com a sua posição e o
 estado atual do tabuleiro.
+
+As casas alcançadas por cada peça (saltos do cavalo e do rei, capturas do peão e os raios
+das peças deslizantes) são pré-calculadas uma única vez no módulo "tabelas.py".
 """
 
 from .pawn import Pawn
@@ -1,4 +1,5 @@
 from .piece import Piece # Import da classe pai Piece.
+from .tabelas import CASAS_CAVALO, movimentos_saltos # Tabelas pré-calculadas
 
 class Horse(Piece):
     """
@@ -8,15 +9,15 @@ class Horse(Piece):
 
     Atributos:
         cor (int): Cor da peça (0 para branco, 1 para preto).
-        posicao (str): Posição atual da peça no tabuleiro, ex: "04" (linha 0, coluna 4).
-        lista_posicoes_validas (list): Lista de posições válidas que essa peça pode se mover, ex: ["02", "03", "04"].
+        casa (int): Índice da casa atual da peça no tabuleiro (0 a 63), ex: 4 (linha 0, coluna 4).
+        lista_casas_validas (list[int]): Lista de casas válidas que essa peça pode se mover, ex: [2, 3, 4].
     """
 
-    def __init__(self, cor, posicao, lista_posicoes_validas = None):
+    def __init__(self, cor, casa, lista_casas_validas = None):
         # Chamada ao construtor da classe base
-        if lista_posicoes_validas is None:
-            lista_posicoes_validas = []
-        super().__init__(cor, posicao, lista_posicoes_validas)
+        if lista_casas_validas is None:
+            lista_casas_validas = []
+        super().__init__(cor, casa, lista_casas_validas)
 
     def movimento(self, tabuleiro):
         """
@@ -27,25 +28,9 @@ class Horse(Piece):
             - Avançar e capturar em L na horizontal.
         """
 
-        self.lista_posicoes_validas.clear()
+        self.lista_casas_validas.clear()
 
-        x = int(self.posicao[0])
-        y = int(self.posicao[1])
+        # Calculo das casas possíveis do cavalo se mover, a partir da tabela de saltos
+        self.lista_casas_validas.extend(movimentos_saltos(CASAS_CAVALO[self.casa], self.cor, tabuleiro))
 
-        # Lista de movimentos X e Y do cavalo
-        movimentos = [
-            (1, 2), (1, -2), (-1, 2), (-1, -2),
-            (2, 1), (2, -1), (-2, 1), (-2, -1)
-        ]
-
-        # Calculo da posições possíveis do cavalo se mover
-        for mx, my in movimentos:
-            novo_x = x + mx
-            novo_y = y + my
-            if 0 <= novo_x <= 7 and 0 <= novo_y <= 7:
-                peca = tabuleiro[novo_x][novo_y]
-                if peca is None or peca.cor != self.cor:
-                    destino = f"{novo_x}{novo_y}"
-                    self.lista_posicoes_validas.append(destino)
-
-        return 
\ No newline at end of file
+        return
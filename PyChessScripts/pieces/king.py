@@ -1,4 +1,5 @@
 from .piece import Piece # Import da classe pai Piece
+from .tabelas import CASAS_REI, movimentos_saltos # Tabelas pré-calculadas
 
 class King(Piece):
     """
@@ -8,16 +9,16 @@ class King(Piece):
 
     Atributos:
         cor (int): Cor da peça (0 para branco, 1 para preto).
-        posicao (str): Posição atual da peça no tabuleiro, ex: "04" (linha 0, coluna 4).
-        lista_posicoes_validas (list): Lista de posições válidas que essa peça pode se mover, ex: ["02", "03", "04"].
+        casa (int): Índice da casa atual da peça no tabuleiro (0 a 63), ex: 4 (linha 0, coluna 4).
+        lista_casas_validas (list[int]): Lista de casas válidas que essa peça pode se mover, ex: [2, 3, 4].
         mexeu (int): Flag que indica se a peça já se moveu (0 = não, 1 = sim).
     """
 
-    def __init__(self, cor, posicao, lista_posicoes_validas = None):
+    def __init__(self, cor, casa, lista_casas_validas = None):
         # Chamada ao construtor da classe base
-        if lista_posicoes_validas is None:
-            lista_posicoes_validas = []
-        super().__init__(cor, posicao, lista_posicoes_validas)
+        if lista_casas_validas is None:
+            lista_casas_validas = []
+        super().__init__(cor, casa, lista_casas_validas)
         self.mexeu = 0
 
     def movimento(self, tabuleiro):
@@ -27,24 +28,9 @@ class King(Piece):
         O Rei move-se uma casa em qualquer direção (horizontal, vertical ou diagonal).
         """
 
-        self.lista_posicoes_validas.clear()
-
-        x = int(self.posicao[0])
-        y = int(self.posicao[1])
-        
-        # Calculo do movimento do Rei
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == 0 and j == 0:
-                    continue
-
-                novo_x = x + j
-                novo_y = y + i
-
-                if 0 <= novo_y <= 7 and 0 <= novo_x <= 7:
-                    destino = f"{novo_x}{novo_y}"
-                    peca = tabuleiro[novo_x][novo_y]
-                    if peca == None or peca.cor != self.cor:
-                        self.lista_posicoes_validas.append(destino)
-        
-        return 
\ No newline at end of file
+        self.lista_casas_validas.clear()
+
+        # Calculo do movimento do Rei, a partir da tabela de casas vizinhas
+        self.lista_casas_validas.extend(movimentos_saltos(CASAS_REI[self.casa], self.cor, tabuleiro))
+
+        return
@@ -1,4 +1,5 @@
 from .piece import Piece # Import da classe pai Piece.
+from .tabelas import CASAS_CAPTURA_PEAO # Tabelas pré-calculadas
 
 class Pawn(Piece):
     """
@@ -9,15 +10,15 @@ class Pawn(Piece):
 
     Atributos:
         cor (int): Cor da peça (0 para branco, 1 para preto).
-        posicao (str): Posição atual da peça no tabuleiro, ex: "04" (linha 0, coluna 4).
-        lista_posicoes_validas (list): Lista de posições válidas que essa peça pode se mover, ex: ["02", "03", "04"].
+        casa (int): Índice da casa atual da peça no tabuleiro (0 a 63), ex: 4 (linha 0, coluna 4).
+        lista_casas_validas (list[int]): Lista de casas válidas que essa peça pode se mover, ex: [2, 3, 4].
     """
 
-    def __init__(self, cor, posicao, lista_posicoes_validas = None):
+    def __init__(self, cor, casa, lista_casas_validas = None):
         # Chamada ao construtor da classe base
-        if lista_posicoes_validas is None:
-            lista_posicoes_validas = []
-        super().__init__(cor, posicao, lista_posicoes_validas)
+        if lista_casas_validas is None:
+            lista_casas_validas = []
+        super().__init__(cor, casa, lista_casas_validas)
 
     def movimento(self, tabuleiro):
         """
@@ -29,43 +30,27 @@ class Pawn(Piece):
             - Capturar peças inimigas nas diagonais à frente.
         """
 
-        self.lista_posicoes_validas.clear()
+        self.lista_casas_validas.clear()
 
-        x = int(self.posicao[0])
-        y = int(self.posicao[1])
-        direcao = -1 if self.cor == 0 else 1 #Branco sobe, e preto desce
+        direcao = -8 if self.cor == 0 else 8 #Branco sobe, e preto desce
 
         # Movimento normal de uma casa para frente
-        novo_x = (x + direcao)
-        if 0 <= novo_x <= 7:
-            if tabuleiro[novo_x][y] == None:
-                destino = f"{novo_x}{y}"
-                self.lista_posicoes_validas.append(destino)
+        frente = self.casa + direcao
+        if 0 <= frente <= 63:
+            if tabuleiro[frente >> 3][frente & 7] == None:
+                self.lista_casas_validas.append(frente)
 
                 # Movimento inicial de duas casas
-                if (x == 6 and self.cor == 0) or (x == 1 and self.cor == 1):
-                    novo_x = (x + 2 * direcao)
-                    if tabuleiro[novo_x][y] == None:
-                        destino = f"{novo_x}{y}"
-                        self.lista_posicoes_validas.append(destino)
-                    novo_x = (x + direcao)
-
-            # Captura à direta
-            novo_y = y + 1
-            if 0 <= novo_y <= 7:
-                if tabuleiro[novo_x][novo_y] != None:
-                    peca = tabuleiro[novo_x][novo_y]
-                    if peca.cor != self.cor:
-                        destino = f"{novo_x}{novo_y}"
-                        self.lista_posicoes_validas.append(destino)
-
-            # Captura à esquerda
-            novo_y = y - 1
-            if 0 <= novo_y <= 7:
-                if tabuleiro[novo_x][novo_y] != None:
-                    peca = tabuleiro[novo_x][novo_y]
-                    if peca.cor != self.cor:
-                        destino = f"{novo_x}{novo_y}"
-                        self.lista_posicoes_validas.append(destino)
-
-        return
\ No newline at end of file
+                linha = self.casa >> 3
+                if (linha == 6 and self.cor == 0) or (linha == 1 and self.cor == 1):
+                    duas_casas = frente + direcao
+                    if tabuleiro[duas_casas >> 3][duas_casas & 7] == None:
+                        self.lista_casas_validas.append(duas_casas)
+
+        # Capturas nas diagonais, a partir da tabela pré-calculada
+        for destino in CASAS_CAPTURA_PEAO[self.cor][self.casa]:
+            peca = tabuleiro[destino >> 3][destino & 7]
+            if peca != None and peca.cor != self.cor:
+                self.lista_casas_validas.append(destino)
+
+        return
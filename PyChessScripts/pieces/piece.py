@@ -4,24 +4,35 @@ class Piece:
 
     Atributos:
         cor (int): Cor da peça (0 para branco, 1 para preto).
-        posicao (str): Posição atual da peça no tabuleiro, ex: "04" (linha 0, coluna 4).
-        lista_posicoes_validas (list): Lista de posições válidas que essa peça pode se mover, ex: ["02", "03", "04"].
+        casa (int): Índice da casa atual da peça no tabuleiro (0 a 63), calculado como "x * 8 + y", ex: 4 (linha 0, coluna 4).
+        lista_casas_validas (list[int]): Lista de casas válidas que essa peça pode se mover, ex: [2, 3, 4].
     """
 
-    def __init__(self, cor, posicao, lista_posicoes_validas = None):
+    def __init__(self, cor, casa, lista_casas_validas = None):
         """
         Inicializa uma nova peça.
 
         Args:
             cor (int): Cor da peça (0 para branco, 1 para preto).
-            posicao (str): Posição inicial da peça no formato "xy".
-            lista_posicoes_validas (list, optional): Lista de posições válidas iniciais. Defaults to [].
+            casa (int): Índice da casa inicial da peça (0 a 63).
+            lista_casas_validas (list, optional): Lista de casas válidas iniciais. Defaults to [].
         """
 
         self.cor = cor
-        self.posicao = posicao
-        self.lista_posicoes_validas = lista_posicoes_validas if lista_posicoes_validas else []
-        
+        self.casa = casa
+        self.lista_casas_validas = lista_casas_validas if lista_casas_validas else []
+
+    @property
+    def posicao(self):
+        """
+        Posição atual da peça no formato "xy" (Ex: "04"), usada apenas na interface e nos arquivos salvos.
+
+        Returns:
+            str: Posição da peça, onde o primeiro número representa o x e o segundo o y.
+        """
+
+        return f"{self.casa >> 3}{self.casa & 7}"
+
     def movimento(self):
         """
         Método que calcula os movimentos válidos da peça a partir de sua posição atual. É sobrescrito nas classes filhas.
@@ -0,0 +1,122 @@
+"""
+Tabelas de movimentos pré-calculadas.
+
+Contém, para cada uma das 64 casas do tabuleiro, as casas alcançadas pelo cavalo, pelo rei,
+pelas capturas do peão e os raios (retas e diagonais) das peças deslizantes.
+
+As tabelas são calculadas uma única vez, na importação do módulo. Assim, o cálculo dos
+movimentos apenas percorre as listas prontas, sem refazer deslocamentos e verificações de borda.
+
+Cada casa é indexada por um inteiro de 0 a 63, calculado como "x * 8 + y".
+"""
+
+# Direções das retas e das diagonais: (dx, dy). As quatro primeiras são da torre e as quatro últimas do bispo
+DIRECOES = [ (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, -1), (-1, 1) ]
+DIRECOES_TORRE = (0, 1, 2, 3)
+DIRECOES_BISPO = (4, 5, 6, 7)
+DIRECOES_RAINHA = (0, 1, 2, 3, 4, 5, 6, 7)
+
+# Deslocamentos (dx, dy) das peças que saltam
+SALTOS_CAVALO = [ (1, 2), (1, -2), (-1, 2), (-1, -2), (2, 1), (2, -1), (-2, 1), (-2, -1) ]
+SALTOS_REI = [ (1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, -1), (-1, 1) ]
+
+# Deslocamentos das capturas do peão, por cor. O branco sobe (linha diminui) e o preto desce
+SALTOS_PEAO = [ [ (-1, -1), (-1, 1) ], [ (1, -1), (1, 1) ] ]
+
+def _gerar_saltos(deslocamentos):
+    """
+    Gera, para cada casa, a tupla de casas alcançadas por uma lista de deslocamentos.
+
+    Args:
+        deslocamentos (list[tuple]): Lista de deslocamentos (dx, dy) da peça.
+
+    Returns:
+        list[tuple[int]]: Casas de destino para cada uma das 64 casas.
+    """
+
+    tabela = []
+    for casa in range(64):
+        x, y = casa >> 3, casa & 7
+        destinos = []
+        for dx, dy in deslocamentos:
+            novo_x, novo_y = x + dx, y + dy
+            if 0 <= novo_x <= 7 and 0 <= novo_y <= 7:
+                destinos.append(novo_x * 8 + novo_y)
+        tabela.append(tuple(destinos))
+    return tabela
+
+def _gerar_raios():
+    """
+    Gera, para cada direção e para cada casa, a tupla de casas até a borda do tabuleiro,
+    ordenadas da mais próxima para a mais distante.
+
+    Returns:
+        list[list[tuple[int]]]: Tabela indexada por [direcao][casa].
+    """
+
+    raios = []
+    for dx, dy in DIRECOES:
+        tabela = []
+        for casa in range(64):
+            x, y = casa >> 3, casa & 7
+            raio = []
+            for i in range(1, 8):
+                novo_x, novo_y = x + dx * i, y + dy * i
+                if not (0 <= novo_x <= 7 and 0 <= novo_y <= 7):
+                    break
+                raio.append(novo_x * 8 + novo_y)
+            tabela.append(tuple(raio))
+        raios.append(tabela)
+    return raios
+
+# Tabelas calculadas uma única vez
+CASAS_CAVALO = _gerar_saltos(SALTOS_CAVALO)
+CASAS_REI = _gerar_saltos(SALTOS_REI)
+CASAS_CAPTURA_PEAO = [_gerar_saltos(SALTOS_PEAO[0]), _gerar_saltos(SALTOS_PEAO[1])]
+CASAS_RAIOS = _gerar_raios()
+
+def movimentos_deslizantes(casa, cor, tabuleiro, direcoes):
+    """
+    Percorre os raios de uma peça deslizante (torre, bispo ou rainha), parando na primeira peça encontrada.
+
+    Args:
+        casa (int): Casa onde a peça está.
+        cor (int): Cor da peça (0 para branco, 1 para preto).
+        tabuleiro (list[list]): Matriz 8x8 com as peças do tabuleiro.
+        direcoes (tuple[int]): Índices das direções em "DIRECOES".
+
+    Returns:
+        list[int]: Casas de destino, incluindo as capturas.
+    """
+
+    destinos = []
+    for direcao in direcoes:
+        for destino in CASAS_RAIOS[direcao][casa]:
+            peca = tabuleiro[destino >> 3][destino & 7]
+            if peca == None:
+                destinos.append(destino)
+            else:
+                if peca.cor != cor:
+                    destinos.append(destino)
+                break
+    return destinos
+
+def movimentos_saltos(casas, cor, tabuleiro):
+    """
+    Filtra as casas de uma tabela de saltos (cavalo ou rei), removendo as ocupadas por peças aliadas.
+
+    Args:
+        casas (tuple[int]): Casas alcançadas pela peça, obtidas de "CASAS_CAVALO" ou "CASAS_REI".
+        cor (int): Cor da peça (0 para branco, 1 para preto).
+        tabuleiro (list[list]): Matriz 8x8 com as peças do tabuleiro.
+
+    Returns:
+        list[int]: Casas de destino, incluindo as capturas.
+    """
+
+    destinos = []
+    for destino in casas:
+        peca = tabuleiro[destino >> 3][destino & 7]
+        if peca == None or peca.cor != cor:
+            destinos.append(destino)
+    return destinos
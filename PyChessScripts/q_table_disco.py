@@ -0,0 +1,296 @@
+"""
+Módulo da Q-table em Disco.
+
+Guarda a Q-table em um arquivo mapeado na memória (mmap), ao invés de um dicionário de dicionários.
+O sistema operacional carrega apenas as páginas do arquivo que são consultadas, então a Q-table pode
+ser maior do que a memória disponível, e abri-la é imediato, pois nada precisa ser desserializado.
+
+O arquivo é uma tabela hash de endereçamento aberto (sondagem linear), onde cada posição guarda um
+par (estado, ação) e o seu valor, em 16 bytes:
+    - 8 bytes -> hash de 64 bits do estado (0 indica uma posição vazia).
+    - 2 bytes -> ação, codificada como "origem * 64 + destino".
+    - 2 bytes -> não usados (alinhamento).
+    - 4 bytes -> valor Q (float de 32 bits).
+
+O estado é identificado apenas pelo seu hash (BLAKE2 de 64 bits), então dois estados diferentes com o
+mesmo hash compartilhariam os valores, o que é improvável o bastante para ser ignorado.
+
+Quando a tabela passa de 70% de ocupação, ela é reconstruída com o dobro do tamanho, em um arquivo novo
+que substitui o antigo.
+
+Dentro de um processo, todos os que usam o mesmo arquivo devem compartilhar a mesma instância (ver
+"abrir_q_table_disco"), assim a quantidade de pares e a substituição do arquivo são as mesmas para todos.
+Entre processos, apenas um deve alterar a tabela: os demais apenas a consultam, e percebem a substituição
+do arquivo (pelo inode) em até "INTERVALO_VERIFICACAO" segundos, quando mapeiam o arquivo novo.
+"""
+
+# Imports necessários
+import hashlib
+import mmap
+import os
+import struct
+import time
+import weakref
+
+# Cabeçalho do arquivo: identificação, versão, quantidade de posições e de pares ocupados
+CABECALHO = struct.Struct("<4sIQQ")
+TAMANHO_CABECALHO = 64
+IDENTIFICACAO = b"PQTD"
+VERSAO = 1
+
+# Cada posição da tabela: hash do estado, ação e valor
+POSICAO = struct.Struct("<QHxxf")
+
+# Quantidade inicial de posições (potência de 2) e a ocupação máxima antes de dobrar a tabela
+CAPACIDADE_INICIAL = 1 << 16
+OCUPACAO_MAXIMA = 0.7
+
+# Intervalo, em segundos, entre as verificações de que o arquivo foi substituído por outro processo
+INTERVALO_VERIFICACAO = 1.0
+
+# Instâncias abertas neste processo, indexadas pelo caminho absoluto do arquivo
+_TABELAS_ABERTAS = weakref.WeakValueDictionary()
+
+def hash_estado(estado):
+    """
+    Calcula o hash de 64 bits de um estado, igual entre execuções diferentes do programa
+    (ao contrário do "hash" do Python, que muda para textos a cada execução).
+
+    Args:
+        estado (int | tuple): Estado gerado por "QLearning.gerar_estado".
+
+    Returns:
+        int: Hash do estado, nunca 0 (reservado para as posições vazias).
+    """
+
+    valor = int.from_bytes(hashlib.blake2b(repr(estado).encode(), digest_size = 8).digest(), "little")
+    return valor or 1
+
+def codificar_acao(acao):
+    """
+    Codifica uma ação no formato "xyxy" (Ex: "6444") como "origem * 64 + destino".
+
+    Args:
+        acao (str): Ação no formato "xyxy".
+
+    Returns:
+        int: Ação codificada (0 a 4095).
+    """
+
+    return (int(acao[0]) * 8 + int(acao[1])) * 64 + int(acao[2]) * 8 + int(acao[3])
+
+def abrir_q_table_disco(caminho):
+    """
+    Abre a tabela de um arquivo, reaproveitando a instância já aberta neste processo, caso exista.
+
+    Args:
+        caminho (str): Localização do arquivo.
+
+    Returns:
+        QTableDisco: Tabela do arquivo, compartilhada por todos que a abrirem no processo.
+    """
+
+    chave = os.path.abspath(caminho)
+    tabela = _TABELAS_ABERTAS.get(chave)
+    if tabela == None or tabela.mapa == None:
+        tabela = QTableDisco(caminho)
+        _TABELAS_ABERTAS[chave] = tabela
+    return tabela
+
+class QTableDisco:
+    """
+    Classe QTableDisco.
+
+    Q-table guardada em um arquivo mapeado na memória, consultada apenas nos pares (estado, ação) necessários.
+
+    Attributes:
+        caminho (str): Localização do arquivo.
+        capacidade (int): Quantidade de posições da tabela (potência de 2).
+        quantidade (int): Quantidade de pares (estado, ação) guardados.
+        arquivo (file): Arquivo aberto da tabela.
+        mapa (mmap.mmap): Mapeamento do arquivo na memória.
+        inode (int): Inode do arquivo mapeado, para perceber quando ele é substituído.
+        proxima_verificacao (float): Momento da próxima verificação do inode do arquivo.
+    """
+
+    def __init__(self, caminho, capacidade = CAPACIDADE_INICIAL):
+        """
+        Abre a tabela, criando o arquivo caso ainda não exista.
+
+        Args:
+            caminho (str): Localização do arquivo.
+            capacidade (int, optional): Quantidade de posições, caso o arquivo seja criado. Default é 65536.
+        """
+
+        self.caminho = caminho
+        if not os.path.exists(caminho):
+            self.criar_arquivo(caminho, capacidade)
+        self.abrir()
+
+    @staticmethod
+    def criar_arquivo(caminho, capacidade):
+        """
+        Cria um arquivo de tabela vazio, com todas as posições zeradas.
+
+        Args:
+            caminho (str): Localização do arquivo.
+            capacidade (int): Quantidade de posições (potência de 2).
+        """
+
+        os.makedirs(os.path.dirname(caminho) or ".", exist_ok = True)
+        with open(caminho, "wb") as f:
+            f.write(CABECALHO.pack(IDENTIFICACAO, VERSAO, capacidade, 0).ljust(TAMANHO_CABECALHO, b"\0"))
+            f.truncate(TAMANHO_CABECALHO + capacidade * POSICAO.size)
+
+    def abrir(self):
+        """
+        Mapeia o arquivo na memória e lê o cabeçalho.
+
+        Raises:
+            ValueError: Se o arquivo não for uma Q-table em disco desta versão.
+        """
+
+        self.arquivo = open(self.caminho, "r+b")
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0)
+        self.inode = os.fstat(self.arquivo.fileno()).st_ino
+        self.proxima_verificacao = time.monotonic() + INTERVALO_VERIFICACAO
+        identificacao, versao, self.capacidade, self.quantidade = CABECALHO.unpack_from(self.mapa, 0)
+        if identificacao != IDENTIFICACAO or versao != VERSAO:
+            self.fechar()
+            raise ValueError(f"Arquivo inválido para a Q-table em disco: {self.caminho}")
+
+    def fechar(self):
+        """
+        Grava as alterações e fecha o arquivo.
+        """
+
+        if self.mapa != None:
+            self.mapa.flush()
+            self.mapa.close()
+            self.arquivo.close()
+            self.mapa = None
+
+    def verificar_substituicao(self):
+        """
+        Mapeia o arquivo novamente caso ele tenha sido substituído (redimensionado por outro processo).
+
+        A verificação consulta o inode do arquivo, e é feita no máximo a cada "INTERVALO_VERIFICACAO" segundos.
+        """
+
+        agora = time.monotonic()
+        if agora < self.proxima_verificacao:
+            return
+        self.proxima_verificacao = agora + INTERVALO_VERIFICACAO
+        try:
+            inode = os.stat(self.caminho).st_ino
+        except FileNotFoundError:
+            return
+        if inode != self.inode:
+            self.fechar()
+            self.abrir()
+
+    def sincronizar(self):
+        """
+        Grava no disco as páginas alteradas do arquivo, junto da quantidade de pares do cabeçalho.
+        """
+
+        CABECALHO.pack_into(self.mapa, 0, IDENTIFICACAO, VERSAO, self.capacidade, self.quantidade)
+        self.mapa.flush()
+
+    def __len__(self):
+        """
+        Returns:
+            int: Quantidade de pares (estado, ação) guardados.
+        """
+
+        return self.quantidade
+
+    def procurar(self, chave, acao):
+        """
+        Procura a posição de um par (estado, ação), pela sondagem linear.
+
+        Args:
+            chave (int): Hash do estado.
+            acao (int): Ação codificada.
+
+        Returns:
+            tuple[int, bool]: (deslocamento, encontrado). O deslocamento é o da posição do par,
+                ou o da posição vazia onde ele deveria ser inserido.
+
+        Raises:
+            RuntimeError: Se a tabela estiver completamente cheia, sem o par.
+        """
+
+        mascara = self.capacidade - 1
+        indice = (chave ^ (acao * 0x9E3779B97F4A7C15)) & mascara
+        for _ in range(self.capacidade):
+            deslocamento = TAMANHO_CABECALHO + indice * POSICAO.size
+            chave_posicao, acao_posicao, _ = POSICAO.unpack_from(self.mapa, deslocamento)
+            if chave_posicao == 0:
+                return deslocamento, False
+            if chave_posicao == chave and acao_posicao == acao:
+                return deslocamento, True
+            indice = (indice + 1) & mascara
+        raise RuntimeError(f"Q-table em disco cheia: {self.caminho}")
+
+    def obter(self, estado, acao):
+        """
+        Retorna o valor Q de um par (estado, ação).
+
+        Args:
+            estado (int | tuple): Estado do tabuleiro.
+            acao (str): Ação no formato "xyxy".
+
+        Returns:
+            float: Valor Q do par, ou 0 se ainda não existir.
+        """
+
+        self.verificar_substituicao()
+        deslocamento, encontrado = self.procurar(hash_estado(estado), codificar_acao(acao))
+        if not encontrado:
+            return 0
+        return POSICAO.unpack_from(self.mapa, deslocamento)[2]
+
+    def definir(self, estado, acao, valor):
+        """
+        Guarda o valor Q de um par (estado, ação), dobrando a tabela caso ela fique cheia demais.
+
+        Args:
+            estado (int | tuple): Estado do tabuleiro.
+            acao (str): Ação no formato "xyxy".
+            valor (float): Novo valor Q.
+        """
+
+        self.verificar_substituicao()
+        chave = hash_estado(estado)
+        acao = codificar_acao(acao)
+        deslocamento, encontrado = self.procurar(chave, acao)
+        POSICAO.pack_into(self.mapa, deslocamento, chave, acao, valor)
+        if not encontrado:
+            self.quantidade += 1
+            if self.quantidade > self.capacidade * OCUPACAO_MAXIMA:
+                self.redimensionar(self.capacidade * 2)
+
+    def redimensionar(self, capacidade):
+        """
+        Reconstrói a tabela com uma nova quantidade de posições, em um arquivo temporário que substitui o atual.
+
+        Args:
+            capacidade (int): Nova quantidade de posições (potência de 2).
+        """
+
+        temporario = self.caminho + ".tmp"
+        self.criar_arquivo(temporario, capacidade)
+        nova = QTableDisco(temporario)
+        for indice in range(self.capacidade):
+            chave, acao, valor = POSICAO.unpack_from(self.mapa, TAMANHO_CABECALHO + indice * POSICAO.size)
+            if chave:
+                deslocamento, _ = nova.procurar(chave, acao)
+                POSICAO.pack_into(nova.mapa, deslocamento, chave, acao, valor)
+        nova.quantidade = self.quantidade
+        nova.sincronizar()
+        nova.fechar()
+
+        self.fechar()
+        os.replace(temporario, self.caminho)
+        self.abrir()
@@ -0,0 +1,388 @@
+"""
+Módulo do Registro de Partidas.
+
+Guarda muitas partidas em um único arquivo binário compacto, ao invés de um arquivo JSON por partida
+(ver "Game.salvar_partida"). As partidas são apenas acrescentadas ao final do arquivo, e um arquivo de
+índice separado ("<arquivo>.idx") guarda onde cada uma começa, assim qualquer partida pode ser lida
+diretamente pelo seu número, sem percorrer as anteriores.
+
+Cada jogada do histórico (ver "Game.salvar_historico") é guardada em 16 bits, no mesmo formato dos
+movimentos codificados da busca (ver "criar_movimento"): origem, destino e as flags do movimento, que
+indicam a captura, o roque ("r"/"R"), o en passant, o avanço duplo e a promoção. A promoção continua
+sendo uma jogada separada no histórico, guardada com a origem igual ao destino e a flag da peça escolhida.
+
+A letra e a cor da peça, a peça capturada e o xeque não são guardados: ao ler, as jogadas são reproduzidas
+em um tabuleiro a partir da posição inicial da partida, e o histórico é reconstruído a partir dele.
+
+Formato do arquivo:
+    - Cabeçalho (8 bytes): identificação e versão.
+    - Partidas, uma após a outra:
+        - 4 bytes -> CRC32 do restante da partida, para detectar uma partida gravada pela metade.
+        - 2 bytes -> quantidade de jogadas.
+        - 1 byte  -> resultado (ver "RESULTADOS").
+        - 1 byte  -> tamanho da FEN da posição inicial (0 para a posição inicial padrão).
+        - FEN da posição inicial, se houver.
+        - 2 bytes por jogada.
+
+O índice guarda a posição de cada partida no arquivo, em 8 bytes. Ele pode ser reconstruído a partir do
+arquivo das partidas, o que é feito automaticamente caso esteja incompleto (ver "reconstruir_indice").
+"""
+
+# Imports necessários
+import os
+import struct
+import sys
+import zlib
+from array import array
+from bitboard import *
+from board import Board
+
+# Cabeçalho do arquivo: identificação e versão
+CABECALHO = struct.Struct("<4sB")
+TAMANHO_CABECALHO = 8
+IDENTIFICACAO = b"PGRP"
+VERSAO = 1
+
+# Cabeçalho de cada partida: CRC32, e depois quantidade de jogadas, resultado e tamanho da FEN
+CRC = struct.Struct("<I")
+DADOS_PARTIDA = struct.Struct("<HBB")
+
+# Resultados possíveis de uma partida, guardados pelo índice (None para uma partida sem resultado)
+RESULTADOS = (None, "MATE", "AFOGAMENTO", "EMPATE", "LIMITE")
+
+FEN_INICIAL = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+
+def codificar_jogada(jogada):
+    """
+    Codifica uma jogada do histórico em 16 bits.
+
+    Args:
+        jogada (str): Jogada no formato do histórico (Ex: "Pb6444", "Kb7476r", "Pb0202pQ").
+
+    Returns:
+        int: Jogada codificada (ver "criar_movimento").
+
+    Raises:
+        ValueError: Se a jogada não estiver no formato do histórico.
+    """
+
+    if len(jogada) < 6 or jogada[2:4] not in CASAS or jogada[4:6] not in CASAS:
+        raise ValueError(f"Jogada inválida: {jogada}")
+
+    origem = CASAS[jogada[2:4]]
+    destino = CASAS[jogada[4:6]]
+
+    # O xeque é ignorado (ele é recalculado na leitura), e a letra seguinte indica a jogada especial
+    especial = jogada[6:]
+    if especial.startswith("x"):
+        especial = especial[1:]
+    especial = especial[:2]
+
+    if especial[:1] == "p":
+        flag = PROMOCAO | (LETRAS_PECAS.index(especial[1:]) - CAVALO)
+    elif jogada[0] == "K" and especial == "r":
+        flag = ROQUE_CURTO
+    elif jogada[0] == "K" and especial == "R":
+        flag = ROQUE_LONGO
+    elif especial[:1] == "e":
+        flag = EN_PASSANT
+    elif especial[:1] == "c":
+        flag = CAPTURA
+    elif jogada[0] == "P" and abs(origem - destino) == 16:
+        flag = AVANCO_DUPLO
+    else:
+        flag = QUIETO
+
+    return criar_movimento(origem, destino, flag)
+
+def codificar_historico(historico):
+    """
+    Codifica todas as jogadas de um histórico.
+
+    Args:
+        historico (list[str]): Jogadas no formato do histórico.
+
+    Returns:
+        array: Jogadas codificadas (array de inteiros de 16 bits).
+    """
+
+    return array("H", (codificar_jogada(jogada) for jogada in historico))
+
+def decodificar_historico(jogadas, fen = None):
+    """
+    Reconstrói o histórico, reproduzindo as jogadas codificadas em um tabuleiro.
+
+    O xeque ("x") é marcado quando algum dos reis fica em xeque após a jogada. A jogada da promoção repete
+    o xeque da jogada do peão, como em "Game.promover_peao". Um peão que chega à última
+    linha sem uma jogada de promoção em seguida vira rainha, como em "Game.colocar_peca_promovida_ia",
+    que promove sem registrar no histórico.
+
+    Args:
+        jogadas (Iterable[int]): Jogadas codificadas.
+        fen (str, optional): Posição antes da primeira jogada. Default é None (posição inicial padrão).
+
+    Returns:
+        list[str]: Jogadas no formato do histórico.
+
+    Raises:
+        ValueError: Se alguma jogada for impossível na posição.
+    """
+
+    tabuleiro = Board()
+    tabuleiro.carregar_fen(fen or FEN_INICIAL)
+    historico = []
+    promocao_pendente = None
+
+    for movimento in jogadas:
+        origem = origem_movimento(movimento)
+        destino = destino_movimento(movimento)
+        flag = flag_movimento(movimento)
+
+        # O peão que chegou à última linha, sem a jogada da promoção, vira rainha
+        if promocao_pendente != None and not flag & PROMOCAO:
+            cor_peao = tabuleiro.get_peca(promocao_pendente).cor
+            tabuleiro.posiciona_peca(CLASSES_PECAS[RAINHA](cor_peao, promocao_pendente), promocao_pendente)
+        promocao_pendente = None
+
+        peca = tabuleiro.get_peca(origem)
+        if peca == None or (origem == destino) != bool(flag & PROMOCAO):
+            raise ValueError(f"Jogada inválida no registro: {movimento}")
+
+        # A promoção apenas substitui o peão, que já está na última linha
+        if flag & PROMOCAO:
+            tipo = peca_promovida(flag)
+            tabuleiro.posiciona_peca(CLASSES_PECAS[tipo](peca.cor, destino), destino)
+            especial = "p" + LETRAS_PECAS[tipo]
+        else:
+            capturada = tabuleiro.get_peca(destino)
+            tabuleiro.make_move(movimento)
+            especial = {ROQUE_CURTO: "r", ROQUE_LONGO: "R", EN_PASSANT: "e"}.get(flag, "")
+            if capturada != None:
+                especial += "c" + LETRAS_PECAS[TIPO_PECA[type(capturada)]]
+            if TIPO_PECA[type(peca)] == PEAO and destino >> 3 in (0, 7):
+                promocao_pendente = destino
+
+        if flag & PROMOCAO:
+            xeque = historico and historico[-1][6:7] == "x"
+        else:
+            xeque = tabuleiro.rei_em_xeque(BRANCO) or tabuleiro.rei_em_xeque(PRETO)
+        if xeque:
+            especial = "x" + especial
+
+        letra = "P" if flag & PROMOCAO else LETRAS_PECAS[TIPO_PECA[type(peca)]]
+        cor = "b" if peca.cor == BRANCO else "p"
+        historico.append(f"{letra}{cor}{NOMES_CASAS[origem]}{NOMES_CASAS[destino]}{especial}")
+
+    return historico
+
+class ArquivoPartidas:
+    """
+    Classe ArquivoPartidas.
+
+    Arquivo com várias partidas codificadas, onde as partidas são apenas acrescentadas ao final.
+
+    Attributes:
+        caminho (str): Localização do arquivo das partidas.
+        caminho_indice (str): Localização do índice ("<caminho>.idx").
+        posicoes (array): Posição de cada partida no arquivo (array de inteiros de 64 bits).
+    """
+
+    def __init__(self, caminho):
+        """
+        Abre o arquivo, criando-o caso ainda não exista, e carrega o índice.
+
+        Args:
+            caminho (str): Localização do arquivo das partidas.
+
+        Raises:
+            ValueError: Se o arquivo não for um arquivo de partidas desta versão.
+        """
+
+        self.caminho = caminho
+        self.caminho_indice = caminho + ".idx"
+        self.posicoes = array("Q")
+
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok = True)
+            with open(caminho, "wb") as f:
+                f.write(CABECALHO.pack(IDENTIFICACAO, VERSAO).ljust(TAMANHO_CABECALHO, b"\0"))
+            if os.path.exists(self.caminho_indice):
+                os.remove(self.caminho_indice)
+
+        with open(caminho, "rb") as f:
+            cabecalho = f.read(CABECALHO.size)
+        if len(cabecalho) < CABECALHO.size or CABECALHO.unpack(cabecalho) != (IDENTIFICACAO, VERSAO):
+            raise ValueError(f"Arquivo inválido para o registro de partidas: {caminho}")
+
+        self.carregar_indice()
+
+    def __len__(self):
+        return len(self.posicoes)
+
+    def __getitem__(self, indice):
+        return self.ler(indice)
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self.ler(indice)
+
+    def carregar_indice(self):
+        """
+        Carrega o índice, reconstruindo-o caso não corresponda ao arquivo das partidas
+        (Ex: o programa foi interrompido entre a gravação da partida e a do índice).
+        """
+
+        self.posicoes = array("Q")
+        if os.path.exists(self.caminho_indice) and os.path.getsize(self.caminho_indice) % 8 == 0:
+            with open(self.caminho_indice, "rb") as f:
+                self.posicoes.frombytes(f.read())
+            if sys.byteorder == "big":
+                self.posicoes.byteswap()
+
+        # O índice está correto quando a última partida termina exatamente no final do arquivo
+        fim = TAMANHO_CABECALHO
+        if self.posicoes:
+            with open(self.caminho, "rb") as f:
+                fim = self.posicoes[-1] + self.ler_tamanho(f, self.posicoes[-1])
+        if fim != os.path.getsize(self.caminho):
+            self.reconstruir_indice()
+
+    def reconstruir_indice(self):
+        """
+        Reconstrói o índice percorrendo o arquivo das partidas.
+
+        A leitura para na primeira partida incompleta ou corrompida (a última, caso a gravação tenha sido
+        interrompida), que é cortada do arquivo, para que as próximas partidas sejam acrescentadas depois da última válida.
+        """
+
+        self.posicoes = array("Q")
+        tamanho_arquivo = os.path.getsize(self.caminho)
+
+        with open(self.caminho, "r+b") as f:
+            posicao = TAMANHO_CABECALHO
+            while posicao < tamanho_arquivo:
+                tamanho = self.ler_tamanho(f, posicao)
+                f.seek(posicao)
+                partida = f.read(tamanho)
+                if tamanho == 0 or len(partida) < tamanho or zlib.crc32(partida[CRC.size:]) != CRC.unpack_from(partida)[0]:
+                    break
+                self.posicoes.append(posicao)
+                posicao += tamanho
+            f.truncate(posicao)
+
+        self.gravar_indice()
+
+    def gravar_indice(self):
+        """
+        Reescreve o arquivo do índice inteiro.
+        """
+
+        posicoes = array("Q", self.posicoes)
+        if sys.byteorder == "big":
+            posicoes.byteswap()
+        with open(self.caminho_indice, "wb") as f:
+            f.write(posicoes.tobytes())
+
+    @staticmethod
+    def ler_tamanho(f, posicao):
+        """
+        Calcula o tamanho em bytes de uma partida, a partir do seu cabeçalho.
+
+        Args:
+            f (file): Arquivo das partidas, aberto para leitura binária.
+            posicao (int): Posição da partida no arquivo.
+
+        Returns:
+            int: Tamanho da partida, ou 0 se o cabeçalho estiver incompleto.
+        """
+
+        f.seek(posicao + CRC.size)
+        dados = f.read(DADOS_PARTIDA.size)
+        if len(dados) < DADOS_PARTIDA.size:
+            return 0
+        quantidade, _, tamanho_fen = DADOS_PARTIDA.unpack(dados)
+        return CRC.size + DADOS_PARTIDA.size + tamanho_fen + 2 * quantidade
+
+    def adicionar(self, historico, resultado = None, fen = None):
+        """
+        Acrescenta uma partida ao final do arquivo e do índice.
+
+        Args:
+            historico (list[str] | array): Jogadas no formato do histórico, ou já codificadas (ver "codificar_historico").
+            resultado (str, optional): Resultado da partida, um dos "RESULTADOS". Default é None.
+            fen (str, optional): Posição antes da primeira jogada. Default é None (posição inicial padrão).
+
+        Returns:
+            int: Número da partida no arquivo.
+
+        Raises:
+            ValueError: Se o resultado for desconhecido, ou a partida tiver mais de 65535 jogadas.
+        """
+
+        jogadas = historico if isinstance(historico, array) else codificar_historico(historico)
+        if len(jogadas) > 0xFFFF:
+            raise ValueError(f"Partida com jogadas demais para o registro: {len(jogadas)}")
+        if resultado not in RESULTADOS:
+            raise ValueError(f"Resultado desconhecido: {resultado}")
+
+        jogadas = array("H", jogadas)
+        if sys.byteorder == "big":
+            jogadas.byteswap()
+        texto_fen = fen.encode("ascii") if fen and fen != FEN_INICIAL else b""
+        corpo = DADOS_PARTIDA.pack(len(jogadas), RESULTADOS.index(resultado), len(texto_fen)) + texto_fen + jogadas.tobytes()
+
+        with open(self.caminho, "ab") as f:
+            posicao = f.tell()
+            f.write(CRC.pack(zlib.crc32(corpo)) + corpo)
+        with open(self.caminho_indice, "ab") as f:
+            f.write(posicao.to_bytes(8, "little"))
+
+        self.posicoes.append(posicao)
+        return len(self.posicoes) - 1
+
+    def ler_jogadas(self, indice):
+        """
+        Lê uma partida sem reconstruir o histórico (a forma mais rápida de ler as partidas).
+
+        Args:
+            indice (int): Número da partida.
+
+        Returns:
+            tuple[array, str | None, str | None]: (jogadas, resultado, fen), com as jogadas codificadas,
+                o resultado e a posição inicial (None para a posição inicial padrão).
+
+        Raises:
+            ValueError: Se a partida estiver corrompida.
+        """
+
+        posicao = self.posicoes[indice]
+        with open(self.caminho, "rb") as f:
+            tamanho = self.ler_tamanho(f, posicao)
+            f.seek(posicao)
+            partida = f.read(tamanho)
+
+        if len(partida) < tamanho or zlib.crc32(partida[CRC.size:]) != CRC.unpack_from(partida)[0]:
+            raise ValueError(f"Partida {indice} corrompida no registro: {self.caminho}")
+
+        quantidade, resultado, tamanho_fen = DADOS_PARTIDA.unpack_from(partida, CRC.size)
+        inicio = CRC.size + DADOS_PARTIDA.size
+        fen = partida[inicio:inicio + tamanho_fen].decode("ascii") or None
+        jogadas = array("H")
+        jogadas.frombytes(partida[inicio + tamanho_fen:])
+        if sys.byteorder == "big":
+            jogadas.byteswap()
+        return jogadas, RESULTADOS[resultado] if resultado < len(RESULTADOS) else None, fen
+
+    def ler(self, indice):
+        """
+        Lê uma partida, reconstruindo o seu histórico.
+
+        Args:
+            indice (int): Número da partida.
+
+        Returns:
+            dict: Partida, com as chaves "historico", "resultado" e "fen".
+        """
+
+        jogadas, resultado, fen = self.ler_jogadas(indice)
+        return {"historico": decodificar_historico(jogadas, fen), "resultado": resultado, "fen": fen}
@@ -0,0 +1,156 @@
+"""
+Módulo da Tabela de Transposição.
+
+Guarda o resultado das posições já analisadas pela busca da IA, indexadas pela chave Zobrist
+(ver "zobrist.py"). Assim, uma posição alcançada por ordens de jogadas diferentes não é analisada
+novamente, e o melhor movimento encontrado em buscas anteriores é testado primeiro.
+
+A tabela tem um tamanho fixo, definido em megabytes. Cada entrada ocupa 16 bytes em dois arrays:
+a chave completa da posição e os dados empacotados em um único inteiro de 64 bits:
+    - Bits 0 a 15 -> melhor movimento (codificado, ver "criar_movimento").
+    - Bits 16 a 23 -> profundidade da busca.
+    - Bits 24 a 25 -> tipo do valor (exato, limite inferior ou superior), somado de 1.
+    - Bits 26 a 31 -> idade da busca que gravou a entrada.
+    - Bits 32 a 63 -> valor da posição (com sinal, deslocado em 2^31).
+
+As entradas são agrupadas em baldes de duas posições:
+    - A primeira prefere profundidade: só é substituída por uma busca mais profunda, pela mesma
+    posição, ou quando a entrada é de uma busca antiga.
+    - A segunda é sempre substituída, guardando os resultados mais recentes.
+"""
+
+# Imports necessários
+from array import array
+
+# Tipos do valor guardado
+EXATO = 0
+LIMITE_INFERIOR = 1
+LIMITE_SUPERIOR = 2
+
+# Espaço ocupado por cada entrada: chave (8 bytes) e dados (8 bytes)
+BYTES_POR_ENTRADA = 16
+
+# Tamanho padrão da tabela, em megabytes
+TAMANHO_PADRAO_MB = 16
+
+class TabelaTransposicao:
+    """
+    Classe TabelaTransposicao.
+
+    Tabela de tamanho fixo com as posições analisadas pela busca, mantida entre as jogadas de uma partida.
+
+    Attributes:
+        quantidade_baldes (int): Quantidade de baldes (potência de 2), cada um com duas entradas.
+        mascara (int): Máscara que converte a chave no índice do balde.
+        chaves (array): Chave Zobrist de cada entrada (0 se estiver vazia).
+        dados (array): Dados empacotados de cada entrada (0 se estiver vazia).
+        idade (int): Idade da busca atual (0 a 63), incrementada a cada nova busca.
+    """
+
+    def __init__(self, tamanho_mb = TAMANHO_PADRAO_MB):
+        """
+        Inicializa a tabela, reservando toda a memória de uma vez.
+
+        Args:
+            tamanho_mb (float, optional): Memória máxima ocupada pela tabela, em megabytes. Default é 16.
+        """
+
+        # A quantidade de baldes é arredondada para baixo, até uma potência de 2
+        baldes = max(1, int(tamanho_mb * 1024 * 1024) // (BYTES_POR_ENTRADA * 2))
+        self.quantidade_baldes = 1 << (baldes.bit_length() - 1)
+        self.mascara = self.quantidade_baldes - 1
+
+        self.chaves = array("Q", [0]) * (self.quantidade_baldes * 2)
+        self.dados = array("Q", [0]) * (self.quantidade_baldes * 2)
+        self.idade = 0
+
+    def nova_busca(self):
+        """
+        Avança a idade da tabela. Deve ser chamado no começo de cada busca (ou seja, a cada jogada da IA).
+
+        As entradas de buscas anteriores continuam válidas para consulta, mas passam a poder
+        ser substituídas na entrada que prefere profundidade.
+        """
+
+        self.idade = (self.idade + 1) & 63
+
+    def limpar(self):
+        """
+        Apaga todas as entradas da tabela (usado ao começar uma nova partida).
+        """
+
+        tamanho = len(self.chaves)
+        self.chaves = array("Q", [0]) * tamanho
+        self.dados = array("Q", [0]) * tamanho
+        self.idade = 0
+
+    def consultar(self, chave):
+        """
+        Procura uma posição na tabela.
+
+        Args:
+            chave (int): Chave Zobrist da posição.
+
+        Returns:
+            tuple | None: (profundidade, valor, tipo, movimento) se a posição estiver na tabela, ou None caso contrário.
+        """
+
+        indice = (chave & self.mascara) << 1
+        for i in (indice, indice + 1):
+            dados = self.dados[i]
+            if dados and self.chaves[i] == chave:
+                return ((dados >> 16) & 255, (dados >> 32) - 2147483648, ((dados >> 24) & 3) - 1, dados & 65535)
+        return None
+
+    def guardar(self, chave, profundidade, valor, tipo, movimento = 0):
+        """
+        Guarda o resultado da busca de uma posição, seguindo o esquema de substituição dos baldes.
+
+        Caso a posição já esteja guardada e o novo resultado não tenha um movimento, o melhor movimento antigo é mantido.
+
+        Args:
+            chave (int): Chave Zobrist da posição.
+            profundidade (int): Profundidade restante da busca nessa posição (0 a 255).
+            valor (int): Valor da posição, do ponto de vista de quem joga.
+            tipo (int): EXATO, LIMITE_INFERIOR (corte beta) ou LIMITE_SUPERIOR (nenhum movimento superou alfa).
+            movimento (int, optional): Melhor movimento encontrado (codificado), ou 0 se não houver.
+        """
+
+        indice = (chave & self.mascara) << 1
+        profundidade = max(0, min(profundidade, 255))
+
+        # Primeira entrada: substituída apenas por uma busca pelo menos tão profunda, pela mesma posição, ou se for antiga
+        dados_preferida = self.dados[indice]
+        if (not dados_preferida
+                or self.chaves[indice] == chave
+                or profundidade >= (dados_preferida >> 16) & 255
+                or (dados_preferida >> 26) & 63 != self.idade):
+            destino = indice
+
+        # Segunda entrada: sempre substituída
+        else:
+            destino = indice + 1
+
+        if not movimento and self.dados[destino] and self.chaves[destino] == chave:
+            movimento = self.dados[destino] & 65535
+
+        self.chaves[destino] = chave
+        self.dados[destino] = ((movimento & 65535)
+                               | (profundidade << 16)
+                               | ((tipo + 1) << 24)
+                               | (self.idade << 26)
+                               | ((valor + 2147483648) << 32))
+
+    def melhor_movimento(self, chave):
+        """
+        Retorna o melhor movimento guardado para uma posição, usado para ordenar os movimentos da busca.
+
+        Args:
+            chave (int): Chave Zobrist da posição.
+
+        Returns:
+            int: Movimento codificado, ou 0 se a posição não estiver na tabela.
+        """
+
+        entrada = self.consultar(chave)
+        return entrada[3] if entrada else 0
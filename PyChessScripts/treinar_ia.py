@@ -4,48 +4,155 @@ Script de treinamento IA vs IA.
 Executa partidas automáticas entre duas instâncias da IA (uma jogando com as peças brancas, a outra com as pretas),
 com o objetivo de treinar e aprimorar o desempenho por meio de algoritmo de Q-Learning.
 
+As partidas são jogadas em paralelo, em vários processos. Cada processo joga as suas partidas de forma
+independente e envia as transições (estado, ação, recompensa e próximo estado) para o processo principal,
+o único dono da Q-table, que aplica as atualizações e a salva em lotes (ver "QLearning.verificar_salvamento").
+As partidas jogadas também são guardadas pelo processo principal, em um único arquivo (ver "registro_partidas.py").
+
 Processo:
-    - Inicializa duas instâncias da IA e um jogo.
-    - Executa um número definido de partidas automáticas.
+    - Inicia os processos, que dividem entre si as partidas.
+    - Em cada processo, inicializa duas instâncias da IA e um jogo, e executa as partidas.
+    - No processo principal, aplica na Q-table as transições recebidas, e guarda as partidas terminadas.
     - Salva periodiacamente a Q_Table com o aprendizado.
 """
 
 # Imports necessários
-from game import Game  
-from ia import IA      
+import multiprocessing
+import os
+import queue
+from game import Game
+from ia import IA, QLearning, SALVAR_A_CADA_TREINAMENTO, INTERVALO_SALVAMENTO_TREINAMENTO
+from bitboard import CASAS
+from registro_partidas import ArquivoPartidas, codificar_historico
 
 NUM_JOGOS = 1000 # Número de partidas definidas para treinamento
+LIMITE_NOS = 20000 # Quantidade máxima de posições analisadas por jogada, mantendo o ritmo do treinamento constante
+PROCESSOS = os.cpu_count() or 1 # Quantidade de processos que jogam as partidas
+MAX_JOGADAS = 400 # Quantidade máxima de meias-jogadas de uma partida, que é encerrada como empate
+CAMINHO_PARTIDAS = "save/partidas.pgr" # Arquivo onde as partidas do treinamento são guardadas
+
+def jogar_partidas(num_partidas, fila, limite_nos = LIMITE_NOS):
+    """
+    Joga uma sequência de partidas IA vs IA dentro de um processo, enviando o aprendizado para o processo principal.
+
+    A Q-table carregada no início do processo também é atualizada localmente, mas não é salva:
+    cada atualização é enviada pela fila, logo após a jogada.
+
+    Mensagens enviadas pela fila:
+        - ("transicoes", lista): Transições (estado, acao, recompensa, proximo_estado, acoes_proximas) de uma jogada.
+        - ("fim", (resultado, jogadas)): Fim de uma partida, com o resultado ("MATE", "AFOGAMENTO", "EMPATE" ou "LIMITE")
+            e as jogadas do histórico codificadas (ver "codificar_historico").
+        - ("encerrado", None): Todas as partidas do processo foram jogadas.
+
+    Args:
+        num_partidas (int): Quantidade de partidas jogadas pelo processo.
+        fila (multiprocessing.Queue): Fila de mensagens para o processo principal.
+        limite_nos (int, optional): Quantidade máxima de posições analisadas por jogada. Default é LIMITE_NOS.
+    """
+
+    # Inicialização das classes, com as transições registradas para serem enviadas
+    jogo = Game()
+    ia_branca = IA(jogo, cor_ia=0)
+    ia_preta = IA(jogo, cor_ia=1)
+    ia_branca.qlearning.transicoes = []
+    ia_preta.qlearning.transicoes = []
+
+    for _ in range(num_partidas):
+        jogo.reiniciar()
+        resultado = "LIMITE"
+
+        # Executa jogadas até encontrar condição de término
+        while jogo.turno < MAX_JOGADAS:
+            cor = jogo.turno % 2
+            ia_atual = ia_branca if cor == 0 else ia_preta
+            ia_atual.simular_jogada(limite_nos = limite_nos)
+
+            # Fim do jogo
+            if not ia_atual.lista_jogadas_possiveis:
+                resultado = ia_atual.esta_em_mate_ou_afogamento(cor)
+                break
+
+            # A IA aprende com a jogada, e as transições são enviadas
+            ia_atual.aplicar_jogada_escolhida()
+            if ia_atual.qlearning.transicoes:
+                fila.put(("transicoes", ia_atual.qlearning.transicoes))
+                ia_atual.qlearning.transicoes = []
+
+            # A jogada é executada no jogo real, como no modo IA vs IA da interface
+            movimento = ia_atual.avaliar_movimento()
+            jogo.mover_peca_jogo(CASAS[movimento[:2]], CASAS[movimento[2:]])
+            jogo.verificar_material_fora_de_campo()
+            if jogo.verificar_promocao_peao():
+                jogo.colocar_peca_promovida_ia(cor, jogo.promover_posicao)
+
+            # Verifica algum possível empate
+            if jogo.verificar_insuficiencia_de_material() == "EMPATE":
+                resultado = "EMPATE"
+                break
+
+        fila.put(("fim", (resultado, codificar_historico(jogo.historico))))
+
+    fila.put(("encerrado", None))
+
+def treinar(num_jogos = NUM_JOGOS, processos = PROCESSOS, limite_nos = LIMITE_NOS, caminho_partidas = CAMINHO_PARTIDAS):
+    """
+    Treina a IA, jogando as partidas em paralelo e aplicando o aprendizado na Q-table.
+
+    Args:
+        num_jogos (int, optional): Número de partidas do treinamento. Default é NUM_JOGOS.
+        processos (int, optional): Quantidade de processos que jogam as partidas. Default é PROCESSOS.
+        limite_nos (int, optional): Quantidade máxima de posições analisadas por jogada. Default é LIMITE_NOS.
+        caminho_partidas (str | None, optional): Arquivo onde as partidas são guardadas, ou None para não guardar.
+            Default é CAMINHO_PARTIDAS.
+    """
+
+    # O processo principal é o único dono da Q-table, salva em lotes grandes durante o treinamento
+    qlearning = QLearning(None, salvar_a_cada = SALVAR_A_CADA_TREINAMENTO, intervalo_salvamento = INTERVALO_SALVAMENTO_TREINAMENTO)
+    arquivo_partidas = ArquivoPartidas(caminho_partidas) if caminho_partidas != None else None
+
+    # As partidas são divididas entre os processos
+    contexto = multiprocessing.get_context("spawn")
+    fila = contexto.Queue()
+    processos = max(1, min(processos, num_jogos))
+    lista_processos = []
+    for indice in range(processos):
+        num_partidas = num_jogos // processos + (1 if indice < num_jogos % processos else 0)
+        processo = contexto.Process(target = jogar_partidas, args = (num_partidas, fila, limite_nos), daemon = True)
+        processo.start()
+        lista_processos.append(processo)
+
+    # Aplica as transições conforme chegam, até todos os processos encerrarem
+    partidas = 0
+    encerrados = 0
+    while encerrados < len(lista_processos):
+        try:
+            tipo, conteudo = fila.get(timeout = 1)
+        except queue.Empty:
+
+            # Um processo que terminou sem avisar (por um erro) não enviará mais nada
+            if not any(processo.is_alive() for processo in lista_processos):
+                break
+            continue
+
+        if tipo == "transicoes":
+            for transicao in conteudo:
+                qlearning.atualizar(*transicao)
+
+        elif tipo == "fim":
+            partidas += 1
+            resultado, jogadas = conteudo
+            if arquivo_partidas != None:
+                arquivo_partidas.adicionar(jogadas, resultado)
+            print(f"[Partida {partidas}] Resultado: {resultado}")
+
+        else:
+            encerrados += 1
+
+    for processo in lista_processos:
+        processo.join()
+
+    # Salvar na q_table o aprendizado ainda pendente
+    qlearning.salvar_pendentes()
 
-# Inicialização das classes
-jogo = Game()  
-ia_branca = IA(jogo, cor_ia=0)
-ia_preta = IA(jogo, cor_ia=1)
-
-# Criação do laço responsável por simular o NUM_JOGOS partidas
-for n in range(NUM_JOGOS):
-    print(f"\n[Partida {n+1}]")
-    jogo.reiniciar()  
-    fim = False
-    jogo.turno = 0
-
-    # Executa jogadas até encontrar condição de término
-    while not fim:
-        ia_atual = ia_branca if jogo.turno % 2 == 0 else ia_preta
-        ia_atual.simular_jogada()
-
-        # Fim do jogo
-        if not ia_atual.lista_jogadas_possiveis:
-            print("[FIM DA PARTIDA]")
-            resultado = ia_atual.esta_em_mate_ou_afogamento(ia_atual.cor)
-            print("Resultado:", resultado)
-            break
-
-        ia_atual.aplicar_jogada_escolhida()
-
-    if (n+1) % 100 == 0:
-        ia_branca.qlearning.salvar_q_table()
-        ia_preta.qlearning.salvar_q_table()
-
-# Salvar na q_table o aprendizado
-ia_branca.qlearning.salvar_q_table()
-ia_preta.qlearning.salvar_q_table()
\ No newline at end of file
+if __name__ == "__main__":
+    treinar()
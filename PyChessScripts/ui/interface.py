@@ -15,8 +15,12 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from game import Game
 from ia import IA
+from busca_paralela import BuscaParalela
+from bitboard import CASAS, NOMES_CASAS
 
 TAMANHO_CASA = 80 
+TEMPO_JOGADA_IA = 2.0 # Tempo máximo de cada jogada da IA, em segundos
+PROCESSOS_IA = os.cpu_count() or 1 # Quantidade de processos da busca da IA (um por núcleo do processador)
 CAMINHO_ASSETS = caminho_assets = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
 
 class MainWindow(QMainWindow):
@@ -45,11 +49,24 @@ class MainWindow(QMainWindow):
         self.modo_ia_vs_ia = modo_ia_vs_ia
         self.jogo_finalizado = 0
         self.ia_jogando = 0
+        self.jogada_ia = None
+        self.jogada_ia_vs_ia = None
 
         # Verificação da flag
         if self.modo_ia_vs_ia:
             self.ia_branca = IA(self.jogo, cor_ia=0)
             self.ia_preta = IA(self.jogo, cor_ia=1)
+
+        # Uma única busca paralela é compartilhada por todas as IAs da janela (as jogadas nunca são simultâneas),
+        # e os processos já são iniciados, para não gastarem o tempo da primeira jogada
+        self.busca_paralela = None
+        if PROCESSOS_IA > 1:
+            self.busca_paralela = BuscaParalela(PROCESSOS_IA, self.jogo.ia.tamanho_tabela_mb, promocoes_menores = False)
+            self.jogo.ia.busca_paralela = self.busca_paralela
+            if self.modo_ia_vs_ia:
+                self.ia_branca.busca_paralela = self.busca_paralela
+                self.ia_preta.busca_paralela = self.busca_paralela
+            self.busca_paralela.iniciar()
         
         self.setWindowTitle("Xadrez")
         self.setFixedSize(960, 700)
@@ -239,7 +256,7 @@ class MainWindow(QMainWindow):
             return
         
         # Pega a última jogada do histórico do jogo
-        ultimo_lance = self.jogo.historico[self.jogo.turno - 1]
+        ultimo_lance = self.jogo.historico[-1]
 
         # Visualiza a peça
         peca_jogada = ultimo_lance[0]
@@ -549,7 +566,7 @@ class MainWindow(QMainWindow):
         # Verificando se é uma posição válida.
         if not hasattr(label, "caminho_imagem"):
             if self.ultima_peca_selecionada:
-                peca = self.jogo.tabuleiro.get_peca(self.ultima_peca_selecionada)
+                peca = self.jogo.tabuleiro.get_peca(CASAS[self.ultima_peca_selecionada])
                 if peca.cor != self.cor_jogador:
                     self.ultima_peca_selecionada = 0
                     return
@@ -559,8 +576,8 @@ class MainWindow(QMainWindow):
         
         # Verificando se é uma posição válida.
         if self.ultima_peca_selecionada:
-            peca_teste = self.jogo.tabuleiro.get_peca(posicao)
-            peca_origem = self.jogo.tabuleiro.get_peca(self.ultima_peca_selecionada)
+            peca_teste = self.jogo.tabuleiro.get_peca(CASAS[posicao])
+            peca_origem = self.jogo.tabuleiro.get_peca(CASAS[self.ultima_peca_selecionada])
             if peca_origem.cor != peca_teste.cor:
                 self.posicao_ultima_jogada_a_limpar.append(posicao)
                 self.mover_peca(posicao)
@@ -600,7 +617,8 @@ class MainWindow(QMainWindow):
             posicao (str): Posição da peça no tabuleiro (ex: "23").
         """
 
-        movimentos = self.jogo.calcular_movimento_jogo(posicao, self.cor_atual)
+        # O jogo trabalha com o índice das casas, já a interface com as posições "xy"
+        movimentos = [NOMES_CASAS[casa] for casa in self.jogo.calcular_movimento_jogo(CASAS[posicao], self.cor_atual)]
 
         for i in movimentos:
             if i in self.casas:
@@ -610,7 +628,7 @@ class MainWindow(QMainWindow):
                 nova_cor = "#D3CDBB" if cor == "background-color: #EEE8D5;" else "#4B5E4A"
                 self.casas[i].setStyleSheet(f"background-color: {nova_cor};")
                 
-                peca = self.jogo.tabuleiro.get_peca(i)
+                peca = self.jogo.tabuleiro.get_peca(CASAS[i])
 
                 # Se a casa estiver vazia, é colocado um ponto
                 if peca == None:
@@ -738,11 +756,11 @@ class MainWindow(QMainWindow):
         origem = self.ultima_peca_selecionada
 
         # Verificando se é uma jogada válida
-        movimentos = self.jogo.calcular_movimento_jogo(origem, self.cor_atual)
-        if posicao in movimentos:
+        movimentos = self.jogo.calcular_movimento_jogo(CASAS[origem], self.cor_atual)
+        if CASAS[posicao] in movimentos:
 
             # Aplicando a jogada
-            if self.jogo.mover_peca_jogo(origem, posicao) == True:
+            if self.jogo.mover_peca_jogo(CASAS[origem], CASAS[posicao]) == True:
                 self.limpar_jogada()
                 self.jogo.verificar_material_fora_de_campo()
                 self.desenhar_tabuleiro()
@@ -847,32 +865,9 @@ class MainWindow(QMainWindow):
         Verifica possíveis xeques.
         """
 
-        # Zera os atributos
-        self.rei_branco_xeque = 0
-        self.rei_preto_xeque = 0
-
-        # Vaculha o tabuleiro em busca das peças
-        for i in range(8):
-            for j in range(8):
-                pos = f"{i}{j}"
-                peca = self.jogo.tabuleiro.get_peca(pos)
-
-                # Se de fato for uma peça procura os movimentos delas
-                if peca:
-                    peca.movimento(self.jogo.tabuleiro.grid)
-                    moveset = peca.lista_posicoes_validas
-
-                    # Caso seja uma peça branca
-                    if peca.cor == 0:
-                        for m in moveset:
-                            if m == self.jogo.posicao_rei_preto:
-                                self.rei_preto_xeque = 1
-
-                    # Caso seja uma peça preta
-                    if peca.cor == 1:
-                        for m in moveset:
-                            if m == self.jogo.posicao_rei_branco:
-                                self.rei_branco_xeque = 1
+        # Os ataques sobre cada rei são calculados pelos bitboards do tabuleiro
+        self.rei_branco_xeque = int(self.jogo.tabuleiro.rei_em_xeque(0))
+        self.rei_preto_xeque = int(self.jogo.tabuleiro.rei_em_xeque(1))
 
     def indicador_rei_xeque(self):
         """
@@ -885,7 +880,7 @@ class MainWindow(QMainWindow):
             for j in range(8):
                 
                 pos = str(i) + str(j)
-                peca = self.jogo.tabuleiro.get_peca(pos)
+                peca = self.jogo.tabuleiro.get_peca(CASAS[pos])
 
                 if peca and type(peca).__name__.lower() == "king":
                     if pos in self.casas:   
@@ -900,11 +895,11 @@ class MainWindow(QMainWindow):
                             self.adicionar_peca(pos, caminho)
 
         if self.rei_branco_xeque == 1:
-            posicao = self.jogo.posicao_rei_branco
-            peca = self.jogo.tabuleiro.get_peca(posicao)
+            posicao = NOMES_CASAS[self.jogo.posicao_rei_branco]
+            peca = self.jogo.tabuleiro.get_peca(self.jogo.posicao_rei_branco)
         elif self.rei_preto_xeque == 1:
-            posicao = self.jogo.posicao_rei_preto
-            peca = self.jogo.tabuleiro.get_peca(posicao)
+            posicao = NOMES_CASAS[self.jogo.posicao_rei_preto]
+            peca = self.jogo.tabuleiro.get_peca(self.jogo.posicao_rei_preto)
         else:
             return  
         
@@ -1016,7 +1011,7 @@ class MainWindow(QMainWindow):
         if movimento:
             origem = movimento[:2]
             destino = movimento[2:]
-            self.jogo.mover_peca_jogo(origem, destino)
+            self.jogo.mover_peca_jogo(CASAS[origem], CASAS[destino])
             posicoes = f"{origem}{destino}"
 
             self.limpar_jogada()
@@ -1065,12 +1060,31 @@ class MainWindow(QMainWindow):
         self.limpar_destacado()
         self.jogo.reiniciar()
         self.jogo_finalizado = 0
+
+        # Os processos da busca são recriados, com as tabelas vazias para a nova partida
+        if self.busca_paralela != None:
+            self.busca_paralela.encerrar()
+            self.busca_paralela.iniciar()
         self.desenhar_tabuleiro()
         self.repaint()
         QApplication.processEvents()
         if self.cor_jogador == 1:
             self.jogar_ia()
 
+    def closeEvent(self, evento):
+        """
+        Encerra os processos da busca paralela ao fechar a janela, esperando a jogada da IA em andamento.
+        """
+
+        for thread in (self.jogada_ia, self.jogada_ia_vs_ia):
+            if thread != None:
+                thread.wait()
+
+        if self.busca_paralela != None:
+            self.busca_paralela.encerrar()
+
+        super().closeEvent(evento)
+
     def mostrar_fim_de_jogo(self, mensagem):
         """
         Chama a tela de fim de jogo.
@@ -1126,7 +1140,7 @@ class Jogada_IA(QThread):
         Executa a jogada da IA em segundo plano
         """
 
-        posicoes = self.jogo.jogar_ia()
+        posicoes = self.jogo.jogar_ia(tempo_limite = TEMPO_JOGADA_IA, processos = PROCESSOS_IA)
         self.terminado.emit(posicoes)
 
 #########################################################################################################################################################################
@@ -1153,7 +1167,7 @@ class Jogada_IA_vs_IA(QThread):
         Executa a jogada da IA em segundo plano
         """
 
-        self.ia.simular_jogada()
+        self.ia.simular_jogada(tempo_limite = TEMPO_JOGADA_IA, processos = PROCESSOS_IA)
         self.ia.aplicar_jogada_escolhida()
         posicoes = self.ia.avaliar_movimento()
         self.terminado.emit(posicoes)
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Módulo de Hashing Zobrist.
+
+Contém as chaves aleatórias usadas para identificar uma posição do tabuleiro através de um único
+inteiro de 64 bits. A chave de uma posição é o XOR das chaves de cada peça em sua casa, dos direitos
+de roque, da coluna do en passant e do lado que joga.
+
+Como o XOR desfaz a si mesmo, a chave é atualizada de forma incremental: ao mover uma peça, basta
+retirar a chave da casa antiga e adicionar a da casa nova, sem recalcular o tabuleiro inteiro.
+
+As chaves são geradas com uma semente fixa, assim a mesma posição tem sempre a mesma chave,
+inclusive entre execuções diferentes do programa.
+"""
+
+# Imports necessários
+import random
+
+# Semente fixa das chaves
+SEMENTE_ZOBRIST = 20240601
+
+# Direitos de roque, guardados como bits de uma máscara
+ROQUE_CURTO_BRANCO = 1
+ROQUE_LONGO_BRANCO = 2
+ROQUE_CURTO_PRETO = 4
+ROQUE_LONGO_PRETO = 8
+
+_gerador = random.Random(SEMENTE_ZOBRIST)
+
+# Chaves das peças, indexadas por [cor][tipo][casa]
+ZOBRIST_PECAS = [[[_gerador.getrandbits(64) for _ in range(64)] for _ in range(6)] for _ in range(2)]
+
+# Chave adicionada quando é a vez das pretas
+ZOBRIST_LADO = _gerador.getrandbits(64)
+
+def _gerar_chaves_roques():
+    """
+    Gera a chave de cada combinação de direitos de roque, como o XOR das chaves de cada direito.
+
+    Returns:
+        list[int]: Chaves indexadas pela máscara dos direitos (0 a 15).
+    """
+
+    direitos = [_gerador.getrandbits(64) for _ in range(4)]
+    chaves = []
+    for mascara in range(16):
+        chave = 0
+        for bit in range(4):
+            if mascara & (1 << bit):
+                chave ^= direitos[bit]
+        chaves.append(chave)
+    return chaves
+
+# Chaves dos direitos de roque, indexadas pela máscara completa
+ZOBRIST_ROQUES = _gerar_chaves_roques()
+
+# Chaves da coluna do en passant
+ZOBRIST_EN_PASSANT = [_gerador.getrandbits(64) for _ in range(8)]
+
+def calcular_chave_pecas(bitboards):
+    """
+    Calcula do zero a parte da chave referente às peças, a partir dos bitboards.
+
+    Args:
+        bitboards (list[list[int]]): Bitboards das peças, indexados por [cor][tipo].
+
+    Returns:
+        int: XOR das chaves de todas as peças em suas casas.
+    """
+
+    chave = 0
+    for cor in range(2):
+        for tipo in range(6):
+            bitboard = bitboards[cor][tipo]
+            while bitboard:
+                menor_bit = bitboard & -bitboard
+                chave ^= ZOBRIST_PECAS[cor][tipo][menor_bit.bit_length() - 1]
+                bitboard ^= menor_bit
+    return chave